@@ -0,0 +1,20 @@
+"""
+@brief Analyzers package for IT infrastructure analysis
+Contains all analysis modules for comprehensive infrastructure assessment
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'ClientAnalyzer': 'analyzers.client_analyzer',
+    'LanguageSkillsAnalyzer': 'analyzers.language_analyzer',
+    'ProjectsMetricsAnalyzer': 'analyzers.projects_metrics_analyzer',
+    'PersonalEfficiencyAnalyzer': 'analyzers.personal_analyzer',
+    'ROIUpAnalyzer': 'analyzers.roi_up_analyzer',
+    'EquipmentAnalyzer': 'analyzers.equipment_analyzer',
+    'ANALYZER_MODULES': 'analyzers.registry',
+    'analyzer_class': 'analyzers.registry',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -1,111 +1,196 @@
-"""
-@brief Base analyzer class for Commercial Departments analysis
-Provides common functionality and interface for all analyzers
-"""
-
-import pandas as pd
-import json
-from utils.logger import analysis_logger
-from config.messages import LogMessages
-
-
-class BaseAnalyzer:
-    """
-    @brief Base class for all commercial analyzers
-    Implements common data loading and processing functionality
-    """
-
-    def __init__(self, json_file_path, analysis_name):
-        """
-        @brief Initialize base analyzer with data source
-        Sets up data loading and logger configuration
-
-        @param json_file_path: Path to JSON data file
-        @param analysis_name: Name of the analysis for logging
-        """
-        self.json_file_path = json_file_path
-        self.analysis_name = analysis_name
-        self.logger = analysis_logger.get_analysis_logger(analysis_name)
-        self.data = None
-        self.projects = None
-
-        self.logger.info(LogMessages.SYSTEM_START)
-        self.department_id = 17
-        self.person_count = 0
-        self._load_data()
-        self._setup_dataframes()
-
-    def _load_data(self):
-        """
-        @brief Load JSON data from specified file path
-        Handles file reading and JSON parsing with error handling
-        """
-        self.logger.info(LogMessages.DATA_LOAD_START)
-        try:
-            with open(self.json_file_path, 'r', encoding='utf-8') as json_file:
-                self.data = json.load(json_file)
-            self.logger.info(LogMessages.DATA_LOAD_SUCCESS.format(self.json_file_path))
-        except Exception as loading_error:
-            error_message = LogMessages.DATA_LOAD_ERROR.format(
-                self.json_file_path, str(loading_error)
-            )
-            self.logger.error(error_message)
-            raise loading_error
-
-    def _setup_dataframes(self):
-        """
-        @brief Create pandas DataFrames from loaded JSON data
-        Processes equipment, departments, and employees data
-        """
-        self.logger.info(LogMessages.DATA_PROCESSING_START.format(self.analysis_name))
-
-        if not self.data:
-            return
-
-        # Create projects DataFrame
-        project_records = []
-        for project in self.data.get('projects', []):
-            for department in project.get('participating_departments', []):
-                if department.get('department_id') == self.department_id:
-                    project_record = {
-                        'project_id': project['project_id'],
-                        'name': project['name'],
-                        'description': project['description'],
-                        'status': project['status'],
-                        'start_date': project['timeline']['start_date'],
-                        'end_date': project['timeline']['end_date'],
-                        'duration_days': project['timeline']['duration_days'],
-                        'budget': project['financials']['budget'],
-                        'actual_cost': project['financials']['actual_cost'],
-                        'profit': project['financials']['profit'],
-                        'roi_percentage': project['financials']['roi_percentage'],
-                        'completion_percentage': project['metrics']['completion_percentage'],
-                        'risk_level': project['metrics']['risk_level'],
-                        'priority': project['metrics']['priority'],
-                    }
-                    project_records.append(project_record)
-                    break
-
-        project_dataframe = pd.DataFrame(project_records)
-
-        # Convert date columns to datetime
-        project_dataframe['start_date'] = pd.to_datetime(project_dataframe['start_date'])
-        project_dataframe['end_date'] = pd.to_datetime(project_dataframe['end_date'])
-
-        self.projects = project_dataframe
-        self.logger.info(LogMessages.PROJECT_COUNT.format(len(self.projects)))
-
-        person_count = 0
-        for employee in self.data.get('employees', []):
-            if employee.get('work_info')['department_id'] == self.department_id:
-                person_count += 1
-
-        self.logger.info(LogMessages.PERSONAL_COUNT.format(person_count))
-        self.person_count = person_count
-
-    def execute_analysis(self):
-        """
-        @brief Execute the analysis (to be implemented by subclasses)
-        Template method for analysis execution
-        """
-        raise NotImplementedError("Subclasses must implement execute_analysis method")
+"""
+@brief Base analyzer class for Commercial Departments analysis
+Provides common functionality and interface for all analyzers
+"""
+
+import pandas as pd
+from dataset.company_dataset import CompanyDataset
+from dataset.snapshot_diff import SnapshotTables
+from utils.logger import analysis_logger
+from utils.instrumentation import measured_stage
+from config.messages import LogMessages
+from config.helper_const import Departments
+
+
+def dataset_rows(analyzer, _):
+    """
+    @brief Rows of shared dataset tables used by analyzers, for stage instrumentation
+    """
+    return len(analyzer.dataset.employees) + len(analyzer.dataset.projects)
+
+
+def department_rows(analyzer, _):
+    """
+    @brief Project and employee rows of analyzed department, for stage instrumentation
+    """
+    return len(analyzer.projects) + analyzer.person_count
+
+
+def batch_rows(_, batch_results):
+    """
+    @brief Department rows of batch result, for stage instrumentation
+    """
+    return len(batch_results)
+
+
+class BaseAnalyzer:
+    """
+    @brief Base class for all commercial analyzers
+    Implements common data loading and processing functionality
+    """
+
+    # Snapshot tables read by _batch_analysis, changes in them trigger recomputation of a department
+    SOURCE_TABLES = (SnapshotTables.EMPLOYEES, SnapshotTables.PROJECTS, SnapshotTables.KPI)
+    # Prefixes of per-category count columns, a missing category means zero occurrences
+    CATEGORY_COLUMN_PREFIXES = ()
+
+    def __init__(self, json_file_path, analysis_name, dataset=None, department_id=Departments.COMMERCIAL):
+        """
+        @brief Initialize base analyzer with data source
+        Sets up data loading and logger configuration
+
+        @param json_file_path: Path to JSON data file
+        @param analysis_name: Name of the analysis for logging
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
+        """
+        self.json_file_path = json_file_path
+        self.analysis_name = analysis_name
+        self.logger = analysis_logger.get_analysis_logger(analysis_name)
+        self.dataset = dataset
+        self.projects = None
+
+        self.logger.info(LogMessages.SYSTEM_START)
+        self.department_id = department_id
+        self.person_count = 0
+        self._load_data()
+        self._setup_dataframes()
+
+    @measured_stage('load_data', rows=dataset_rows)
+    def _load_data(self):
+        """
+        @brief Load JSON data from specified file path
+        Reuses shared dataset when it was injected, otherwise parses the file
+        """
+        if self.dataset is not None:
+            self.logger.info(LogMessages.DATASET_ATTACHED.format(self.dataset.json_file_path))
+        else:
+            self.dataset = CompanyDataset(self.json_file_path, self.logger)
+
+    @property
+    def data(self):
+        """
+        @brief Raw JSON document of the shared dataset, parsed on first access
+
+        @return: Dictionary with company data
+        """
+        return self.dataset.data
+
+    @measured_stage('setup_dataframes', rows=department_rows)
+    def _setup_dataframes(self):
+        """
+        @brief Select department projects and employees from shared dataset tables
+        """
+        self.logger.info(LogMessages.DATA_PROCESSING_START.format(self.analysis_name))
+
+        self.projects = self.dataset.department_projects(self.department_id)
+        self.logger.info(LogMessages.PROJECT_COUNT.format(len(self.projects)))
+
+        self.person_count = self.dataset.department_person_count(self.department_id)
+        self.logger.info(LogMessages.PERSONAL_COUNT.format(self.person_count))
+
+    def execute_analysis(self, generate_report=True):
+        """
+        @brief Execute the analysis (to be implemented by subclasses)
+        Template method for analysis execution
+
+        @param generate_report: Print formatted report to console
+        """
+        raise NotImplementedError("Subclasses must implement execute_analysis method")
+
+    @measured_stage('execute_batch_analysis', rows=batch_rows, department=False)
+    def execute_batch_analysis(self, department_ids=None):
+        """
+        @brief Execute the analysis for many departments in one pass
+        Template method, subclasses provide grouped computation in _batch_analysis
+
+        @param department_ids: Departments to analyze, all departments if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        if department_ids is None:
+            department_ids = self.dataset.department_ids()
+        department_ids = list(department_ids)
+        self.logger.info(LogMessages.BATCH_ANALYSIS_START.format(self.analysis_name, len(department_ids)))
+
+        try:
+            batch_results = self._batch_analysis(department_ids)
+            batch_results = batch_results.reindex(pd.Index(department_ids, name='department_id'))
+            self.logger.info(LogMessages.BATCH_ANALYSIS_COMPLETE.format(self.analysis_name))
+            return batch_results
+
+        except Exception as analysis_error:
+            error_message = LogMessages.ANALYSIS_ERROR.format(self.analysis_name, str(analysis_error))
+            self.logger.error(error_message)
+            raise analysis_error
+
+    def execute_incremental_analysis(self, previous_results, affected_department_ids, department_ids=None):
+        """
+        @brief Execute batch analysis reusing stored results of departments untouched by snapshot changes
+
+        @param previous_results: Batch results of previous snapshot indexed by department_id, None if absent
+        @param affected_department_ids: Departments touched by changes, None if changes are unknown
+        @param department_ids: Departments to analyze, all departments if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        if department_ids is None:
+            department_ids = self.dataset.department_ids()
+        department_ids = list(department_ids)
+        if previous_results is None or affected_department_ids is None:
+            return self.execute_batch_analysis(department_ids)
+
+        recompute_ids = [department_id for department_id in department_ids
+                         if department_id in affected_department_ids or department_id not in previous_results.index]
+        reused_results = previous_results[previous_results.index.isin(department_ids)
+                                          & ~previous_results.index.isin(recompute_ids)]
+        self.logger.info(LogMessages.INCREMENTAL_ANALYSIS_START.format(
+            self.analysis_name, len(recompute_ids), len(reused_results)
+        ))
+
+        if recompute_ids:
+            batch_results = self._merge_batch_results(reused_results, self.execute_batch_analysis(recompute_ids))
+        else:
+            batch_results = reused_results
+        return batch_results.reindex(pd.Index(department_ids, name='department_id'))
+
+    def _merge_batch_results(self, reused_results, recomputed_results):
+        """
+        @brief Combine reused and recomputed batch rows
+        Category columns present on one side only are zero on the other side for departments with results
+
+        @param reused_results: Stored batch rows of unaffected departments
+        @param recomputed_results: Fresh batch rows of affected departments
+        @return: DataFrame indexed by department_id
+        """
+        if reused_results.empty:
+            return recomputed_results
+
+        batch_results = pd.concat([reused_results, recomputed_results])
+        for column in reused_results.columns.symmetric_difference(recomputed_results.columns):
+            if not str(column).startswith(self.CATEGORY_COLUMN_PREFIXES):
+                continue
+            source_results = reused_results if column in reused_results.columns else recomputed_results
+            other_results = recomputed_results if source_results is reused_results else reused_results
+            rows_with_results = other_results.index[other_results.notna().any(axis=1)]
+            batch_results.loc[rows_with_results, column] = 0
+            if batch_results[column].notna().all():
+                batch_results[column] = batch_results[column].astype(source_results[column].dtype)
+        return batch_results
+
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Compute analysis metrics for several departments (to be implemented by subclasses)
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame indexed by department_id
+        """
+        raise NotImplementedError("Subclasses must implement _batch_analysis method")
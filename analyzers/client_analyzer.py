@@ -5,9 +5,11 @@ high-risk and high profit
 """
 
 import pandas as pd
-from analyzers.base_analyzer import BaseAnalyzer
+from analyzers.base_analyzer import BaseAnalyzer, department_rows
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
 from config.messages import LogMessages, ReportMessages
-from config.helper_const import Levels
+from config.helper_const import Levels, Thresholds, Departments
 
 
 class ClientAnalyzer(BaseAnalyzer):
@@ -15,20 +17,37 @@ class ClientAnalyzer(BaseAnalyzer):
     @brief Analyzer for clients for commercial department
     """
 
-    def __init__(self, json_file_path):
+    SOURCE_TABLES = (SnapshotTables.PROJECTS,)
+    CATEGORY_COLUMN_PREFIXES = ('priority_risk_',)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL,
+                 profit_threshold=Thresholds.HIGH_PROFIT, risk_levels=(Levels.HIGH,),
+                 high_priorities=(Levels.HIGH, Levels.CRITICAL), low_priorities=(Levels.LOW,)):
         """
         @brief Initialize clients analyzer
         Sets up specific analysis configuration
 
         @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
+        @param profit_threshold: Projects with profit above threshold are high-profit
+        @param risk_levels: Risk levels treated as high risk
+        @param high_priorities: Priorities counted as high in ratio
+        @param low_priorities: Priorities counted as low in ratio
         """
-        super().__init__(json_file_path, "ClientAnalyzer")
-
-    def execute_analysis(self):
+        self.profit_threshold = profit_threshold
+        self.risk_levels = list(risk_levels)
+        self.high_priorities = list(high_priorities)
+        self.low_priorities = list(low_priorities)
+        super().__init__(json_file_path, "ClientAnalyzer", dataset, department_id)
+
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
         """
         @brief Analysis priorities and risk for projects, ratio high-priority low-priority and projects with
         high-risk and high profit for commercial department
 
+        @param generate_report: Print formatted report to console
         @return: dictionary with priorities-risk, ratio, projects
         """
         self.logger.info(LogMessages.ANALYSIS_START.format("clients"))
@@ -43,7 +62,8 @@ class ClientAnalyzer(BaseAnalyzer):
                 'projects': client_analysis_result.get('projects'),
             }
 
-            self._generate_report(analysis_results)
+            if generate_report:
+                self._generate_report(analysis_results)
             self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("clients"))
 
             return analysis_results
@@ -57,38 +77,94 @@ class ClientAnalyzer(BaseAnalyzer):
         """
         @brief Clients analysis of commercial department
         Calculates priorities and risk for projects, ratio high-priority low-priority and projects with
-        high-risk and high profit for commercial department. High profit - if profit more 200000
+        high-risk and high profit for commercial department. Ratio is None if there are no low-priority projects
 
         @return: dictionary with priorities-risk, ratio, projects
         """
         self.logger.info(LogMessages.CLIENT_PROJECT_ANALYSIS)
 
-        high_priority_count = 0
-        low_priority_count = 0
-        priority_risk = {}
-        res_projects = []
-        projects = self.projects.to_dict(orient='records')
-        for project in projects:
-            risk = project['risk_level']
-            priority = project['priority']
-            total = priority + '/' + risk
-            cur = priority_risk.get(total, 0)
-            priority_risk[total] = cur + 1
-            if priority == Levels.LOW:
-                low_priority_count += 1
-            if priority == Levels.HIGH or priority == Levels.CRITICAL:
-                high_priority_count += 1
-            if project['profit'] > 200000 and risk == Levels.HIGH:
-                res_projects.append(
-                    {'name': project['name'], 'priority': priority, 'risk': risk, 'profit': project['profit']})
+        projects = self.projects
+        if projects.empty:
+            return {'priorities-risk': {}, 'ratio': None, 'projects': []}
+
+        priority_risk = projects.groupby(['priority', 'risk_level'], sort=False).size()
+        flags = self._project_flags(projects)
+        ratio = self._priority_ratio(flags['high_priority_count'].sum(), flags['low_priority_count'].sum())
+
+        selected = projects[flags['high_risk_high_profit_count']]
+        res_projects = [
+            {'name': name, 'priority': priority, 'risk': risk, 'profit': profit}
+            for name, priority, risk, profit in zip(
+                selected['name'], selected['priority'], selected['risk_level'], selected['profit'].tolist()
+            )
+        ]
 
         client_analysis_results = {
-            'priorities-risk': priority_risk,
-            'ratio': high_priority_count / low_priority_count,
+            'priorities-risk': {
+                priority + '/' + risk: int(count) for (priority, risk), count in priority_risk.items()
+            },
+            'ratio': None if pd.isna(ratio) else float(ratio),
             'projects': res_projects,
         }
         return client_analysis_results
 
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Clients analysis for several departments
+        Calculates priorities and risk counts, ratio high-priority low-priority and number and profit of
+        projects with high-risk and high profit with grouped operations.
+        Ratio is NaN if department has no low-priority projects
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with priority counts, ratio and priority_risk_* counts per department
+        """
+        self.logger.info(LogMessages.CLIENT_PROJECT_ANALYSIS)
+
+        projects = self.dataset.departments_projects(department_ids)
+
+        flags = self._project_flags(projects)
+        flags['high_risk_high_profit_total'] = projects['profit'].where(flags['high_risk_high_profit_count'], 0)
+        batch_results = flags.groupby(projects['department_id']).sum()
+        batch_results['ratio'] = self._priority_ratio(
+            batch_results['high_priority_count'], batch_results['low_priority_count']
+        )
+
+        priority_risk = pd.crosstab(projects['department_id'], [projects['priority'], projects['risk_level']])
+        priority_risk.columns = [
+            'priority_risk_{}/{}'.format(priority, risk) for priority, risk in priority_risk.columns
+        ]
+
+        return batch_results.join(priority_risk)
+
+    def _project_flags(self, projects):
+        """
+        @brief Flag projects by configured priority, risk and profit thresholds
+
+        @param projects: DataFrame with priority, risk_level and profit columns
+        @return: Boolean DataFrame aligned with projects
+        """
+        return pd.DataFrame({
+            'high_priority_count': projects['priority'].isin(self.high_priorities),
+            'low_priority_count': projects['priority'].isin(self.low_priorities),
+            'high_risk_high_profit_count': (projects['profit'] > self.profit_threshold)
+                                           & projects['risk_level'].isin(self.risk_levels),
+        }, index=projects.index)
+
+    @staticmethod
+    def _priority_ratio(high_priority_count, low_priority_count):
+        """
+        @brief Zero-safe ratio of high to low priority projects
+
+        @param high_priority_count: Number or Series of high-priority projects
+        @param low_priority_count: Number or Series of low-priority projects
+        @return: Ratio, NaN where there are no low-priority projects
+        """
+        if isinstance(low_priority_count, pd.Series):
+            return high_priority_count / low_priority_count.where(low_priority_count > 0)
+        if low_priority_count == 0:
+            return float('nan')
+        return high_priority_count / low_priority_count
+
     def _generate_report(self, analysis_results):
         """
         @brief Generate formatted clients analysis report
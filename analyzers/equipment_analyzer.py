@@ -0,0 +1,133 @@
+"""
+@brief Equipment analysis module
+Calculates equipment count, average efficiency, monthly maintenance cost and operational ratio of departments
+"""
+
+import math
+import pandas as pd
+from analyzers.base_analyzer import BaseAnalyzer, department_rows
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
+from config.messages import LogMessages, ReportMessages
+from config.helper_const import Departments
+
+
+class EquipmentAnalyzer(BaseAnalyzer):
+    """
+    @brief Analyzer for equipment of commercial department
+    Metrics of all departments are computed once per dataset from its columnar equipment table
+    """
+
+    SOURCE_TABLES = (SnapshotTables.EQUIPMENT,)
+    CATEGORY_COLUMN_PREFIXES = ('equipment_status_',)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL):
+        """
+        @brief Initialize equipment analyzer
+        Sets up specific analysis configuration
+
+        @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
+        """
+        super().__init__(json_file_path, "EquipmentAnalyzer", dataset, department_id)
+
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
+        """
+        @brief Analysis equipment count, efficiency, maintenance cost and operational ratio for commercial department
+
+        @param generate_report: Print formatted report to console
+        @return: dictionary with equipment_count, average_efficiency, total_maintenance_cost,
+                 operational_ratio and statuses
+        """
+        self.logger.info(LogMessages.ANALYSIS_START.format("equipment"))
+
+        try:
+            analysis_results = self._equipment_analysis()
+
+            if generate_report:
+                self._generate_report(analysis_results)
+            self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("equipment"))
+
+            return analysis_results
+
+        except Exception as analysis_error:
+            error_message = LogMessages.ANALYSIS_ERROR.format("equipment", str(analysis_error))
+            self.logger.error(error_message)
+            raise analysis_error
+
+    def _equipment_analysis(self):
+        """
+        @brief Equipment analysis of commercial department
+        Department without equipment has zero count and cost, its efficiency and operational ratio are None
+
+        @return: dictionary with equipment metrics and equipment count per status
+        """
+        self.logger.info(LogMessages.EQUIPMENT_ANALYSIS)
+
+        department_metrics = self.dataset.equipment_table().department_metrics()
+        if self.department_id not in department_metrics.index:
+            return {
+                'equipment_count': 0,
+                'average_efficiency': None,
+                'total_maintenance_cost': 0,
+                'operational_ratio': None,
+                'statuses': {},
+            }
+
+        # Row selection would upcast counts to float, values are read column by column
+        metrics = {column: department_metrics[column].at[self.department_id] for column in department_metrics.columns}
+        return {
+            'equipment_count': int(metrics['equipment_count']),
+            'average_efficiency': self._optional_number(metrics['average_efficiency']),
+            'total_maintenance_cost': metrics['total_maintenance_cost'].item(),
+            'operational_ratio': self._optional_number(metrics['operational_ratio']),
+            'statuses': {column[len(self.CATEGORY_COLUMN_PREFIXES[0]):]: int(count) for column, count in metrics.items()
+                         if column.startswith(self.CATEGORY_COLUMN_PREFIXES) and count > 0},
+        }
+
+    @staticmethod
+    def _optional_number(value):
+        """
+        @brief Python number of metric value, None for NaN
+
+        @param value: NumPy or Python number
+        @return: float or None
+        """
+        value = float(value)
+        return None if math.isnan(value) else value
+
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Equipment analysis for several departments
+        Selects rows of metrics computed for all departments in one grouped pass
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with equipment metrics and equipment_status_<status> counts per department
+        """
+        self.logger.info(LogMessages.EQUIPMENT_ANALYSIS)
+
+        department_metrics = self.dataset.equipment_table().department_metrics()
+        # Departments without equipment own zero items, their averages stay undefined
+        fill_values = {column: 0 for column in department_metrics.columns
+                       if column not in ('average_efficiency', 'operational_ratio')}
+        batch_results = department_metrics.reindex(pd.Index(department_ids, name='department_id'))
+        return batch_results.fillna(fill_values).astype(department_metrics.dtypes)
+
+    def _generate_report(self, analysis_results):
+        """
+        @brief Generate formatted equipment analysis report
+        Outputs analysis results to console and log
+
+        @param analysis_results: Dictionary containing analysis results
+        """
+        print("=" * 70)
+        print(ReportMessages.EQUIPMENT_HEADER)
+        print("=" * 70)
+
+        print("Equipment count: {}".format(analysis_results.get('equipment_count')))
+        print("Average efficiency: {}".format(analysis_results.get('average_efficiency')))
+        print("Monthly maintenance cost: {}".format(analysis_results.get('total_maintenance_cost')))
+        print("Operational ratio: {}".format(analysis_results.get('operational_ratio')))
+        print("Equipment by status: {}".format(analysis_results.get('statuses')))
@@ -1,18 +0,0 @@
-"""
-@brief Analyzers package for IT infrastructure analysis
-Contains all analysis modules for comprehensive infrastructure assessment
-"""
-
-from client_analyzer import ClientAnalyzer
-from language_analyzer import LanguageSkillsAnalyzer
-from personal_analyzer import PersonalEfficiencyAnalyzer
-from projects_metrics_analyzer import ProjectsMetricsAnalyzer
-from roi_up_analyzer import ROIUpAnalyzer
-
-__all__ = [
-    'ClientAnalyzer',
-    'LanguageSkillsAnalyzer',
-    'ProjectsMetricsAnalyzer',
-    'PersonalEfficiencyAnalyzer',
-    'ROIUpAnalyzer'
-]
@@ -4,10 +4,13 @@ Calculates the distribution of language skills, needs for upgrade language skill
 employs, who know english and germany for commercial department
 """
 
+import numpy as np
 import pandas as pd
-from analyzers.base_analyzer import BaseAnalyzer
+from analyzers.base_analyzer import BaseAnalyzer, department_rows
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
 from config.messages import LogMessages, ReportMessages
-from config.helper_const import Language
+from config.helper_const import Language, Departments
 
 
 class LanguageSkillsAnalyzer(BaseAnalyzer):
@@ -15,21 +18,34 @@ class LanguageSkillsAnalyzer(BaseAnalyzer):
     @brief Analyzer for language skills for commercial department
     """
 
-    def __init__(self, json_file_path):
+    SOURCE_TABLES = (SnapshotTables.EMPLOYEES,)
+    CATEGORY_COLUMN_PREFIXES = ('language_',)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL,
+                 required_languages=(Language.ENGLISH, Language.RUSSIAN),
+                 combined_languages=(Language.ENGLISH, Language.GERMANY)):
         """
         @brief Initialize language skills analyzer
         Sets up specific analysis configuration
 
         @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
+        @param required_languages: Languages every employee must know, others need upgrade
+        @param combined_languages: Languages searched together for persons-who-know
         """
-        super().__init__(json_file_path, "LanguageSkillsAnalyzer")
+        self.required_languages = list(required_languages)
+        self.combined_languages = list(combined_languages)
+        super().__init__(json_file_path, "LanguageSkillsAnalyzer", dataset, department_id)
 
-    def execute_analysis(self):
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
         """
         @brief Analysis distribution of language skills, needs for upgrade language skills nad find
         employs, who know english and germany for commercial department
         if people dont know english and russian for then need upgrade language skills
 
+        @param generate_report: Print formatted report to console
         @return: dictionary with distribution, needs(bool) and persons, who know english and germany
         """
         self.logger.info(LogMessages.ANALYSIS_START.format("language skills"))
@@ -44,7 +60,8 @@ class LanguageSkillsAnalyzer(BaseAnalyzer):
                 'persons-who-know': language_analysis_result.get('persons-who-know'),
             }
 
-            self._generate_report(analysis_results)
+            if generate_report:
+                self._generate_report(analysis_results)
             self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("language skills"))
 
             return analysis_results
@@ -58,42 +75,33 @@ class LanguageSkillsAnalyzer(BaseAnalyzer):
         """
         @brief Language analysis of commercial department
         Calculates distribution of language skills, needs for upgrade language skills nad find
-        employs, who know english and germany
+        employs, who know all combined languages (english and germany by default)
 
-        @return: dictionary with distribution, needs and persons, who know english and germany
+        @return: dictionary with distribution, needs and persons, who know combined languages
         """
         self.logger.info(LogMessages.LANGUAGE_ANALYSIS)
 
+        language_matrix = self.dataset.language_matrix()
+        rows = self.dataset.index.department_employee_positions(self.department_id)
+        full_names = self.dataset.employees['full_name'].to_numpy()[rows]
+
+        known_languages = language_matrix.matrix[rows]
+        language_counts = known_languages.sum(axis=0)
+        distribution = {
+            language: int(count)
+            for language, count in zip(language_matrix.languages, language_counts) if count
+        }
+
+        missing_languages = ~language_matrix.known(self.required_languages)[rows]
         needs = []
-        persons_who_know = []
-        distribution = {}
-        for employee in self.data.get('employees', []):
-            if employee.get('work_info')['department_id'] == self.department_id:
-                know_russian = False
-                know_english = False
-                know_germany = False
-                for language in employee.get('additional_info').get('language_skills', []):
-                    if language == Language.ENGLISH:
-                        know_english = True
-                    if language == Language.RUSSIAN:
-                        know_russian = True
-                    if language == Language.GERMANY:
-                        know_germany = True
-                    curr = distribution.get(language, 0)
-                    distribution[language] = curr + 1
-                fio = ''
-                if not know_english or not know_russian:
-                    fio = employee.get('personal_info')['full_name']
-                    fio = fio + '. '
-                    if not know_english:
-                        fio = fio + 'Need upgrade english. '
-                    if not know_russian:
-                        fio = fio + 'Need upgrade russian. '
-                if fio != '':
-                    needs.append(fio.strip())
-                if know_english and know_germany:
-                    fio = employee.get('personal_info')['full_name']
-                    persons_who_know.append(fio)
+        for position in np.flatnonzero(missing_languages.any(axis=1)):
+            upgrades = ' '.join(
+                'Need upgrade {}.'.format(Language.LABELS.get(language, language))
+                for language, missing in zip(self.required_languages, missing_languages[position]) if missing
+            )
+            needs.append('{}. {}'.format(full_names[position], upgrades))
+
+        persons_who_know = full_names[language_matrix.knows_all(self.combined_languages)[rows]].tolist()
 
         language_analysis_results = {
             'distribution': distribution,
@@ -102,6 +110,32 @@ class LanguageSkillsAnalyzer(BaseAnalyzer):
         }
         return language_analysis_results
 
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Language analysis for several departments
+        Calculates distribution of language skills, number of employees who need upgrade language skills
+        and number of employees who know all combined languages with matrix reductions
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with needs_upgrade_count, persons_who_know_count and language_* counts per department
+        """
+        self.logger.info(LogMessages.LANGUAGE_ANALYSIS)
+
+        language_matrix = self.dataset.language_matrix()
+        needs_upgrade = ~language_matrix.knows_all(self.required_languages)
+        persons_who_know = language_matrix.knows_all(self.combined_languages)
+
+        batch_results = pd.DataFrame({
+            'needs_upgrade_count': language_matrix.department_counts(needs_upgrade),
+            'persons_who_know_count': language_matrix.department_counts(persons_who_know),
+        }, index=pd.Index(language_matrix.department_ids, name='department_id'))
+
+        distribution = language_matrix.distribution()
+        distribution.columns = ['language_' + str(language) for language in distribution.columns]
+        batch_results = batch_results.join(distribution)
+
+        return batch_results[batch_results.index.isin(department_ids)]
+
     def _generate_report(self, analysis_results):
         """
         @brief Generate formatted language skills analysis report
@@ -115,4 +149,7 @@ class LanguageSkillsAnalyzer(BaseAnalyzer):
 
         print("language distribution: {}".format(analysis_results.get('distribution')))
         print("Need upgrade skills: {}".format(analysis_results.get('needs')))
-        print("Persons who know english and germany: {}".format(analysis_results.get('persons-who-know')))
+        print("Persons who know {}: {}".format(
+            ' and '.join(Language.LABELS.get(language, language) for language in self.combined_languages),
+            analysis_results.get('persons-who-know')
+        ))
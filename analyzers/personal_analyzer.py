@@ -3,9 +3,12 @@
 Calculates the revenue-per-employee and correlation between salary and performance_score for commercial department
 """
 
-import pandas as pd
-from analyzers.base_analyzer import BaseAnalyzer
+import numpy as np
+from analyzers.base_analyzer import BaseAnalyzer, department_rows
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
 from config.messages import LogMessages, ReportMessages
+from config.helper_const import Departments
 
 
 class PersonalEfficiencyAnalyzer(BaseAnalyzer):
@@ -13,20 +16,26 @@ class PersonalEfficiencyAnalyzer(BaseAnalyzer):
     @brief Analyzer for personal efficiency for commercial department
     """
 
-    def __init__(self, json_file_path):
+    SOURCE_TABLES = (SnapshotTables.EMPLOYEES, SnapshotTables.KPI)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL):
         """
         @brief Initialize personal efficiency analyzer
         Sets up specific analysis configuration
 
         @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
         """
-        super().__init__(json_file_path, "PersonalEfficiencyAnalyzer")
+        super().__init__(json_file_path, "PersonalEfficiencyAnalyzer", dataset, department_id)
 
-    def execute_analysis(self):
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
         """
         @brief Analysis revenue-per-employee and correlation between salary
         and performance_score for commercial department
 
+        @param generate_report: Print formatted report to console
         @return: dictionary with revenue-per-employee and correlation
         """
         self.logger.info(LogMessages.ANALYSIS_START.format("personal efficiency"))
@@ -40,7 +49,8 @@ class PersonalEfficiencyAnalyzer(BaseAnalyzer):
                 'correlation': personal_analysis_result.get('correlation'),
             }
 
-            self._generate_report(analysis_results)
+            if generate_report:
+                self._generate_report(analysis_results)
             self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("personal efficiency"))
 
             return analysis_results
@@ -53,29 +63,21 @@ class PersonalEfficiencyAnalyzer(BaseAnalyzer):
     def _personal_analysis(self):
         """
         @brief Personal analysis of commercial department
-        Calculates revenue-per-employee and correlation between salary and performance_score for commercial department
+        Calculates revenue-per-employee, correlation between salary and performance_score is read
+        from correlation matrices of all departments
 
         @return: dictionary with revenue-per-employee and correlation
         """
         self.logger.info(LogMessages.PERSONAL_REVENUE_PER_EMPLOYEE)
 
         total_profit = 0
-        for metric in self.data.get('kpi_metrics'):
-            if metric['department_id'] == self.department_id:
-                total_profit = metric['project_metrics']['total_profit']
-                break
+        metric = self.dataset.department_kpi(self.department_id)
+        if metric is not None:
+            total_profit = metric['project_metrics']['total_profit']
 
         self.logger.info(LogMessages.PERSONAL_CORRELATION)
-        salary = []
-        performance_score = []
-        for employee in self.data.get('employees', []):
-            if employee.get('work_info')['department_id'] == self.department_id:
-                salary.append(employee.get('work_info')['salary'])
-                performance_score.append(employee.get('work_info')['performance_score'])
-
-        df = pd.DataFrame({'salary': salary, 'performance_score': performance_score})
-        correlation_matrix = df.corr()
-        corr_value = correlation_matrix.loc['salary', 'performance_score']
+        correlation_matrices, _ = self.dataset.employee_correlations()
+        corr_value = correlation_matrices['performance_score'].get((self.department_id, 'salary'), np.nan)
 
         personal_analysis_results = {
             'revenue-per-employee': total_profit / self.person_count,
@@ -84,6 +86,25 @@ class PersonalEfficiencyAnalyzer(BaseAnalyzer):
 
         return personal_analysis_results
 
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Personal analysis for several departments
+        Takes revenue-per-employee and salary/performance_score correlation from the dataset correlation engine
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with revenue_per_employee and correlation per department
+        """
+        self.logger.info(LogMessages.PERSONAL_REVENUE_PER_EMPLOYEE)
+
+        correlation_matrices, department_summary = self.dataset.employee_correlations()
+        department_summary = department_summary[department_summary.index.isin(list(department_ids))]
+
+        self.logger.info(LogMessages.PERSONAL_CORRELATION)
+        salary_rows = correlation_matrices.xs('salary', level='metric')
+        return department_summary.assign(
+            correlation=salary_rows['performance_score'].reindex(department_summary.index)
+        )
+
     def _generate_report(self, analysis_results):
         """
         @brief Generate formatted person analysis report
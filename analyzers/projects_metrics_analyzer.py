@@ -4,8 +4,11 @@ Calculates the profit and roi of all projects where the commercial department wa
 """
 
 import pandas as pd
-from analyzers.base_analyzer import BaseAnalyzer
+from analyzers.base_analyzer import BaseAnalyzer, department_rows
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
 from config.messages import LogMessages, ReportMessages
+from config.helper_const import Departments
 
 
 class ProjectsMetricsAnalyzer(BaseAnalyzer):
@@ -13,20 +16,26 @@ class ProjectsMetricsAnalyzer(BaseAnalyzer):
     @brief Analyzer for project profit and roi for commercial department
     """
 
-    def __init__(self, json_file_path):
+    SOURCE_TABLES = (SnapshotTables.KPI,)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL):
         """
         @brief Initialize project profit analyzer
         Sets up specific analysis configuration
 
         @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
         """
-        super().__init__(json_file_path, "ProjectProfit")
+        super().__init__(json_file_path, "ProjectProfit", dataset, department_id)
 
-    def execute_analysis(self):
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
         """
         @brief Analysis of all projects with the participation
         of the commercial department and calculation of profits
 
+        @param generate_report: Print formatted report to console
         @return: dictionary with profit sum and ROI
         """
         self.logger.info(LogMessages.ANALYSIS_START.format("projects_profit"))
@@ -40,7 +49,8 @@ class ProjectsMetricsAnalyzer(BaseAnalyzer):
                 'average_roi': project_analysis_results.get('average_roi'),
             }
 
-            self._generate_report(analysis_results)
+            if generate_report:
+                self._generate_report(analysis_results)
             self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("projects_profit"))
 
             return analysis_results
@@ -61,11 +71,10 @@ class ProjectsMetricsAnalyzer(BaseAnalyzer):
 
         total_profit = 0
         average_roi = 0
-        for metric in self.data.get('kpi_metrics'):
-            if metric['department_id'] == self.department_id:
-                total_profit = metric['project_metrics']['total_profit']
-                average_roi = metric['project_metrics']['average_roi']
-                break
+        metric = self.dataset.department_kpi(self.department_id)
+        if metric is not None:
+            total_profit = metric['project_metrics']['total_profit']
+            average_roi = metric['project_metrics']['average_roi']
 
         projects_analysis_results = {
             'total_profit': total_profit,
@@ -74,6 +83,22 @@ class ProjectsMetricsAnalyzer(BaseAnalyzer):
 
         return projects_analysis_results
 
+    def _batch_analysis(self, department_ids):
+        """
+        @brief Profit analysis for several departments
+        Reads sum profit and ROI of all requested departments from KPI table in one pass
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with total_profit and average_roi per department
+        """
+        self.logger.info(LogMessages.PROJECT_PROFIT_CALCULATION)
+
+        kpi_metrics = self.dataset.departments_kpi(department_ids)
+        return pd.DataFrame({
+            'total_profit': kpi_metrics['project_metrics.total_profit'],
+            'average_roi': kpi_metrics['project_metrics.average_roi'],
+        })
+
     def _generate_report(self, analysis_results):
         """
         @brief Generate formatted project analysis report
@@ -0,0 +1,28 @@
+"""
+@brief Registry of analyzers selectable by name
+Analyzer modules are imported on first use, so selecting one analyzer does not load the others
+"""
+
+import importlib
+
+
+# Analyzer name: module and class
+ANALYZER_MODULES = {
+    'profit': ('analyzers.projects_metrics_analyzer', 'ProjectsMetricsAnalyzer'),
+    'personal': ('analyzers.personal_analyzer', 'PersonalEfficiencyAnalyzer'),
+    'language': ('analyzers.language_analyzer', 'LanguageSkillsAnalyzer'),
+    'client': ('analyzers.client_analyzer', 'ClientAnalyzer'),
+    'roi_up': ('analyzers.roi_up_analyzer', 'ROIUpAnalyzer'),
+    'equipment': ('analyzers.equipment_analyzer', 'EquipmentAnalyzer'),
+}
+
+
+def analyzer_class(analyzer_name):
+    """
+    @brief Import analyzer class by analyzer name
+
+    @param analyzer_name: Key of ANALYZER_MODULES
+    @return: BaseAnalyzer subclass
+    """
+    module_name, class_name = ANALYZER_MODULES[analyzer_name]
+    return getattr(importlib.import_module(module_name), class_name)
@@ -4,8 +4,12 @@ Calculates potential profit if roi up by 5%
 """
 
 import pandas as pd
-from analyzers.base_analyzer import BaseAnalyzer
+from analyzers.base_analyzer import BaseAnalyzer, department_rows, batch_rows
+from dataset.roi_scenarios import RoiScenarioEngine, DEFAULT_ROI_DELTAS, DEFAULT_COST_REDUCTIONS
+from dataset.snapshot_diff import SnapshotTables
+from utils.instrumentation import measured_stage
 from config.messages import LogMessages, ReportMessages
+from config.helper_const import Departments
 
 
 class ROIUpAnalyzer(BaseAnalyzer):
@@ -13,19 +17,25 @@ class ROIUpAnalyzer(BaseAnalyzer):
     @brief Analyzer for potential profit if roi up by 5% for commercial department
     """
 
-    def __init__(self, json_file_path):
+    SOURCE_TABLES = (SnapshotTables.KPI, SnapshotTables.PROJECTS)
+
+    def __init__(self, json_file_path, dataset=None, department_id=Departments.COMMERCIAL):
         """
         @brief Initialize roi up analyzer
         Sets up specific analysis configuration
 
         @param json_file_path: Path to JSON data file
+        @param dataset: Shared CompanyDataset, loaded from json_file_path if not specified
+        @param department_id: Department analyzed by execute_analysis
         """
-        super().__init__(json_file_path, "ProjectProfit")
+        super().__init__(json_file_path, "ProjectProfit", dataset, department_id)
 
-    def execute_analysis(self):
+    @measured_stage('execute_analysis', rows=department_rows)
+    def execute_analysis(self, generate_report=True):
         """
         @brief Analysis potential profit if roi up by 5% for commercial department
 
+        @param generate_report: Print formatted report to console
         @return: dict with potential profit
         """
         self.logger.info(LogMessages.ANALYSIS_START.format("roi_up_analyzer"))
@@ -38,7 +48,8 @@ class ROIUpAnalyzer(BaseAnalyzer):
                 'potential_profit': roi_up_analysis_results,
             }
 
-            self._generate_report(analysis_results)
+            if generate_report:
+                self._generate_report(analysis_results)
             self.logger.info(LogMessages.ANALYSIS_COMPLETE.format("roi_up_analyzer"))
 
             return analysis_results
@@ -59,22 +70,67 @@ class ROIUpAnalyzer(BaseAnalyzer):
 
         total_profit = 0
         average_roi = 0
-        actual_cost_sum = 0
-        for metric in self.data.get('kpi_metrics'):
-            if metric['department_id'] == self.department_id:
-                total_profit = metric['project_metrics']['total_profit']
-                average_roi = metric['project_metrics']['average_roi']
-                break
+        metric = self.dataset.department_kpi(self.department_id)
+        if metric is not None:
+            total_profit = metric['project_metrics']['total_profit']
+            average_roi = metric['project_metrics']['average_roi']
 
-        projects = self.projects.to_dict(orient='records')
-        for project in projects:
-            actual_cost_sum += project['actual_cost']
+        actual_cost_sum = self.projects['actual_cost'].sum().item()
 
         roi_res = average_roi + 5
         res_profit = actual_cost_sum * roi_res / 100
 
         return res_profit - total_profit
 
+    def _batch_analysis(self, department_ids):
+        """
+        @brief roi up analysis for several departments
+        Calculates profit if roi up by 5% for all requested departments in one pass
+
+        @param department_ids: List of department identifiers
+        @return: DataFrame with potential_profit per department
+        """
+        self.logger.info(LogMessages.ROI_ANALYSIS)
+
+        kpi_metrics = self.dataset.departments_kpi(department_ids)
+        total_profit = kpi_metrics['project_metrics.total_profit']
+        average_roi = kpi_metrics['project_metrics.average_roi']
+
+        projects = self.dataset.departments_projects(department_ids)
+        actual_cost_sum = projects.groupby('department_id')['actual_cost'].sum()
+        actual_cost_sum = actual_cost_sum.reindex(kpi_metrics.index, fill_value=0)
+
+        res_profit = actual_cost_sum * (average_roi + 5) / 100
+        return pd.DataFrame({'potential_profit': res_profit - total_profit})
+
+    @measured_stage('execute_scenario_analysis', rows=batch_rows, department=False)
+    def execute_scenario_analysis(self, roi_deltas=DEFAULT_ROI_DELTAS, cost_reductions=DEFAULT_COST_REDUCTIONS,
+                                  project_adjustments=None, department_ids=None):
+        """
+        @brief Evaluate ROI what-if scenarios for many departments in one array computation
+        Scenario with roi delta 5, no cost reduction and no adjustment equals potential_profit of execute_analysis
+
+        @param roi_deltas: ROI changes in percentage points
+        @param cost_reductions: Shares of actual cost saved
+        @param project_adjustments: Dictionary of scenario name to dictionary of project_id to additional ROI points
+        @param department_ids: Departments to evaluate, all departments with KPI records if not specified
+        @return: DataFrame with one row per scenario and department
+        """
+        self.logger.info(LogMessages.ROI_SCENARIOS.format(len(roi_deltas), len(cost_reductions),
+                                                          len(project_adjustments or {}) + 1))
+
+        try:
+            kpi_table = self.dataset.kpi_table
+            if department_ids is not None:
+                kpi_table = self.dataset.departments_kpi(department_ids)
+            scenario_engine = RoiScenarioEngine(self.dataset.department_projects_table, kpi_table)
+            return scenario_engine.evaluate(roi_deltas, cost_reductions, project_adjustments)
+
+        except Exception as analysis_error:
+            error_message = LogMessages.ANALYSIS_ERROR.format("roi_scenarios", str(analysis_error))
+            self.logger.error(error_message)
+            raise analysis_error
+
     def _generate_report(self, analysis_results):
         """
         @brief Generate formatted project analysis report
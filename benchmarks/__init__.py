@@ -0,0 +1,16 @@
+"""
+@brief Benchmark package for commercial department analysis
+Contains synthetic company generator and benchmark runner
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'CompanyGenerator': 'benchmarks.company_generator',
+    'generate_company_file': 'benchmarks.company_generator',
+    'BenchmarkRunner': 'benchmarks.benchmark_runner',
+    'measure': 'benchmarks.benchmark_runner',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
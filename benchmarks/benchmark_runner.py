@@ -0,0 +1,252 @@
+"""
+@brief Benchmark suite for commercial department analysis
+Generates seeded synthetic companies of growing size, measures wall time and peak memory of
+dataset loading, every analyzer and the full orchestrator, and writes machine-readable results
+
+Usage: python -m benchmarks.benchmark_runner --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from analyzers.registry import ANALYZER_MODULES, analyzer_class
+from benchmarks.company_generator import DEFAULT_SEED, generate_company_file
+from dataset.company_dataset import CompanyDataset
+from dataset.dataset_cache import CACHE_DIRECTORY_SUFFIX
+from orchestration.orchestrator import CommercialDepartmentAnalysisOrchestrator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_REPEAT = 3
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIRECTORY = os.path.join(BENCHMARK_DIRECTORY, 'data')
+DEFAULT_RESULTS_DIRECTORY = os.path.join(BENCHMARK_DIRECTORY, 'results')
+RESULTS_FORMAT_VERSION = 1
+
+# Every registered analyzer, so new analyzers are benchmarked without touching this list
+ANALYZER_CLASSES = [analyzer_class(analyzer_name) for analyzer_name in ANALYZER_MODULES]
+
+
+def measure(function, repeat=DEFAULT_REPEAT, trace_memory=True):
+    """
+    @brief Measure wall time and peak Python heap of a callable
+    Timed runs are not traced, memory is measured in one extra traced run
+
+    @param function: Callable without arguments
+    @param repeat: Number of timed runs
+    @param trace_memory: Measure peak memory with tracemalloc
+    @return: Dictionary with seconds, seconds_min, seconds_median and peak_memory_bytes
+    """
+    seconds = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - started_at)
+
+    peak_memory = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'repeat': repeat,
+        'seconds': seconds,
+        'seconds_min': min(seconds),
+        'seconds_median': statistics.median(seconds),
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def max_rss_bytes():
+    """
+    @brief Peak resident set size of the benchmark process
+
+    @return: Bytes or None where resource module is unavailable
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss if platform.system() == 'Darwin' else max_rss * 1024
+
+
+def _remove_cache(json_file_path):
+    """
+    @brief Remove dataset cache of the file so the next load parses JSON
+    """
+    cache_directory = json_file_path + CACHE_DIRECTORY_SUFFIX
+    if os.path.isdir(cache_directory):
+        for file_name in os.listdir(cache_directory):
+            os.remove(os.path.join(cache_directory, file_name))
+        os.rmdir(cache_directory)
+
+
+class BenchmarkRunner:
+    """
+    @brief Runs all benchmarks for each company size
+    """
+
+    def __init__(self, sizes=DEFAULT_SIZES, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT,
+                 data_directory=DEFAULT_DATA_DIRECTORY, trace_memory=True):
+        """
+        @brief Initialize benchmark configuration
+
+        @param sizes: Numbers of employees of generated companies
+        @param seed: Generator seed
+        @param repeat: Timed runs per benchmark
+        @param data_directory: Directory for generated company files, reused between runs
+        @param trace_memory: Measure peak memory with tracemalloc
+        """
+        self.sizes = list(sizes)
+        self.seed = seed
+        self.repeat = repeat
+        self.data_directory = data_directory
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def run(self):
+        """
+        @brief Execute benchmarks for all sizes
+
+        @return: Dictionary with environment description and list of benchmark results
+        """
+        os.makedirs(self.data_directory, exist_ok=True)
+        for size in self.sizes:
+            self._run_size(size)
+
+        return {
+            'version': RESULTS_FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+            },
+            'seed': self.seed,
+            'max_rss_bytes': max_rss_bytes(),
+            'results': self.results,
+        }
+
+    def _run_size(self, size):
+        """
+        @brief Execute all benchmarks for one company size
+
+        @param size: Number of employees
+        """
+        json_file_path = os.path.join(self.data_directory, 'company_{}_{}.json'.format(size, self.seed))
+        if not os.path.exists(json_file_path):
+            started_at = time.perf_counter()
+            generate_company_file(json_file_path, size, self.seed)
+            self._record(size, 'generate', {'repeat': 1, 'seconds_min': time.perf_counter() - started_at})
+        _remove_cache(json_file_path)
+
+        self._benchmark(size, 'dataset_load.json',
+                        lambda: CompanyDataset(json_file_path, use_cache=False, streaming=False))
+        self._benchmark(size, 'dataset_load.streaming',
+                        lambda: CompanyDataset(json_file_path, use_cache=False, streaming=True))
+        dataset = CompanyDataset(json_file_path)
+        self._benchmark(size, 'dataset_load.cached', lambda: CompanyDataset(json_file_path))
+
+        rows = {'employees': len(dataset.employees), 'projects': len(dataset.projects),
+                'departments': len(dataset.departments), 'equipment': len(dataset.equipment)}
+        for benchmarked_class in ANALYZER_CLASSES:
+            benchmark_name = benchmarked_class.__name__
+            self._benchmark(size, benchmark_name + '.load', lambda: benchmarked_class(json_file_path), rows)
+            analyzer = benchmarked_class(json_file_path, dataset)
+            self._benchmark(size, benchmark_name + '.execute_analysis',
+                            lambda: analyzer.execute_analysis(generate_report=False), rows)
+            self._benchmark(size, benchmark_name + '.execute_batch_analysis',
+                            analyzer.execute_batch_analysis, rows)
+
+        self._benchmark(size, 'orchestrator.comprehensive', lambda: self._run_orchestrator(
+            json_file_path, CommercialDepartmentAnalysisOrchestrator.execute_comprehensive_analysis
+        ), rows)
+        self._benchmark(size, 'orchestrator.batch', lambda: self._run_orchestrator(
+            json_file_path, CommercialDepartmentAnalysisOrchestrator.execute_batch_analysis
+        ), rows)
+
+    @staticmethod
+    def _run_orchestrator(json_file_path, method):
+        """
+        @brief Run orchestrator method from a fresh orchestrator with console output suppressed
+
+        @param json_file_path: Company file path
+        @param method: Unbound orchestrator method
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            method(CommercialDepartmentAnalysisOrchestrator(json_file_path))
+
+    def _benchmark(self, size, name, function, rows=None):
+        """
+        @brief Measure one benchmark and record its result
+
+        @param size: Number of employees
+        @param name: Benchmark name
+        @param function: Callable without arguments
+        @param rows: Row counts of dataset tables
+        """
+        self._record(size, name, measure(function, self.repeat, self.trace_memory), rows)
+
+    def _record(self, size, name, measurement, rows=None):
+        """
+        @brief Store benchmark result and print short progress line
+
+        @param size: Number of employees
+        @param name: Benchmark name
+        @param measurement: Result of measure()
+        @param rows: Row counts of dataset tables
+        """
+        result = {'size': size, 'benchmark': name, 'rows': rows}
+        result.update(measurement)
+        self.results.append(result)
+        print('{:>9} {:<50} {:>10.4f} s'.format(size, name, measurement['seconds_min']))
+
+
+def main():
+    """
+    @brief Parse command line arguments, run benchmarks and write JSON results
+    """
+    parser = argparse.ArgumentParser(description='Benchmark commercial department analysis on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Numbers of employees')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Generator seed')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per benchmark')
+    parser.add_argument('--data-directory', default=DEFAULT_DATA_DIRECTORY, help='Generated company files')
+    parser.add_argument('--output', help='Result JSON file, timestamped file in benchmarks/results by default')
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc memory measurement')
+    arguments = parser.parse_args()
+
+    benchmark_runner = BenchmarkRunner(arguments.sizes, arguments.seed, arguments.repeat,
+                                       arguments.data_directory, not arguments.no_memory)
+    benchmark_results = benchmark_runner.run()
+
+    output_path = arguments.output or os.path.join(
+        DEFAULT_RESULTS_DIRECTORY, 'benchmark_{}.json'.format(datetime.now().strftime('%Y%m%d_%H%M%S'))
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as output_file:
+        json.dump(benchmark_results, output_file, indent=2)
+    print('Benchmark results written to {}'.format(output_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,464 @@
+"""
+@brief Seeded synthetic company data generator
+Writes files following the company.json schema at any number of employees,
+records are streamed to disk so million-employee files never live in memory as one document
+"""
+
+import json
+import numpy as np
+from config.helper_const import Language, Levels, ProjectStatus, Departments
+
+
+DEFAULT_SEED = 2025
+
+# Proportions of the reference company.json: 755 employees, 30 departments, 100 projects, 200 equipment units
+EMPLOYEES_PER_DEPARTMENT = 25
+EMPLOYEES_PER_PROJECT = 7.5
+EMPLOYEES_PER_EQUIPMENT = 3.8
+MIN_DEPARTMENTS = 30
+
+MAX_PROJECT_DEPARTMENTS = 3
+EXTRA_LANGUAGES = ['Французский', 'Китайский']
+LANGUAGES = [Language.ENGLISH, Language.RUSSIAN, Language.GERMANY] + EXTRA_LANGUAGES
+DEPARTMENT_TYPES = ['technical', 'administrative', 'production', 'support']
+POSITIONS = ['Junior', 'Middle', 'Senior', 'Team Lead', 'Manager']
+SKILLS = ['Python', 'Java', 'C++', 'Git', 'AWS', 'SQL', 'Excel', 'CRM']
+EDUCATION = ['Среднее специальное', 'Бакалавр', 'Магистр', 'Кандидат наук']
+WORK_SCHEDULES = ['офис', 'удаленная работа', 'гибрид']
+FIRST_NAMES = ['Александр', 'Мария', 'Дмитрий', 'Анна', 'Игорь', 'Елена', 'Павел', 'Ольга']
+LAST_NAMES = ['Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов']
+MIDDLE_NAMES = ['Александрович', 'Дмитриевич', 'Игоревич', 'Павлович']
+PROJECT_STATUSES = [ProjectStatus.ACTIVE, ProjectStatus.COMPLETED, ProjectStatus.PLANNING, ProjectStatus.ON_HOLD]
+LEVELS = [Levels.LOW, Levels.MEDIUM, Levels.HIGH, Levels.CRITICAL]
+RISK_LEVELS = [Levels.LOW, Levels.MEDIUM, Levels.HIGH]
+EQUIPMENT_TYPES = ['Рабочая станция', 'Сервер', 'Принтер', 'Станок']
+EQUIPMENT_STATUSES = ['operational', 'maintenance', 'broken']
+
+BASE_DATE = np.datetime64('2015-01-01')
+GENERATION_DATE = '2025-10-05T00:00:00'
+DATE_RANGE_DAYS = 3900
+
+
+class CompanyGenerator:
+    """
+    @brief Generator of synthetic company snapshots
+    All random values come from one seeded generator, so equal seed and size give identical files.
+    KPI records are aggregated from generated records, so derived and stored KPIs agree
+    """
+
+    def __init__(self, employee_count, seed=DEFAULT_SEED):
+        """
+        @brief Draw all record fields as column arrays
+
+        @param employee_count: Number of employees in generated company
+        @param seed: Random generator seed
+        """
+        self.employee_count = employee_count
+        self.seed = seed
+        self.random = np.random.default_rng(seed)
+        self.department_count = max(MIN_DEPARTMENTS, int(round(employee_count / EMPLOYEES_PER_DEPARTMENT)))
+        self.project_count = max(1, int(round(employee_count / EMPLOYEES_PER_PROJECT)))
+        self.equipment_count = max(1, int(round(employee_count / EMPLOYEES_PER_EQUIPMENT)))
+
+        self._generate_departments()
+        self._generate_employees()
+        self._generate_projects()
+        self._generate_equipment()
+
+    def _choice(self, values, size):
+        """
+        @brief Draw indexes into a value pool
+
+        @param values: List of possible values
+        @param size: Number of draws
+        @return: Integer array of positions in values
+        """
+        return self.random.integers(0, len(values), size)
+
+    def _dates(self, size, low=0, high=DATE_RANGE_DAYS):
+        """
+        @brief Draw ISO dates after BASE_DATE
+
+        @param size: Number of dates
+        @param low: Minimal day offset
+        @param high: Maximal day offset
+        @return: Tuple of day offsets array and list of ISO date strings
+        """
+        offsets = self.random.integers(low, high, size)
+        return offsets, self._format_dates(offsets)
+
+    @staticmethod
+    def _format_dates(offsets):
+        """
+        @brief Format day offsets after BASE_DATE as ISO timestamps
+
+        @param offsets: Integer array of days
+        @return: List of ISO timestamp strings
+        """
+        dates = np.datetime_as_string(BASE_DATE + offsets.astype('timedelta64[D]'))
+        return [date + 'T00:00:00' for date in dates.tolist()]
+
+    def _generate_departments(self):
+        """
+        @brief Draw department columns
+        """
+        count = self.department_count
+        self.department_ids = np.arange(1, count + 1)
+        self.department_names = ['Отдел {}'.format(department_id) for department_id in range(1, count + 1)]
+        self.department_names[Departments.COMMERCIAL - 1] = 'Отдел продаж'
+        self.department_types = self._choice(DEPARTMENT_TYPES, count)
+        self.department_budgets = self.random.integers(20, 100, count) * 100000
+
+    def _generate_employees(self):
+        """
+        @brief Draw employee columns
+        """
+        count = self.employee_count
+        self.employee_departments = self.random.integers(0, self.department_count, count)
+        self.first_names = self._choice(FIRST_NAMES, count)
+        self.last_names = self._choice(LAST_NAMES, count)
+        self.middle_names = self._choice(MIDDLE_NAMES, count)
+        self.genders = self.random.integers(0, 2, count)
+        _, self.birth_dates = self._dates(count, -12000, -7000)
+        self.positions = self._choice(POSITIONS, count)
+        self.salaries = self.random.integers(50, 300, count) * 1000
+        _, self.hire_dates = self._dates(count)
+        self.experience_years = self.random.integers(0, 30, count)
+        self.performance_scores = np.round(self.random.uniform(40, 100, count), 1)
+        self.skill_masks = self.random.random((count, len(SKILLS))) < 0.3
+        self.education = self._choice(EDUCATION, count)
+        self.work_schedules = self._choice(WORK_SCHEDULES, count)
+        self.language_masks = self.random.random((count, len(LANGUAGES))) < 0.45
+        self.certifications = self.random.integers(0, 6, count)
+        self.employee_flags = self.random.random((count, 3)) < 0.3
+
+    def _generate_projects(self):
+        """
+        @brief Draw project columns and department participation
+        """
+        count = self.project_count
+        self.project_statuses = self._choice(PROJECT_STATUSES, count)
+        self.project_start_offsets, self.project_start_dates = self._dates(count)
+        self.project_durations = self.random.integers(30, 720, count)
+        self.project_end_dates = self._format_dates(self.project_start_offsets + self.project_durations)
+        self.project_budgets = self.random.integers(100000, 5000000, count)
+        self.project_costs = (self.project_budgets * self.random.uniform(0.6, 1.1, count)).astype(np.int64)
+
+        completed = self.project_statuses == PROJECT_STATUSES.index(ProjectStatus.COMPLETED)
+        roi = np.round(self.random.uniform(-10, 40, count), 2)
+        self.project_roi = np.where(completed, roi, 0.0)
+        self.project_profit = np.where(completed, (self.project_costs * self.project_roi / 100).astype(np.int64), 0)
+        self.project_completion = np.where(completed, 100, self.random.integers(0, 100, count))
+        self.project_risks = self._choice(RISK_LEVELS, count)
+        self.project_priorities = self._choice(LEVELS, count)
+
+        # Every project has 1..MAX_PROJECT_DEPARTMENTS distinct departments
+        participant_counts = self.random.integers(1, MAX_PROJECT_DEPARTMENTS + 1, count)
+        self.participation_projects = np.repeat(np.arange(count), participant_counts)
+        first_department = self.random.integers(0, self.department_count, count)
+        step = np.arange(len(self.participation_projects)) - np.repeat(np.cumsum(participant_counts)
+                                                                       - participant_counts, participant_counts)
+        self.participation_departments = (np.repeat(first_department, participant_counts) + step
+                                          * max(1, self.department_count // MAX_PROJECT_DEPARTMENTS)) \
+            % self.department_count
+        self.participation_allocations = self.random.integers(50000, 1000000, len(self.participation_projects))
+        self.participation_bounds = np.concatenate([[0], np.cumsum(participant_counts)])
+
+    def _generate_equipment(self):
+        """
+        @brief Draw equipment columns
+        """
+        count = self.equipment_count
+        self.equipment_departments = self.random.integers(0, self.department_count, count)
+        self.equipment_types = self._choice(EQUIPMENT_TYPES, count)
+        _, self.equipment_purchase_dates = self._dates(count)
+        self.equipment_costs = self.random.integers(10000, 500000, count)
+        self.equipment_statuses = self._choice(EQUIPMENT_STATUSES, count)
+        self.equipment_efficiency = self.random.integers(20, 100, count)
+        self.equipment_maintenance = self.random.integers(1000, 30000, count)
+        self.equipment_hours = self.random.integers(1, 24, count)
+        self.equipment_utilization = self.random.integers(10, 100, count)
+
+    def write(self, file_path):
+        """
+        @brief Write generated company to JSON file section by section
+
+        @param file_path: Target file path
+        """
+        with open(file_path, 'w', encoding='utf-8') as company_file:
+            company_file.write('{"metadata": ')
+            company_file.write(json.dumps(self._metadata(), ensure_ascii=False))
+            for section_name, records in (
+                ('departments', self._department_records()),
+                ('employees', self._employee_records()),
+                ('projects', self._project_records()),
+                ('equipment', self._equipment_records()),
+                ('kpi_metrics', self._kpi_records()),
+            ):
+                company_file.write(', "{}": ['.format(section_name))
+                for position, record in enumerate(records):
+                    if position:
+                        company_file.write(', ')
+                    company_file.write(json.dumps(record, ensure_ascii=False))
+                company_file.write(']')
+            company_file.write(', "company_overview": ')
+            company_file.write(json.dumps(self._company_overview(), ensure_ascii=False))
+            company_file.write('}')
+
+    def _metadata(self):
+        """
+        @brief Build metadata section
+
+        @return: Metadata dictionary
+        """
+        return {
+            'company_name': 'Synthetic Company',
+            'generation_date': GENERATION_DATE,
+            'data_version': '1.0',
+            'seed': self.seed,
+            'record_counts': {
+                'departments': self.department_count,
+                'employees': self.employee_count,
+                'projects': self.project_count,
+                'equipment': self.equipment_count,
+            },
+        }
+
+    def _department_records(self):
+        """
+        @brief Yield departments section records
+        """
+        for position, department_id in enumerate(self.department_ids.tolist()):
+            yield {
+                'id': department_id,
+                'name': self.department_names[position],
+                'type': DEPARTMENT_TYPES[self.department_types[position]],
+                'budget': int(self.department_budgets[position]),
+            }
+
+    def _employee_records(self):
+        """
+        @brief Yield employees section records
+        """
+        departments = self.employee_departments.tolist()
+        salaries = self.salaries.tolist()
+        experience_years = self.experience_years.tolist()
+        performance_scores = self.performance_scores.tolist()
+        certifications = self.certifications.tolist()
+        flags = self.employee_flags.tolist()
+        for position in range(self.employee_count):
+            first_name = FIRST_NAMES[self.first_names[position]]
+            last_name = LAST_NAMES[self.last_names[position]]
+            middle_name = MIDDLE_NAMES[self.middle_names[position]]
+            department = departments[position]
+            employee_id = position + 1
+            yield {
+                'employee_id': employee_id,
+                'personal_info': {
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'middle_name': middle_name,
+                    'full_name': '{} {} {}'.format(last_name, first_name, middle_name),
+                    'gender': 'male' if self.genders[position] else 'female',
+                    'birth_date': self.birth_dates[position][:10],
+                    'email': 'employee{}@company.example'.format(employee_id),
+                    'phone': '+7 (900) {:03d}-{:02d}-{:02d}'.format(employee_id % 1000, employee_id % 97,
+                                                                     employee_id % 89),
+                    'address': 'г. Москва, д. {}'.format(employee_id % 500 + 1),
+                },
+                'work_info': {
+                    'department_id': department + 1,
+                    'department_name': self.department_names[department],
+                    'position': POSITIONS[self.positions[position]],
+                    'salary': salaries[position],
+                    'hire_date': self.hire_dates[position],
+                    'experience_years': experience_years[position],
+                    'performance_score': performance_scores[position],
+                    'skills': [skill for skill, known in zip(SKILLS, self.skill_masks[position]) if known],
+                    'is_team_lead': flags[position][0],
+                    'work_schedule': WORK_SCHEDULES[self.work_schedules[position]],
+                },
+                'additional_info': {
+                    'education': EDUCATION[self.education[position]],
+                    'language_skills': [language for language, known
+                                        in zip(LANGUAGES, self.language_masks[position]) if known],
+                    'certifications': certifications[position],
+                    'has_company_car': flags[position][1],
+                    'security_clearance': flags[position][2],
+                },
+            }
+
+    def _project_records(self):
+        """
+        @brief Yield projects section records
+        """
+        participation_departments = self.participation_departments.tolist()
+        participation_allocations = self.participation_allocations.tolist()
+        for position in range(self.project_count):
+            participation = range(self.participation_bounds[position], self.participation_bounds[position + 1])
+            yield {
+                'project_id': 'PROJ_{:07d}'.format(position + 1),
+                'name': 'Проект {}'.format(position + 1),
+                'description': 'Синтетический проект {}'.format(position + 1),
+                'status': PROJECT_STATUSES[self.project_statuses[position]],
+                'timeline': {
+                    'start_date': self.project_start_dates[position],
+                    'end_date': self.project_end_dates[position],
+                    'duration_days': int(self.project_durations[position]),
+                },
+                'financials': {
+                    'budget': int(self.project_budgets[position]),
+                    'actual_cost': int(self.project_costs[position]),
+                    'profit': int(self.project_profit[position]),
+                    'roi_percentage': float(self.project_roi[position]),
+                },
+                'participating_departments': [{
+                    'department_id': participation_departments[row] + 1,
+                    'department_name': self.department_names[participation_departments[row]],
+                    'budget_allocation': participation_allocations[row],
+                } for row in participation],
+                'metrics': {
+                    'completion_percentage': int(self.project_completion[position]),
+                    'risk_level': RISK_LEVELS[self.project_risks[position]],
+                    'priority': LEVELS[self.project_priorities[position]],
+                },
+            }
+
+    def _equipment_records(self):
+        """
+        @brief Yield equipment section records
+        """
+        for position in range(self.equipment_count):
+            department = int(self.equipment_departments[position])
+            equipment_type = EQUIPMENT_TYPES[self.equipment_types[position]]
+            yield {
+                'equipment_id': 'EQ_{:07d}'.format(position + 1),
+                'name': '{} {}'.format(equipment_type, position + 1),
+                'type': equipment_type,
+                'department_id': department + 1,
+                'department_name': self.department_names[department],
+                'specifications': {
+                    'model': 'MOD-{}'.format(position % 10000),
+                    'manufacturer': 'Synthetic Vendor',
+                    'serial_number': 'SN{:07d}'.format(position + 1),
+                },
+                'purchase_info': {
+                    'purchase_date': self.equipment_purchase_dates[position],
+                    'cost': int(self.equipment_costs[position]),
+                    'vendor': 'Synthetic Vendor',
+                },
+                'operational_info': {
+                    'status': EQUIPMENT_STATUSES[self.equipment_statuses[position]],
+                    'efficiency_percentage': int(self.equipment_efficiency[position]),
+                    'maintenance_cost_per_month': int(self.equipment_maintenance[position]),
+                },
+                'utilization': {
+                    'hours_used_daily': int(self.equipment_hours[position]),
+                    'utilization_rate': int(self.equipment_utilization[position]),
+                },
+            }
+
+    def _department_sums(self, departments, weights=None):
+        """
+        @brief Sum values per department
+
+        @param departments: Zero-based department positions
+        @param weights: Values to sum, records are counted if not specified
+        @return: Float array with one value per department
+        """
+        return np.bincount(departments, weights=weights, minlength=self.department_count)
+
+    def _kpi_records(self):
+        """
+        @brief Yield kpi_metrics section records aggregated from generated records
+        """
+        employee_count = self._department_sums(self.employee_departments)
+        safe_employee_count = np.maximum(employee_count, 1)
+        salary_sum = self._department_sums(self.employee_departments, self.salaries)
+        performance_sum = self._department_sums(self.employee_departments, self.performance_scores)
+        experience_sum = self._department_sums(self.employee_departments, self.experience_years)
+        male_count = self._department_sums(self.employee_departments, self.genders)
+
+        departments = self.participation_departments
+        projects = self.participation_projects
+        participation_count = self._department_sums(departments)
+        statuses = self.project_statuses[projects]
+        active_projects = self._department_sums(
+            departments, statuses == PROJECT_STATUSES.index(ProjectStatus.ACTIVE))
+        completed_projects = self._department_sums(
+            departments, statuses == PROJECT_STATUSES.index(ProjectStatus.COMPLETED))
+        total_profit = self._department_sums(departments, self.project_profit[projects])
+        roi_sum = self._department_sums(departments, self.project_roi[projects])
+        allocation_sum = self._department_sums(departments, self.participation_allocations)
+
+        equipment_count = self._department_sums(self.equipment_departments)
+        safe_equipment_count = np.maximum(equipment_count, 1)
+        efficiency_sum = self._department_sums(self.equipment_departments, self.equipment_efficiency)
+        maintenance_sum = self._department_sums(self.equipment_departments, self.equipment_maintenance)
+        operational_sum = self._department_sums(
+            self.equipment_departments, self.equipment_statuses == EQUIPMENT_STATUSES.index('operational'))
+
+        for position in range(self.department_count):
+            employees = int(employee_count[position])
+            yield {
+                'department_id': position + 1,
+                'department_name': self.department_names[position],
+                'employee_metrics': {
+                    'employee_count': employees,
+                    'planned_employee_count': employees,
+                    'average_salary': int(round(salary_sum[position] / safe_employee_count[position])),
+                    'average_performance': round(performance_sum[position] / safe_employee_count[position], 1),
+                    'turnover_rate': 0.0,
+                    'gender_distribution': {'male': int(male_count[position]),
+                                            'female': employees - int(male_count[position])},
+                    'average_experience': round(experience_sum[position] / safe_employee_count[position], 1),
+                },
+                'project_metrics': {
+                    'active_projects': int(active_projects[position]),
+                    'completed_projects': int(completed_projects[position]),
+                    'total_profit': int(total_profit[position]),
+                    'average_roi': round(roi_sum[position] / max(participation_count[position], 1), 2),
+                },
+                'equipment_metrics': {
+                    'equipment_count': int(equipment_count[position]),
+                    'average_efficiency': round(efficiency_sum[position] / safe_equipment_count[position], 1),
+                    'total_maintenance_cost': int(maintenance_sum[position]),
+                    'operational_ratio': round(operational_sum[position] / safe_equipment_count[position] * 100, 1),
+                },
+                'financial_metrics': {
+                    'budget_utilization': round(allocation_sum[position] / self.department_budgets[position] * 100,
+                                                1),
+                    'cost_per_employee': int(round(salary_sum[position] / safe_employee_count[position])),
+                    'revenue_per_employee': int(round(total_profit[position] / safe_employee_count[position])),
+                },
+            }
+
+    def _company_overview(self):
+        """
+        @brief Build company_overview section
+
+        @return: Overview dictionary
+        """
+        department_sizes = self._department_sums(self.employee_departments).astype(np.int64)
+        return {
+            'total_employees': self.employee_count,
+            'total_projects': self.project_count,
+            'total_equipment': self.equipment_count,
+            'total_budget': int(self.department_budgets.sum()),
+            'average_salary': int(round(self.salaries.mean())),
+            'total_profit': int(self.project_profit.sum()),
+            'department_size_distribution': {
+                str(position + 1): size for position, size in enumerate(department_sizes.tolist())
+            },
+        }
+
+
+def generate_company_file(file_path, employee_count, seed=DEFAULT_SEED):
+    """
+    @brief Generate synthetic company file
+
+    @param file_path: Target file path
+    @param employee_count: Number of employees
+    @param seed: Random generator seed
+    """
+    CompanyGenerator(employee_count, seed).write(file_path)
@@ -0,0 +1,22 @@
+"""
+@brief Configuration package for commercial department analysis
+Contains enums and message templates for system configuration
+"""
+
+from config.messages import LogMessages, ReportMessages, DocumentMessages, ErrorMessages
+from config.helper_const import (Language, Levels, ProjectStatus, EquipmentStatus, KpiSources, Thresholds,
+                                 Departments)
+
+__all__ = [
+    'LogMessages',
+    'ReportMessages',
+    'DocumentMessages',
+    'ErrorMessages',
+    'Language',
+    'Levels',
+    'ProjectStatus',
+    'EquipmentStatus',
+    'KpiSources',
+    'Thresholds',
+    'Departments'
+]
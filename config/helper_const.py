@@ -12,9 +12,58 @@ class Language:
     RUSSIAN = 'Русский'
     GERMANY = 'Немецкий'
 
+    # Names used in report messages
+    LABELS = {
+        ENGLISH: 'english',
+        RUSSIAN: 'russian',
+        GERMANY: 'germany',
+    }
+
 
 class Levels:
     HIGH = 'high'
     MEDIUM = 'medium'
     LOW = 'low'
     CRITICAL = 'critical'
+
+
+class ProjectStatus:
+    """
+    @brief Project status constants
+    """
+    ACTIVE = 'active'
+    COMPLETED = 'completed'
+    PLANNING = 'planning'
+    ON_HOLD = 'on_hold'
+
+
+class EquipmentStatus:
+    """
+    @brief Equipment status constants
+    """
+    OPERATIONAL = 'operational'
+    MAINTENANCE = 'maintenance'
+    BROKEN = 'broken'
+    RETIRED = 'retired'
+
+
+class KpiSources:
+    """
+    @brief Sources of department KPI metrics
+    """
+    STORED = 'stored'
+    DERIVED = 'derived'
+
+
+class Thresholds:
+    """
+    @brief Threshold constants for analysis
+    """
+    HIGH_PROFIT = 200000
+
+
+class Departments:
+    """
+    @brief Department identifier constants
+    """
+    COMMERCIAL = 17
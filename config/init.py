@@ -1,15 +0,0 @@
-"""
-@brief Configuration package for commercial department analysis
-Contains enums and message templates for system configuration
-"""
-
-from messages import LogMessages, ReportMessages, ErrorMessages
-from helper_const import Language, Levels
-
-__all__ = [
-    'LogMessages',
-    'ReportMessages',
-    'ErrorMessages',
-    'Language',
-    'Levels'
-]
@@ -1,68 +1,183 @@
-"""
-@brief Message templates for commercial departments Analysis
-Contains all user-facing messages and logging templates
-"""
-
-
-class LogMessages:
-    """
-    @brief Log message templates for analysis operations
-    Standardized messages for different logging levels and operations
-    """
-
-    # System initialization messages
-    SYSTEM_START = "Commercial Department System initialization started"
-    SYSTEM_READY = "Commercial Department System ready"
-    DATA_LOAD_START = "Starting data loading process from JSON file"
-    DATA_PROCESSING_START = "Starting data processing"
-    DATA_LOAD_SUCCESS = "Data successfully loaded from file: {}"
-    DATA_LOAD_ERROR = "Error loading data from file: {} - {}"
-
-    # Project analysis messages
-    PROJECT_COUNT = 'Total project count: {}'
-    PROJECT_PROFIT_CALCULATION = 'Calculating average ROI and profit'
-
-    # Personal analysis messages
-    PERSONAL_COUNT = 'Total person count: {}'
-    PERSONAL_REVENUE_PER_EMPLOYEE = 'Calculating revenue per employee'
-    PERSONAL_CORRELATION = 'Calculating correlation between salary and performance_score'
-
-    # Language Skills
-    LANGUAGE_ANALYSIS = 'Language complex analysis'
-
-    # Clients analyses
-    CLIENT_PROJECT_ANALYSIS = 'Client project analysis'
-
-    # ROI Up analyses
-    ROI_ANALYSIS = 'ROI up analysis'
-
-    # Analysis process messages
-    ANALYSIS_START = "Starting {} analysis"
-    ANALYSIS_COMPLETE = "{} analysis completed successfully"
-    ANALYSIS_ERROR = "Error during {} analysis: {}"
-
-
-class ReportMessages:
-    """
-    @brief Report message templates for analysis results
-    Standardized output messages for different analysis sections
-    """
-
-    # Section headers
-    PROJECT_PROFIT_HEADER = "PROFIT ANALYSIS"
-    PERSON_HEADER = "PERSON ANALYSIS"
-    LANGUAGE_HEADER = "LANGUAGE ANALYSIS"
-    CLIENT_HEADER = "CLIENT ANALYSIS"
-    ROI_HEADER = "ROI UP ANALYSIS"
-
-
-class ErrorMessages:
-    """
-    @brief Error message templates
-    Standardized error messages for exception handling
-    """
-
-    FILE_NOT_FOUND = "Configuration file not found: {}"
-    INVALID_JSON = "Invalid JSON format in file: {}"
-    DATA_VALIDATION_ERROR = "Data validation error: {}"
-    CALCULATION_ERROR = "Calculation error in {}: {}"
+"""
+@brief Message templates for commercial departments Analysis
+Contains all user-facing messages and logging templates
+"""
+
+
+class LogMessages:
+    """
+    @brief Log message templates for analysis operations
+    Standardized messages for different logging levels and operations
+    """
+
+    # System initialization messages
+    SYSTEM_START = "Commercial Department System initialization started"
+    SYSTEM_READY = "Commercial Department System ready"
+    DATA_LOAD_START = "Starting data loading process from JSON file"
+    DATA_STREAM_START = "Starting streaming data loading process from JSON file"
+    DATA_PROCESSING_START = "Starting data processing"
+    DATA_LOAD_SUCCESS = "Data successfully loaded from file: {}"
+    DATA_LOAD_ERROR = "Error loading data from file: {} - {}"
+    DATASET_BUILD_START = "Building shared dataset tables"
+    DATASET_BUILD_COMPLETE = "Shared dataset ready: {} projects, {} employees, {} departments with KPI"
+    DATASET_ATTACHED = "Using shared dataset loaded from file: {}"
+    CACHE_HIT = "Dataset tables loaded from cache: {}"
+    CACHE_MISS = "Dataset cache is missing or outdated for file: {}"
+    CACHE_STORED = "Dataset tables stored in cache: {}"
+    CACHE_READ_ERROR = "Error reading dataset cache: {} - {}"
+    CACHE_WRITE_ERROR = "Error writing dataset cache: {} - {}"
+    TABLES_SHARED = "Dataset tables published for worker processes: {}"
+    TABLES_NOT_SHARED = "pyarrow is not installed, dataset tables are copied to every worker process"
+    RESULT_STORE_EMPTY = "Result store is empty or outdated: {}"
+    RESULT_STORE_LOADED = "Stored results of {} loaded for {} stages"
+    RESULT_STORE_STORED = "Analysis results stored: {}"
+    RESULT_STORE_READ_ERROR = "Error reading result store: {} - {}"
+    RESULT_STORE_WRITE_ERROR = "Error writing result store: {} - {}"
+    SNAPSHOT_DIFF = "Snapshot changes: {} changed {} records in departments {}"
+    TREND_SNAPSHOTS = "Snapshot history {}: {} snapshots, {} analyzed, {} reused from trend store"
+    TREND_STORE_READ_ERROR = "Error reading trend store: {} - {}"
+    TREND_STORE_WRITE_ERROR = "Error writing trend store: {} - {}"
+    SNAPSHOT_SKIPPED = "File without snapshot date in name skipped: {}"
+
+    # Project analysis messages
+    PROJECT_COUNT = 'Total project count: {}'
+    PROJECT_PROFIT_CALCULATION = 'Calculating average ROI and profit'
+
+    # Personal analysis messages
+    PERSONAL_COUNT = 'Total person count: {}'
+    PERSONAL_REVENUE_PER_EMPLOYEE = 'Calculating revenue per employee'
+    PERSONAL_CORRELATION = 'Calculating correlation between salary and performance_score'
+
+    # Language Skills
+    LANGUAGE_ANALYSIS = 'Language complex analysis'
+
+    # Clients analyses
+    CLIENT_PROJECT_ANALYSIS = 'Client project analysis'
+
+    # ROI Up analyses
+    ROI_ANALYSIS = 'ROI up analysis'
+    ROI_SCENARIOS = 'Evaluating ROI scenarios: {} ROI deltas x {} cost reductions x {} project adjustments'
+    EQUIPMENT_ANALYSIS = 'Calculating equipment count, efficiency, maintenance cost and operational ratio'
+
+    # Analysis process messages
+    ANALYSIS_START = "Starting {} analysis"
+    ANALYSIS_COMPLETE = "{} analysis completed successfully"
+    ANALYSIS_ERROR = "Error during {} analysis: {}"
+    STAGE_START = "Stage {} started"
+    STAGE_COMPLETE = "Stage {} completed in {:.3f} s"
+    STAGE_ERROR = "Stage {} failed: {}"
+    STAGE_SKIPPED = "Stage {} skipped because stage {} did not complete"
+    BATCH_ANALYSIS_START = "Starting {} batch analysis for {} departments"
+    BATCH_ANALYSIS_COMPLETE = "{} batch analysis completed successfully"
+    METRICS_EXPORTED = "Stage metrics written to {} and {}"
+    METRICS_EXPORT_ERROR = "Error writing stage metrics to {} - {}"
+    INCREMENTAL_ANALYSIS_START = "Starting {} incremental analysis: {} departments recomputed, {} reused"
+    SERVICE_STARTED = "Analysis service listening on http://{}:{}"
+    SERVICE_DATASET_LOADED = "Dataset version {} loaded from {} in {:.3f} s"
+    SERVICE_RELOAD_ERROR = "Error reloading dataset from {} - {}, version {} stays active"
+    SERVICE_REQUEST_ERROR = "Error handling request {} - {}"
+    REPORTS_RENDERED = "{} report files of {} departments written to {} in {:.3f} s"
+    RESULTS_STREAMED = "{} result records written to {}"
+    REPORT_RENDER_ERROR = "Error rendering reports into {} - {}"
+
+
+class ReportMessages:
+    """
+    @brief Report message templates for analysis results
+    Standardized output messages for different analysis sections
+    """
+
+    # Section headers
+    PROJECT_PROFIT_HEADER = "PROFIT ANALYSIS"
+    PERSON_HEADER = "PERSON ANALYSIS"
+    LANGUAGE_HEADER = "LANGUAGE ANALYSIS"
+    CLIENT_HEADER = "CLIENT ANALYSIS"
+    ROI_HEADER = "ROI UP ANALYSIS"
+    EQUIPMENT_HEADER = "EQUIPMENT ANALYSIS"
+    BATCH_HEADER = "ALL DEPARTMENTS BATCH ANALYSIS"
+    KPI_RECONCILIATION_HEADER = "KPI RECONCILIATION"
+    INCREMENTAL_HEADER = "INCREMENTAL ALL DEPARTMENTS ANALYSIS"
+    ROI_SCENARIOS_HEADER = "ROI WHAT-IF SCENARIOS"
+    TREND_HEADER = "SNAPSHOT HISTORY TREND ANALYSIS"
+
+
+class DocumentMessages:
+    """
+    @brief Text templates of rendered department reports
+    """
+
+    TITLE = "Отчет об анализе коммерческой деятельности"
+    DEPARTMENT = "Отдел: {} (ID: {})"
+    INDICATOR = "Показатель"
+    VALUE = "Значение"
+    CONCLUSION = "Вывод"
+    NO_DATA = "Нет данных"
+
+    PROFIT_SECTION = "1. Анализ продаж и финансовые результаты"
+    TOTAL_PROFIT = "Общая прибыль отдела"
+    TOTAL_PROFIT_CONCLUSION = "Общая прибыль от всех проектов, в которых участвовал отдел."
+    AVERAGE_ROI = "Средний ROI"
+    AVERAGE_ROI_CONCLUSION = "Текущий возврат инвестиций по проектам отдела."
+
+    PERSONAL_SECTION = "2. Персональная эффективность"
+    REVENUE_PER_EMPLOYEE = "Revenue per Employee"
+    REVENUE_PER_EMPLOYEE_CONCLUSION = "Показатель выручки на одного сотрудника отдела."
+    CORRELATION = "Корреляция (Зарплата vs. Performance Score)"
+    CORRELATION_CONCLUSION = "{} {} корреляция."
+    CORRELATION_STRENGTHS = ((0.7, "Сильная"), (0.3, "Умеренная"), (0.0, "Слабая"))
+    POSITIVE = "положительная"
+    NEGATIVE = "отрицательная"
+
+    LANGUAGE_SECTION = "3. Языковая аналитика"
+    LANGUAGE_NEEDS = "Потребность в дополнительном языковом обучении"
+    LANGUAGE_DISTRIBUTION = "Распределение навыков"
+    LANGUAGE_COMBINED = "Сотрудники со знанием английского и немецкого одновременно"
+    LANGUAGE_SKILL = "Язык"
+    EMPLOYEE_COUNT = "Сотрудников"
+
+    CLIENT_SECTION = "4. Клиентская аналитика"
+    PRIORITY_RISK = "Распределение проектов по приоритету и риску"
+    PRIORITY_RISK_PAIR = "Приоритет / риск"
+    PROJECT_COUNT = "Проектов"
+    PRIORITY_RATIO = "Отношение проектов с высоким и критичным приоритетом к низкому: {}"
+    RISKY_PROJECTS = "Проекты с высоким риском и высокой прибыльностью"
+    PROJECT = "Проект"
+    PRIORITY = "Приоритет"
+    PROFIT = "Прибыль"
+
+    STRATEGY_SECTION = "5. Стратегические рекомендации"
+    POTENTIAL_PROFIT = "Потенциальный эффект от увеличения ROI на 5%: увеличение прибыли на {}"
+
+    EQUIPMENT_SECTION = "6. Оборудование"
+    EQUIPMENT_COUNT = "Единиц оборудования"
+    EQUIPMENT_COUNT_CONCLUSION = "Оборудование, закреплённое за отделом."
+    AVERAGE_EFFICIENCY = "Средняя эффективность"
+    AVERAGE_EFFICIENCY_CONCLUSION = "Средний процент эффективности оборудования отдела."
+    MAINTENANCE_COST = "Затраты на обслуживание в месяц"
+    MAINTENANCE_COST_CONCLUSION = "Суммарные ежемесячные затраты на обслуживание."
+    OPERATIONAL_RATIO = "Доля работающего оборудования"
+    OPERATIONAL_RATIO_CONCLUSION = "Оборудование в статусе operational от общего количества."
+    EQUIPMENT_STATUSES = "Оборудование по статусам"
+    EQUIPMENT_STATUS = "Статус"
+
+    CURRENCY = "{} руб."
+    PERCENT = "{}%"
+
+
+class ErrorMessages:
+    """
+    @brief Error message templates
+    Standardized error messages for exception handling
+    """
+
+    FILE_NOT_FOUND = "Configuration file not found: {}"
+    INVALID_JSON = "Invalid JSON format in file: {}"
+    DATA_VALIDATION_ERROR = "Data validation error: {}"
+    CALCULATION_ERROR = "Calculation error in {}: {}"
+    REPORT_FORMAT_UNAVAILABLE = "Report format {} requires package {}"
+    RESULT_SINK_UNAVAILABLE = "Result sink {} requires package {}"
+    NO_SNAPSHOTS = "No dated snapshot files found in directory: {}"
+    DUPLICATE_SNAPSHOT_DATE = "Several snapshot files of date {}: {}"
+    COMPRESSION_UNAVAILABLE = "Compressed input {} requires package {}"
+    COMPRESSION_UNSUPPORTED = "Compression format {} is not supported, recompress {} as gzip, xz, bz2, zstd or zip"
+    ZIP_MEMBER_AMBIGUOUS = "Zip archive {} must contain one JSON file, found: {}"
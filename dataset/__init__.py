@@ -0,0 +1,31 @@
+"""
+@brief Dataset package for commercial department analysis
+Contains the shared company dataset used by all analyzers
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'CompanyDataset': 'dataset.company_dataset',
+    'open_input': 'dataset.compressed_input',
+    'CorrelationEngine': 'dataset.correlation_engine',
+    'DatasetCache': 'dataset.dataset_cache',
+    'DatasetIndex': 'dataset.dataset_index',
+    'EquipmentTable': 'dataset.equipment_table',
+    'KpiEngine': 'dataset.kpi_engine',
+    'LanguageMatrix': 'dataset.language_matrix',
+    'ResultStore': 'dataset.result_store',
+    'RoiScenarioEngine': 'dataset.roi_scenarios',
+    'SharedTables': 'dataset.shared_tables',
+    'SnapshotDiff': 'dataset.snapshot_diff',
+    'SnapshotTables': 'dataset.snapshot_diff',
+    'snapshot_signature': 'dataset.snapshot_diff',
+    'TrendStore': 'dataset.snapshot_history',
+    'discover_snapshots': 'dataset.snapshot_history',
+    'StreamingJsonReader': 'dataset.streaming_loader',
+    'stream_company_file': 'dataset.streaming_loader',
+    'CompanyTableBuilder': 'dataset.table_builder',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
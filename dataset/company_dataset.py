@@ -0,0 +1,358 @@
+"""
+@brief Shared company dataset for commercial department analysis
+Loads company JSON data once and exposes flattened tables to all analyzers
+"""
+
+import json
+import os
+import threading
+from dataset.compressed_input import detect_compression, open_input
+from dataset.correlation_engine import CorrelationEngine
+from dataset.dataset_cache import DatasetCache
+from dataset.dataset_index import DatasetIndex
+from dataset.equipment_table import EquipmentTable
+from dataset.kpi_engine import KpiEngine
+from dataset.language_matrix import LanguageMatrix
+from dataset.shared_tables import SharedTables, SHARED_TABLES_AVAILABLE
+from dataset.streaming_loader import stream_company_file
+from dataset.table_builder import CompanyTableBuilder, TEXT_COLUMNS
+from utils.logger import analysis_logger
+from config.messages import LogMessages
+from config.helper_const import KpiSources
+
+
+CACHED_TABLES = ['departments', 'projects', 'project_departments', 'employees', 'equipment', 'kpi_metrics']
+
+# Tables published for worker processes, the derived long table is published too so workers do not rebuild it
+SHARED_TABLES = CACHED_TABLES + ['department_projects_table']
+
+# Files larger than this are streamed record by record instead of parsed with json.load
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+
+class CompanyDataset:
+    """
+    @brief Parsed company data shared between analyzers
+    Holds flattened projects/employees/equipment/kpi tables and lookup indexes,
+    the JSON document itself is parsed only when it is requested
+    """
+
+    def __init__(self, json_file_path, logger=None, use_cache=True, streaming=None, kpi_source=KpiSources.STORED,
+                 text_columns=False):
+        """
+        @brief Load flattened company data from cache or JSON file
+
+        @param json_file_path: Path to JSON data file
+        @param logger: Logger instance, dataset logger is used if not specified
+        @param use_cache: Read and write on-disk table cache next to the JSON file
+        @param streaming: Build tables with the streaming reader, chosen by compression and size if not specified
+        @param kpi_source: KpiSources.STORED to use exported kpi_metrics, KpiSources.DERIVED to recompute them
+        @param text_columns: Keep free text columns unused by analyzers, such as project description
+        """
+        self.json_file_path = json_file_path
+        self.kpi_source = kpi_source
+        self.text_columns = text_columns
+        self.logger = logger or analysis_logger.get_analysis_logger("CompanyDataset")
+        self._data = None
+        self.departments = None
+        self.projects = None
+        self.project_departments = None
+        self.department_projects_table = None
+        self.employees = None
+        self.equipment = None
+        self.kpi_metrics = None
+        self.index = None
+        self.kpi_by_department = {}
+        self.kpi_table = None
+        self._language_matrix = None
+        self._derived_kpi = None
+        self._employee_correlations = None
+        self._equipment_table = None
+        self._shared_tables = None
+        self._lazy_lock = threading.Lock()
+
+        cache = DatasetCache(json_file_path, self.logger) if use_cache else None
+        cached_tables = cache.load() if cache else None
+        if cached_tables is not None and text_columns and not all(
+                column in cached_tables[table_name] for table_name, columns in TEXT_COLUMNS.items()
+                for column in columns):
+            # Cache written without text columns is rebuilt with them
+            cached_tables = None
+        if cached_tables is not None:
+            self._set_tables(cached_tables)
+        else:
+            if streaming is None:
+                # Compressed exports are streamed, so decompression overlaps with building tables
+                streaming = detect_compression(json_file_path) is not None \
+                    or os.path.getsize(json_file_path) > STREAMING_THRESHOLD_BYTES
+            if streaming:
+                self._stream_tables()
+            else:
+                self._load_data()
+                self._build_tables()
+            if cache:
+                cache.store({table_name: getattr(self, table_name) for table_name in CACHED_TABLES})
+
+        self._build_derived_tables()
+
+    @property
+    def data(self):
+        """
+        @brief Parsed JSON document, loaded on first access
+
+        @return: Dictionary with company data
+        """
+        if self._data is None:
+            self._load_data()
+        return self._data
+
+    def _load_data(self):
+        """
+        @brief Load JSON document from file
+        Handles file reading and JSON parsing with error handling
+        """
+        self.logger.info(LogMessages.DATA_LOAD_START)
+        try:
+            with open_input(self.json_file_path) as json_file:
+                self._data = json.load(json_file)
+            self.logger.info(LogMessages.DATA_LOAD_SUCCESS.format(self.json_file_path))
+        except Exception as loading_error:
+            error_message = LogMessages.DATA_LOAD_ERROR.format(
+                self.json_file_path, str(loading_error)
+            )
+            self.logger.error(error_message)
+            raise loading_error
+
+    def _build_tables(self):
+        """
+        @brief Flatten loaded document into column-oriented tables
+        Each table is built once and reused by every analyzer
+        """
+        self.logger.info(LogMessages.DATASET_BUILD_START)
+
+        table_builder = CompanyTableBuilder(self.text_columns)
+        table_builder.add_document(self._data)
+        self._set_tables(table_builder.build())
+
+    def _stream_tables(self):
+        """
+        @brief Build tables while streaming the JSON file record by record
+        Memory is bounded by the flattened tables, the document itself is never materialized
+        """
+        self.logger.info(LogMessages.DATASET_BUILD_START)
+
+        table_builder = CompanyTableBuilder(self.text_columns)
+        stream_company_file(self.json_file_path, table_builder.record_handlers(), self.logger)
+        self._set_tables(table_builder.build())
+
+    def _set_tables(self, tables):
+        """
+        @brief Store built tables as dataset attributes
+
+        @param tables: Dictionary of table name to DataFrame
+        """
+        for table_name in CACHED_TABLES:
+            setattr(self, table_name, tables[table_name])
+
+        self.logger.info(LogMessages.DATASET_BUILD_COMPLETE.format(
+            len(self.projects), len(self.employees), len(self.kpi_metrics)
+        ))
+
+    def _build_derived_tables(self):
+        """
+        @brief Build tables and indexes derived from flattened tables
+        Derived data is cheap to rebuild and therefore never cached
+        """
+        # Long project x department table used by batch analyses
+        participation = self.project_departments.drop_duplicates(['project_id', 'department_id'])
+        self.department_projects_table = participation[['project_id', 'department_id', 'budget_allocation']].merge(
+            self.projects, on='project_id', how='left', sort=False
+        )
+
+        self.index = DatasetIndex(self.projects, self.project_departments, self.department_projects_table,
+                                  self.employees, self.kpi_metrics)
+        self.kpi_by_department = self.index.kpi_by_department
+        self.kpi_table = self.kpi_metrics.set_index('department_id')
+
+        if self.kpi_source == KpiSources.DERIVED:
+            self.kpi_table = self.derived_kpi()
+            self.kpi_by_department = DatasetIndex.nest_kpi_records(self.kpi_table.reset_index())
+
+    def share_tables(self):
+        """
+        @brief Publish flattened tables for worker processes
+        Afterwards pickled copies of the dataset carry only a handle and map the published tables read-only
+
+        @return: True if tables are shared, False if pyarrow is not installed
+        """
+        if self._shared_tables is None:
+            if not SHARED_TABLES_AVAILABLE:
+                self.logger.warning(LogMessages.TABLES_NOT_SHARED)
+                return False
+            self._shared_tables = SharedTables.publish({
+                table_name: getattr(self, table_name) for table_name in SHARED_TABLES
+            })
+            self.logger.info(LogMessages.TABLES_SHARED.format(self._shared_tables.directory))
+        return True
+
+    def __getstate__(self):
+        """
+        @brief Pickle state without lock, datasets are sent to worker processes
+        Shared tables and the parsed document are left out, workers attach to the published tables
+
+        @return: Instance dictionary copy
+        """
+        state = self.__dict__.copy()
+        del state['_lazy_lock']
+        if self._shared_tables is not None:
+            state['_data'] = None
+            for table_name in SHARED_TABLES:
+                state[table_name] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        @brief Restore pickled state with a fresh lock, shared tables are mapped
+
+        @param state: Instance dictionary from __getstate__
+        """
+        self.__dict__.update(state)
+        self._lazy_lock = threading.Lock()
+        if self._shared_tables is not None:
+            for table_name, table in self._shared_tables.attach().items():
+                setattr(self, table_name, table)
+
+    def language_matrix(self):
+        """
+        @brief Employee x language matrix, encoded on first access
+
+        @return: LanguageMatrix aligned with employees table rows
+        """
+        with self._lazy_lock:
+            if self._language_matrix is None:
+                self._language_matrix = LanguageMatrix(self.employees)
+        return self._language_matrix
+
+    def equipment_table(self):
+        """
+        @brief Typed columnar equipment table, encoded on first access
+
+        @return: EquipmentTable of all equipment records
+        """
+        with self._lazy_lock:
+            if self._equipment_table is None:
+                self._equipment_table = EquipmentTable(self.equipment)
+        return self._equipment_table
+
+    def derived_kpi(self):
+        """
+        @brief Department KPIs recomputed from projects and employees, calculated on first access
+
+        @return: DataFrame indexed by department_id
+        """
+        with self._lazy_lock:
+            if self._derived_kpi is None:
+                kpi_engine = KpiEngine(self.departments, self.department_projects_table, self.employees)
+                self._derived_kpi = kpi_engine.compute()
+        return self._derived_kpi
+
+    def employee_correlations(self):
+        """
+        @brief Employee metric correlation matrices and revenue per employee of all departments,
+        calculated on first access
+
+        @return: Tuple of correlation matrices indexed by department_id and metric
+                 and DataFrame with person_count and revenue_per_employee indexed by department_id
+        """
+        with self._lazy_lock:
+            if self._employee_correlations is None:
+                correlation_engine = CorrelationEngine()
+                correlation_engine.update_employees(self.employees)
+                self._employee_correlations = correlation_engine.compute(
+                    self.kpi_table['project_metrics.total_profit']
+                )
+        return self._employee_correlations
+
+    def kpi_discrepancies(self):
+        """
+        @brief Compare exported kpi_metrics with KPIs derived from raw records
+
+        @return: DataFrame with one row per department and metric
+        """
+        return KpiEngine.discrepancies(self.kpi_metrics.set_index('department_id'), self.derived_kpi())
+
+    def department_ids(self):
+        """
+        @brief List identifiers of all known departments
+
+        @return: Sorted list of department identifiers
+        """
+        known_ids = set(self.departments['department_id'])
+        known_ids.update(self.index.employee_positions)
+        known_ids.update(self.kpi_by_department)
+        return sorted(known_ids)
+
+    def department_projects(self, department_id):
+        """
+        @brief Select projects with participation of the department
+
+        @param department_id: Department identifier
+        @return: DataFrame with one row per project in source order
+        """
+        project_positions = self.index.department_project_positions(department_id)
+        return self.projects.iloc[project_positions].reset_index(drop=True)
+
+    def department_employees(self, department_id):
+        """
+        @brief Select employees of the department
+
+        @param department_id: Department identifier
+        @return: DataFrame with one row per employee in source order
+        """
+        return self.employees.iloc[self.index.department_employee_positions(department_id)]
+
+    def departments_employees(self, department_ids):
+        """
+        @brief Select employees of several departments
+
+        @param department_ids: Iterable of department identifiers
+        @return: DataFrame with employees rows in source order
+        """
+        return self.employees.iloc[self.index.positions_for(self.index.employee_positions, department_ids)]
+
+    def departments_projects(self, department_ids):
+        """
+        @brief Select rows of long project x department table for several departments
+
+        @param department_ids: Iterable of department identifiers
+        @return: DataFrame with one row per project and participating department
+        """
+        positions = self.index.positions_for(self.index.participation_positions, department_ids)
+        return self.department_projects_table.iloc[positions]
+
+    def departments_kpi(self, department_ids):
+        """
+        @brief Select flattened KPI records of several departments
+
+        @param department_ids: Iterable of department identifiers
+        @return: DataFrame indexed by department_id
+        """
+        return self.kpi_table[self.kpi_table.index.isin(list(department_ids))]
+
+    def department_person_count(self, department_id):
+        """
+        @brief Count employees of the department
+
+        @param department_id: Department identifier
+        @return: Number of employees
+        """
+        return len(self.index.department_employee_positions(department_id))
+
+    def department_kpi(self, department_id):
+        """
+        @brief Get KPI record of the department
+
+        @param department_id: Department identifier
+        @return: KPI dictionary or None if department has no KPI record
+        """
+        return self.kpi_by_department.get(department_id)
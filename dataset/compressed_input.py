@@ -0,0 +1,221 @@
+"""
+@brief Transparent reading of compressed company exports
+Detects gzip, xz, bz2, zstd and zip inputs by magic bytes and decompresses them on a background thread
+while the caller parses, so exports never have to be unpacked to disk
+"""
+
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import queue
+import threading
+import zipfile
+from config.messages import ErrorMessages
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CompressionFormats:
+    """
+    @brief Input formats recognized by magic bytes
+    """
+    GZIP = 'gzip'
+    XZ = 'xz'
+    BZIP2 = 'bz2'
+    ZSTD = 'zstd'
+    ZIP = 'zip'
+    RAR = 'rar'
+
+
+# Leading bytes of each format, RAR is recognized only to report it as unsupported
+COMPRESSION_MAGIC = [
+    (b'\x1f\x8b', CompressionFormats.GZIP),
+    (b'\xfd7zXZ\x00', CompressionFormats.XZ),
+    (b'BZh', CompressionFormats.BZIP2),
+    (b'\x28\xb5\x2f\xfd', CompressionFormats.ZSTD),
+    (b'PK\x03\x04', CompressionFormats.ZIP),
+    (b'Rar!\x1a\x07', CompressionFormats.RAR),
+]
+MAGIC_LENGTH = max(len(magic) for magic, _ in COMPRESSION_MAGIC)
+
+# Decompressed bytes per chunk and chunks buffered ahead of the parser
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+DECOMPRESS_QUEUE_CHUNKS = 8
+
+
+def detect_compression(file_path):
+    """
+    @brief Detect compression of a file by its leading bytes
+
+    @param file_path: Input file path
+    @return: CompressionFormats value or None for uncompressed files
+    """
+    with open(file_path, 'rb') as input_file:
+        leading_bytes = input_file.read(MAGIC_LENGTH)
+    for magic, compression in COMPRESSION_MAGIC:
+        if leading_bytes.startswith(magic):
+            return compression
+    return None
+
+
+@contextlib.contextmanager
+def _zip_member(file_path):
+    """
+    @brief Open the JSON member of a zip archive, the only member if it holds one file
+
+    @param file_path: Archive path
+    @return: Context manager of binary member stream
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        members = [member for member in archive.infolist() if not member.is_dir()]
+        json_members = [member for member in members if member.filename.endswith('.json')] or members
+        if len(json_members) != 1:
+            raise ValueError(ErrorMessages.ZIP_MEMBER_AMBIGUOUS.format(
+                file_path, [member.filename for member in json_members]
+            ))
+        with archive.open(json_members[0]) as member_file:
+            yield member_file
+
+
+def _zstd_stream(file_path):
+    """
+    @brief Open zstd stream, zstandard package is optional
+
+    @param file_path: Compressed file path
+    @return: Binary stream reader closing the file with itself
+    """
+    if zstandard is None:
+        raise ImportError(ErrorMessages.COMPRESSION_UNAVAILABLE.format(CompressionFormats.ZSTD, 'zstandard'))
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+
+
+# Compression format: callable opening a binary decompressed stream usable as context manager
+DECOMPRESSED_OPENERS = {
+    CompressionFormats.GZIP: gzip.open,
+    CompressionFormats.XZ: lzma.open,
+    CompressionFormats.BZIP2: bz2.open,
+    CompressionFormats.ZSTD: _zstd_stream,
+    CompressionFormats.ZIP: _zip_member,
+}
+
+
+class BackgroundDecompressor(io.RawIOBase):
+    """
+    @brief Raw binary stream filled by a decompression thread
+    The thread reads ahead at most DECOMPRESS_QUEUE_CHUNKS chunks. zlib, lzma, bz2 and zstd release the GIL,
+    so decompression of the next chunks runs while the caller decodes and parses the previous ones
+    """
+
+    def __init__(self, open_source, chunk_size=DECOMPRESS_CHUNK_SIZE, queue_chunks=DECOMPRESS_QUEUE_CHUNKS):
+        """
+        @brief Start decompression thread
+
+        @param open_source: Callable returning a context manager of the decompressed binary stream
+        @param chunk_size: Bytes read from the decompressed stream at once
+        @param queue_chunks: Chunks buffered ahead of the reader
+        """
+        super().__init__()
+        self.chunk_size = chunk_size
+        self._chunks = queue.Queue(maxsize=queue_chunks)
+        self._pending = memoryview(b'')
+        self._finished = False
+        self._error = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._decompress, args=(open_source,), name='decompressor',
+                                        daemon=True)
+        self._thread.start()
+
+    def _decompress(self, open_source):
+        """
+        @brief Thread body: move decompressed chunks into the queue until end of stream or close
+
+        @param open_source: Callable returning a context manager of the decompressed binary stream
+        """
+        try:
+            with open_source() as source:
+                while not self._stopped.is_set():
+                    chunk = source.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    self._put(chunk)
+        except Exception as decompression_error:
+            self._error = decompression_error
+        finally:
+            self._put(None)
+
+    def _put(self, chunk):
+        """
+        @brief Queue a chunk, gives up when the reader was closed
+
+        @param chunk: Bytes or None as end marker
+        """
+        while not self._stopped.is_set():
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        """
+        @brief Stream supports reading
+
+        @return: True
+        """
+        return True
+
+    def readinto(self, buffer):
+        """
+        @brief Copy next decompressed bytes into the buffer
+
+        @param buffer: Writable buffer
+        @return: Number of bytes copied, 0 at end of stream
+        """
+        while not self._pending:
+            if self._finished:
+                return 0
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._finished = True
+                if self._error is not None:
+                    raise self._error
+                return 0
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        """
+        @brief Stop decompression thread and release the source
+        """
+        if not self.closed:
+            self._stopped.set()
+            self._thread.join()
+        super().close()
+
+
+def open_input(file_path, encoding='utf-8'):
+    """
+    @brief Open company export for reading text, compressed files are decompressed on the fly
+
+    @param file_path: Plain JSON file or gzip, xz, bz2, zstd or zip archive of it
+    @param encoding: Text encoding of the JSON document
+    @return: Text file object
+    """
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'r', encoding=encoding)
+    if compression not in DECOMPRESSED_OPENERS:
+        raise ValueError(ErrorMessages.COMPRESSION_UNSUPPORTED.format(compression, file_path))
+
+    open_decompressed = DECOMPRESSED_OPENERS[compression]
+    raw_stream = BackgroundDecompressor(lambda: open_decompressed(file_path))
+    return io.TextIOWrapper(io.BufferedReader(raw_stream, DECOMPRESS_CHUNK_SIZE), encoding=encoding)
@@ -0,0 +1,266 @@
+"""
+@brief Employee metrics correlation engine
+Computes correlation matrices of employee metrics for every department in one grouped pass.
+Employees are consumed in chunks and merged into per-department running means and co-moments,
+so employee sets of any size are never materialized as one table
+"""
+
+import numpy as np
+import pandas as pd
+from dataset.streaming_loader import stream_company_file
+
+
+# Correlated employee metrics, tenure_years is derived from hire_date
+EMPLOYEE_METRICS = ['salary', 'performance_score', 'experience_years', 'certifications', 'tenure_years']
+DAYS_PER_YEAR = 365.25
+# Employees merged into accumulators at once
+CORRELATION_CHUNK_ROWS = 65536
+
+
+def employee_metric_values(employees, reference_date):
+    """
+    @brief Matrix of employee metrics
+
+    @param employees: DataFrame with department_id, hire_date and numeric metric columns
+    @param reference_date: Date tenure is measured to
+    @return: Float array employees x EMPLOYEE_METRICS
+    """
+    values = np.empty((len(employees), len(EMPLOYEE_METRICS)), dtype=np.float64)
+    for position, metric in enumerate(EMPLOYEE_METRICS[:-1]):
+        values[:, position] = pd.to_numeric(employees[metric], errors='coerce').to_numpy(dtype=np.float64,
+                                                                                        na_value=np.nan)
+    tenure = reference_date - pd.to_datetime(employees['hire_date'], errors='coerce')
+    values[:, -1] = tenure.dt.days.to_numpy(dtype=np.float64, na_value=np.nan) / DAYS_PER_YEAR
+    return values
+
+
+class CorrelationEngine:
+    """
+    @brief Running per-department correlation of employee metrics
+    Every chunk is centered on its own group means before products are summed, chunk statistics are merged
+    with the pairwise update of Chan, Golub and LeVeque. Sums of squares therefore never cancel out
+    the way raw sums of products do for large salaries.
+    Missing values are deleted pairwise like DataFrame.corr: every metric pair keeps its own count, means
+    and sums of squares over employees having both metrics
+    """
+
+    def __init__(self, reference_date=None):
+        """
+        @brief Initialize empty accumulators
+
+        @param reference_date: Date tenure is measured to, today if not specified
+        """
+        self.reference_date = pd.Timestamp(reference_date) if reference_date is not None \
+            else pd.Timestamp.today().normalize()
+        self.department_ids = []
+        self._department_positions = {}
+        metric_count = len(EMPLOYEE_METRICS)
+        self.person_counts = np.zeros(0, dtype=np.int64)
+        # [department, first, second] statistics over employees having both metrics,
+        # means and squares are those of the first metric
+        self.counts = np.zeros((0, metric_count, metric_count), dtype=np.int64)
+        self.means = np.zeros((0, metric_count, metric_count))
+        self.squares = np.zeros((0, metric_count, metric_count))
+        self.comoments = np.zeros((0, metric_count, metric_count))
+        self._pending_employees = []
+
+    def update_employees(self, employees, chunk_rows=CORRELATION_CHUNK_ROWS):
+        """
+        @brief Add employees table rows
+
+        @param employees: Employees DataFrame
+        @param chunk_rows: Rows converted and merged at once
+        """
+        for position in range(0, len(employees), chunk_rows):
+            chunk = employees.iloc[position:position + chunk_rows]
+            self.update(chunk['department_id'].to_numpy(), employee_metric_values(chunk, self.reference_date))
+
+    def update(self, department_ids, values):
+        """
+        @brief Merge a chunk of employees into department accumulators
+        Employee with a missing metric is left out only of the pairs of that metric,
+        employee without department is left out entirely
+
+        @param department_ids: Array with department of every employee
+        @param values: Float array employees x EMPLOYEE_METRICS
+        """
+        department_ids = np.asarray(department_ids)
+        known_department = ~pd.isna(department_ids)
+        if not known_department.all():
+            department_ids = department_ids[known_department]
+            values = values[known_department]
+            # Missing identifiers turned the column into floats
+            if department_ids.dtype.kind == 'f':
+                department_ids = department_ids.astype(np.int64)
+        chunk_department_ids, codes = np.unique(department_ids, return_inverse=True)
+        group_count = len(chunk_department_ids)
+        positions = self._positions(chunk_department_ids)
+        self.person_counts[positions] += np.bincount(codes, minlength=group_count)
+
+        present = ~np.isnan(values)
+        for first in range(values.shape[1]):
+            for second in range(first, values.shape[1]):
+                pair_rows = present[:, first] & present[:, second]
+                self._update_pair(positions, codes[pair_rows], group_count, values[pair_rows, first],
+                                  values[pair_rows, second], first, second)
+
+    def _update_pair(self, positions, codes, group_count, first_values, second_values, first, second):
+        """
+        @brief Merge chunk statistics of one metric pair
+
+        @param positions: Accumulator rows of chunk departments
+        @param codes: Chunk department code of every employee having both metrics
+        @param group_count: Number of chunk departments
+        @param first_values: Values of the first metric
+        @param second_values: Values of the second metric
+        @param first: Position of the first metric
+        @param second: Position of the second metric, not lower than first
+        """
+        chunk_counts = np.bincount(codes, minlength=group_count)
+        present = chunk_counts > 0
+        if not present.any():
+            return
+
+        divisor = np.maximum(chunk_counts, 1)
+        first_means = np.bincount(codes, weights=first_values, minlength=group_count) / divisor
+        second_means = np.bincount(codes, weights=second_values, minlength=group_count) / divisor
+        first_centered = first_values - first_means[codes]
+        second_centered = second_values - second_means[codes]
+        chunk_comoments = np.bincount(codes, weights=first_centered * second_centered, minlength=group_count)
+        first_squares = np.bincount(codes, weights=first_centered * first_centered, minlength=group_count)
+        second_squares = np.bincount(codes, weights=second_centered * second_centered, minlength=group_count)
+
+        rows = positions[present]
+        chunk_counts = chunk_counts[present]
+        counts = self.counts[rows, first, second]
+        total_counts = counts + chunk_counts
+        weights = counts * chunk_counts / total_counts
+        shares = chunk_counts / total_counts
+        first_delta = first_means[present] - self.means[rows, first, second]
+        second_delta = second_means[present] - self.means[rows, second, first]
+
+        self.comoments[rows, first, second] += chunk_comoments[present] + weights * first_delta * second_delta
+        self.comoments[rows, second, first] = self.comoments[rows, first, second]
+        self.squares[rows, first, second] += first_squares[present] + weights * first_delta * first_delta
+        self.means[rows, first, second] += first_delta * shares
+        if first != second:
+            self.squares[rows, second, first] += second_squares[present] + weights * second_delta * second_delta
+            self.means[rows, second, first] += second_delta * shares
+        self.counts[rows, first, second] = self.counts[rows, second, first] = total_counts
+
+    def _positions(self, department_ids):
+        """
+        @brief Accumulator rows of departments, rows of new departments are appended
+
+        @param department_ids: Array of unique department identifiers
+        @return: Integer array of accumulator rows
+        """
+        new_department_ids = [department_id for department_id in department_ids.tolist()
+                              if department_id not in self._department_positions]
+        if new_department_ids:
+            for department_id in new_department_ids:
+                self._department_positions[department_id] = len(self.department_ids)
+                self.department_ids.append(department_id)
+            new_count = len(new_department_ids)
+            metric_count = len(EMPLOYEE_METRICS)
+            pair_shape = (new_count, metric_count, metric_count)
+            self.person_counts = np.concatenate([self.person_counts, np.zeros(new_count, dtype=np.int64)])
+            self.counts = np.concatenate([self.counts, np.zeros(pair_shape, dtype=np.int64)])
+            self.means = np.concatenate([self.means, np.zeros(pair_shape)])
+            self.squares = np.concatenate([self.squares, np.zeros(pair_shape)])
+            self.comoments = np.concatenate([self.comoments, np.zeros(pair_shape)])
+        return np.array([self._department_positions[department_id] for department_id in department_ids.tolist()],
+                        dtype=np.int64)
+
+    def add_employee(self, employee):
+        """
+        @brief Add one record of employees section, records are merged in chunks
+        Handler for stream_company_file
+
+        @param employee: Employee dictionary
+        """
+        work_info = employee['work_info']
+        self._pending_employees.append((
+            work_info['department_id'], work_info['salary'], work_info['performance_score'],
+            work_info.get('experience_years'), employee.get('additional_info', {}).get('certifications', 0),
+            work_info.get('hire_date'),
+        ))
+        if len(self._pending_employees) >= CORRELATION_CHUNK_ROWS:
+            self.flush_employees()
+
+    def flush_employees(self):
+        """
+        @brief Merge employee records collected by add_employee
+        """
+        if self._pending_employees:
+            employees = pd.DataFrame(self._pending_employees, columns=['department_id'] + EMPLOYEE_METRICS[:-1]
+                                     + ['hire_date'])
+            self._pending_employees = []
+            self.update_employees(employees)
+
+    def correlation_matrices(self):
+        """
+        @brief Correlation matrices of all departments
+        Coefficients of metrics without variation in a department are NaN
+
+        @return: DataFrame indexed by department_id and metric with one column per metric
+        """
+        # Both deviations of a pair are taken over the employees having both metrics
+        deviations = np.sqrt(np.where(self.squares > 0, self.squares, np.nan))
+        with np.errstate(invalid='ignore'):
+            correlations = self.comoments / (deviations * deviations.transpose(0, 2, 1))
+        correlations = np.clip(correlations, -1.0, 1.0)
+
+        metric_count = len(EMPLOYEE_METRICS)
+        index = pd.MultiIndex.from_product([self.department_ids, EMPLOYEE_METRICS], names=['department_id', 'metric'])
+        matrices = pd.DataFrame(correlations.reshape(-1, metric_count), index=index, columns=EMPLOYEE_METRICS)
+        return matrices.sort_index(level='department_id', sort_remaining=False)
+
+    def department_summary(self, total_profit=None):
+        """
+        @brief Employee count and revenue per employee of all departments
+
+        @param total_profit: Series of department profit indexed by department_id
+        @return: DataFrame indexed by department_id with person_count and revenue_per_employee
+        """
+        department_index = pd.Index(self.department_ids, name='department_id')
+        person_count = pd.Series(self.person_counts, index=department_index).sort_index()
+        if total_profit is None:
+            total_profit = pd.Series(np.nan, index=person_count.index)
+        return pd.DataFrame({
+            'person_count': person_count,
+            'revenue_per_employee': total_profit.reindex(person_count.index) / person_count.where(person_count > 0),
+        })
+
+    def compute(self, total_profit=None):
+        """
+        @brief Correlation matrices and revenue per employee of all departments
+
+        @param total_profit: Series of department profit indexed by department_id
+        @return: Tuple of correlation_matrices() and department_summary() results
+        """
+        return self.correlation_matrices(), self.department_summary(total_profit)
+
+    @classmethod
+    def from_file(cls, json_file_path, logger, reference_date=None):
+        """
+        @brief Stream employees and KPI records of a company JSON file into a new engine
+        Only the accumulators and department profits are kept in memory
+
+        @param json_file_path: Path to JSON data file
+        @param logger: Logger instance
+        @param reference_date: Date tenure is measured to, today if not specified
+        @return: Tuple of engine and Series of stored department profit indexed by department_id
+        """
+        correlation_engine = cls(reference_date)
+        department_profits = {}
+
+        def add_kpi(kpi_record):
+            department_profits[kpi_record['department_id']] = kpi_record['project_metrics']['total_profit']
+
+        stream_company_file(json_file_path, {'employees': correlation_engine.add_employee, 'kpi_metrics': add_kpi},
+                            logger)
+        correlation_engine.flush_employees()
+        total_profit = pd.Series(department_profits, dtype=np.float64)
+        total_profit.index.name = 'department_id'
+        return correlation_engine, total_profit
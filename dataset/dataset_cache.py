@@ -0,0 +1,207 @@
+"""
+@brief On-disk cache of flattened company tables
+Stores dataset tables in binary columnar files next to the source JSON file
+and invalidates them when the source file changes
+"""
+
+import hashlib
+import json
+import os
+import uuid
+import pandas as pd
+from config.messages import LogMessages
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+CACHE_VERSION = 2
+CACHE_DIRECTORY_SUFFIX = '.cache'
+MANIFEST_FILE_NAME = 'manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+# Table file name: table name, unique write identifier and cache format
+TABLE_FILE_NAME = '{}.{}.{}'
+
+
+def write_table(table, file_path):
+    """
+    @brief Write one table in cache format
+
+    @param table: DataFrame to write
+    @param file_path: Target file path
+    """
+    if CACHE_FORMAT == 'feather':
+        table.reset_index(drop=True).to_feather(file_path)
+    else:
+        table.to_pickle(file_path)
+
+
+def table_file_name(table_name):
+    """
+    @brief New file name of a table
+    Every write gets its own name, so files of a valid manifest are never overwritten in place
+
+    @param table_name: Table name
+    @return: File name of TABLE_FILE_NAME format
+    """
+    return TABLE_FILE_NAME.format(table_name, uuid.uuid4().hex, CACHE_FORMAT)
+
+
+def remove_table_files(directory, file_names):
+    """
+    @brief Remove table files no longer listed by a manifest
+    Reader still holding the replaced manifest fails to open them and treats the store as a miss
+
+    @param directory: Directory of table files
+    @param file_names: Table file names
+    """
+    for file_name in file_names:
+        try:
+            os.remove(os.path.join(directory, os.path.basename(file_name)))
+        except OSError:
+            pass
+
+
+def read_table(file_path):
+    """
+    @brief Read one table in cache format
+
+    @param file_path: Source file path
+    @return: DataFrame
+    """
+    if CACHE_FORMAT == 'feather':
+        return pd.read_feather(file_path)
+    return pd.read_pickle(file_path)
+
+
+class DatasetCache:
+    """
+    @brief Cache of dataset tables keyed by source file size, mtime and content hash
+    """
+
+    def __init__(self, json_file_path, logger):
+        """
+        @brief Initialize cache for the source file
+
+        @param json_file_path: Path to source JSON data file
+        @param logger: Logger instance
+        """
+        self.json_file_path = json_file_path
+        self.logger = logger
+        self.cache_directory = json_file_path + CACHE_DIRECTORY_SUFFIX
+        self.manifest_path = os.path.join(self.cache_directory, MANIFEST_FILE_NAME)
+
+    def load(self):
+        """
+        @brief Load cached tables if they match the current source file
+
+        @return: Dictionary of table name to DataFrame or None on cache miss
+        """
+        manifest = self._read_manifest()
+        if manifest is None or not self._is_valid(manifest):
+            self.logger.info(LogMessages.CACHE_MISS.format(self.json_file_path))
+            return None
+
+        try:
+            tables = {
+                table_name: read_table(os.path.join(self.cache_directory, file_name))
+                for table_name, file_name in manifest['tables'].items()
+            }
+        except Exception as reading_error:
+            self.logger.warning(LogMessages.CACHE_READ_ERROR.format(self.cache_directory, str(reading_error)))
+            return None
+
+        self.logger.info(LogMessages.CACHE_HIT.format(self.cache_directory))
+        return tables
+
+    def store(self, tables):
+        """
+        @brief Write tables to cache, failures are logged and never break analysis
+        Tables are written under new file names, files of the replaced manifest are removed after it
+
+        @param tables: Dictionary of table name to DataFrame
+        """
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            previous_manifest = self._read_manifest() or {}
+            source_stat = os.stat(self.json_file_path)
+            manifest = {
+                'version': CACHE_VERSION,
+                'format': CACHE_FORMAT,
+                'size': source_stat.st_size,
+                'mtime_ns': source_stat.st_mtime_ns,
+                'hash': self._hash_source(),
+                'tables': {},
+            }
+            for table_name, table in tables.items():
+                file_name = table_file_name(table_name)
+                write_table(table, os.path.join(self.cache_directory, file_name))
+                manifest['tables'][table_name] = file_name
+
+            # Manifest is replaced last so readers never see partially written tables as valid
+            self._write_manifest(manifest)
+            remove_table_files(self.cache_directory, previous_manifest.get('tables', {}).values())
+            self.logger.info(LogMessages.CACHE_STORED.format(self.cache_directory))
+        except Exception as writing_error:
+            self.logger.warning(LogMessages.CACHE_WRITE_ERROR.format(self.cache_directory, str(writing_error)))
+
+    def _read_manifest(self):
+        """
+        @brief Read cache manifest
+
+        @return: Manifest dictionary or None if it is missing or unreadable
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest):
+        """
+        @brief Atomically replace cache manifest
+
+        @param manifest: Manifest dictionary
+        """
+        temporary_manifest_path = self.manifest_path + '.tmp'
+        with open(temporary_manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary_manifest_path, self.manifest_path)
+
+    def _is_valid(self, manifest):
+        """
+        @brief Check that manifest describes the current source file
+        Size and mtime are compared first, content hash is computed only when mtime changed
+
+        @param manifest: Manifest dictionary
+        @return: True if cached tables can be used
+        """
+        if manifest.get('version') != CACHE_VERSION or manifest.get('format') != CACHE_FORMAT:
+            return False
+
+        source_stat = os.stat(self.json_file_path)
+        if source_stat.st_size != manifest.get('size'):
+            return False
+        if source_stat.st_mtime_ns == manifest.get('mtime_ns'):
+            return True
+        if self._hash_source() != manifest.get('hash'):
+            return False
+
+        # Content is unchanged, remember new mtime to skip hashing on next run
+        manifest['mtime_ns'] = source_stat.st_mtime_ns
+        self._write_manifest(manifest)
+        return True
+
+    def _hash_source(self):
+        """
+        @brief Calculate content hash of the source file
+
+        @return: Hex digest of the file content
+        """
+        source_hash = hashlib.blake2b(digest_size=20)
+        with open(self.json_file_path, 'rb') as source_file:
+            for chunk in iter(lambda: source_file.read(HASH_CHUNK_SIZE), b''):
+                source_hash.update(chunk)
+        return source_hash.hexdigest()
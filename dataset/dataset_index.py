@@ -0,0 +1,122 @@
+"""
+@brief Lookup indexes over company dataset tables
+Built once at load time so per-department lookups do not scan whole tables
+"""
+
+import numpy as np
+import pandas as pd
+
+
+EMPTY_POSITIONS = np.array([], dtype=np.int64)
+
+
+class DatasetIndex:
+    """
+    @brief Department-keyed indexes for KPI records, employees and projects
+    Positions refer to rows of the corresponding dataset tables
+    """
+
+    def __init__(self, projects, project_departments, department_projects_table, employees, kpi_metrics):
+        """
+        @brief Build all indexes from flattened tables
+
+        @param projects: Projects DataFrame, one row per project
+        @param project_departments: Project participation DataFrame
+        @param department_projects_table: Long project x department DataFrame
+        @param employees: Employees DataFrame
+        @param kpi_metrics: Flattened KPI DataFrame
+        """
+        self.kpi_by_department = self.nest_kpi_records(kpi_metrics)
+
+        self.employee_positions = {
+            department_id: positions.astype(np.int64)
+            for department_id, positions in employees.groupby('department_id', sort=False).indices.items()
+        }
+
+        project_positions = pd.Index(projects['project_id']).get_indexer(project_departments['project_id'])
+        participation = pd.DataFrame({
+            'department_id': project_departments['department_id'].to_numpy(),
+            'project_position': project_positions,
+        })
+        participation = participation[participation['project_position'] >= 0]
+
+        # Department -> project rows in source order, each project once
+        self.project_positions = {
+            department_id: np.unique(participation['project_position'].to_numpy()[rows])
+            for department_id, rows in participation.groupby('department_id', sort=False).indices.items()
+        }
+
+        # Department -> rows of long project x department table
+        participation_groups = department_projects_table.groupby('department_id', sort=False)
+        self.participation_positions = {
+            department_id: positions.astype(np.int64)
+            for department_id, positions in participation_groups.indices.items()
+        }
+
+        # Project -> participating departments
+        project_groups = participation.groupby('project_position', sort=False)['department_id']
+        self.departments_by_project = {
+            projects['project_id'].iat[project_position]: list(dict.fromkeys(department_ids))
+            for project_position, department_ids in project_groups.agg(list).items()
+        }
+
+    @staticmethod
+    def nest_kpi_records(kpi_metrics):
+        """
+        @brief Restore nested KPI records from flattened table keyed by department
+
+        @param kpi_metrics: Flattened KPI DataFrame with dotted column names
+        @return: Dictionary of department_id to nested KPI dictionary
+        """
+        kpi_by_department = {}
+        for kpi_record in kpi_metrics.to_dict(orient='records'):
+            nested_record = {}
+            for column, value in kpi_record.items():
+                *sections, key = column.split('.')
+                target = nested_record
+                for section in sections:
+                    target = target.setdefault(section, {})
+                target[key] = value
+            kpi_by_department[nested_record['department_id']] = nested_record
+        return kpi_by_department
+
+    def department_employee_positions(self, department_id):
+        """
+        @brief Employee row positions of the department
+
+        @param department_id: Department identifier
+        @return: Sorted array of employees table positions
+        """
+        return self.employee_positions.get(department_id, EMPTY_POSITIONS)
+
+    def department_project_positions(self, department_id):
+        """
+        @brief Project row positions with participation of the department
+
+        @param department_id: Department identifier
+        @return: Sorted array of projects table positions
+        """
+        return self.project_positions.get(department_id, EMPTY_POSITIONS)
+
+    def positions_for(self, positions_by_department, department_ids):
+        """
+        @brief Collect row positions of several departments
+
+        @param positions_by_department: One of department -> positions indexes
+        @param department_ids: Iterable of department identifiers
+        @return: Sorted array of table positions
+        """
+        positions = [positions_by_department[department_id] for department_id in department_ids
+                     if department_id in positions_by_department]
+        if not positions:
+            return EMPTY_POSITIONS
+        return np.sort(np.concatenate(positions))
+
+    def project_department_ids(self, project_id):
+        """
+        @brief Departments participating in the project
+
+        @param project_id: Project identifier
+        @return: List of department identifiers
+        """
+        return self.departments_by_project.get(project_id, [])
@@ -0,0 +1,90 @@
+"""
+@brief Typed columnar equipment table
+Encodes flattened equipment records into NumPy columns once, so department equipment metrics
+become grouped reductions over all records in one pass
+"""
+
+import numpy as np
+import pandas as pd
+from config.helper_const import EquipmentStatus
+
+
+class EquipmentTable:
+    """
+    @brief Equipment columns with integer department and status codes
+    """
+
+    def __init__(self, equipment):
+        """
+        @brief Encode equipment records
+
+        @param equipment: Flattened equipment DataFrame of CompanyDataset
+        """
+        self.department_codes, self.department_ids = pd.factorize(equipment['department_id'], sort=True)
+        self.status_codes, self.statuses = pd.factorize(equipment['status'], sort=True)
+        self.efficiency = pd.to_numeric(equipment['efficiency_percentage'], errors='coerce').to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        maintenance_cost = pd.to_numeric(equipment['maintenance_cost_per_month'], errors='coerce')
+        self.maintenance_cost = maintenance_cost.to_numpy(dtype=np.float64, na_value=np.nan)
+        # Whole-rouble costs keep integer sums
+        self.integer_costs = pd.api.types.is_integer_dtype(maintenance_cost.dtype)
+        self._department_metrics = None
+
+    def department_metrics(self):
+        """
+        @brief Equipment metrics of every department owning equipment, calculated on first call
+        Averages and ratios are rounded like equipment_metrics of the KPI export
+
+        @return: DataFrame indexed by department_id with equipment_count, average_efficiency,
+                 total_maintenance_cost, operational_ratio and equipment_status_<status> count columns
+        """
+        if self._department_metrics is None:
+            self._department_metrics = self._compute_department_metrics()
+        return self._department_metrics
+
+    def _compute_department_metrics(self):
+        """
+        @brief Group all equipment records by department
+
+        @return: DataFrame indexed by department_id
+        """
+        department_count = len(self.department_ids)
+        valid_department = self.department_codes >= 0
+        department_codes = self.department_codes[valid_department]
+        status_codes = self.status_codes[valid_department]
+        efficiency = self.efficiency[valid_department]
+        maintenance_cost = self.maintenance_cost[valid_department]
+
+        equipment_count = np.bincount(department_codes, minlength=department_count)
+        rated = ~np.isnan(efficiency)
+        efficiency_sum = np.bincount(department_codes[rated], weights=efficiency[rated], minlength=department_count)
+        efficiency_count = np.bincount(department_codes[rated], minlength=department_count)
+        costed = ~np.isnan(maintenance_cost)
+        total_maintenance_cost = np.bincount(department_codes[costed], weights=maintenance_cost[costed],
+                                             minlength=department_count)
+
+        # Department x status counts in one bincount over combined codes
+        status_count = len(self.statuses)
+        known_status = status_codes >= 0
+        status_counts = np.bincount(department_codes[known_status] * status_count + status_codes[known_status],
+                                    minlength=department_count * status_count).reshape(department_count, status_count)
+        status_positions = {status: position for position, status in enumerate(self.statuses)}
+        operational_count = status_counts[:, status_positions[EquipmentStatus.OPERATIONAL]] \
+            if EquipmentStatus.OPERATIONAL in status_positions else np.zeros(department_count, dtype=np.int64)
+
+        if self.integer_costs:
+            total_maintenance_cost = np.rint(total_maintenance_cost).astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average_efficiency = efficiency_sum / efficiency_count
+            operational_ratio = operational_count / equipment_count * 100
+
+        department_metrics = pd.DataFrame({
+            'equipment_count': equipment_count,
+            'average_efficiency': np.round(average_efficiency, 1),
+            'total_maintenance_cost': total_maintenance_cost,
+            'operational_ratio': np.round(operational_ratio, 1),
+        }, index=pd.Index(self.department_ids, name='department_id'))
+        for position, status in enumerate(self.statuses):
+            department_metrics['equipment_status_' + status] = status_counts[:, position]
+        return department_metrics
@@ -0,0 +1,108 @@
+"""
+@brief Derived KPI engine
+Recomputes department KPI metrics from raw project and employee records
+"""
+
+import numpy as np
+import pandas as pd
+from config.helper_const import ProjectStatus
+
+
+# Derived metrics use the same dotted names as flattened kpi_metrics columns
+DERIVED_KPI_COLUMNS = [
+    'project_metrics.active_projects',
+    'project_metrics.completed_projects',
+    'project_metrics.total_profit',
+    'project_metrics.average_roi',
+    'employee_metrics.employee_count',
+    'financial_metrics.budget_utilization',
+    'financial_metrics.revenue_per_employee',
+]
+
+RELATIVE_TOLERANCE = 0.001
+ABSOLUTE_TOLERANCE = 0.01
+
+
+class KpiEngine:
+    """
+    @brief Calculates department KPIs for all departments in one vectorized pass
+    """
+
+    def __init__(self, departments, department_projects_table, employees):
+        """
+        @brief Initialize engine over dataset tables
+
+        @param departments: Departments DataFrame with department_id and budget
+        @param department_projects_table: Long project x department DataFrame
+        @param employees: Employees DataFrame
+        """
+        self.departments = departments
+        self.department_projects_table = department_projects_table
+        self.employees = employees
+
+    def compute(self):
+        """
+        @brief Derive KPIs of every department
+        Profit is the sum over participating projects, ROI is the mean project ROI,
+        budget utilization is allocated project budget relative to department budget
+
+        @return: DataFrame indexed by department_id with DERIVED_KPI_COLUMNS
+        """
+        projects = self.department_projects_table
+        status = projects['status']
+        project_groups = pd.DataFrame({
+            'active_projects': (status == ProjectStatus.ACTIVE).astype(np.int64),
+            'completed_projects': (status == ProjectStatus.COMPLETED).astype(np.int64),
+            'total_profit': projects['profit'],
+            'budget_allocation': projects['budget_allocation'],
+        }).groupby(projects['department_id']).sum()
+        average_roi = projects.groupby('department_id')['roi_percentage'].mean()
+
+        employee_count = self.employees.groupby('department_id').size()
+        department_budget = self.departments.set_index('department_id')['budget']
+
+        department_index = project_groups.index.union(employee_count.index).union(department_budget.index)
+        project_groups = project_groups.reindex(department_index, fill_value=0)
+        employee_count = employee_count.reindex(department_index, fill_value=0)
+        department_budget = department_budget.reindex(department_index)
+
+        derived_kpi = pd.DataFrame({
+            'project_metrics.active_projects': project_groups['active_projects'],
+            'project_metrics.completed_projects': project_groups['completed_projects'],
+            'project_metrics.total_profit': project_groups['total_profit'],
+            'project_metrics.average_roi': average_roi.reindex(department_index).fillna(0).round(2),
+            'employee_metrics.employee_count': employee_count,
+            'financial_metrics.budget_utilization':
+                (project_groups['budget_allocation'] / department_budget.where(department_budget > 0) * 100).round(1),
+            'financial_metrics.revenue_per_employee':
+                (project_groups['total_profit'] / employee_count.where(employee_count > 0)).round(0),
+        }, index=department_index)
+        derived_kpi.index.name = 'department_id'
+        return derived_kpi
+
+    @staticmethod
+    def discrepancies(stored_kpi, derived_kpi, relative_tolerance=RELATIVE_TOLERANCE,
+                      absolute_tolerance=ABSOLUTE_TOLERANCE):
+        """
+        @brief Compare stored KPI export with derived KPIs
+
+        @param stored_kpi: Flattened kpi_metrics DataFrame indexed by department_id
+        @param derived_kpi: Result of compute()
+        @param relative_tolerance: Relative difference accepted as equal
+        @param absolute_tolerance: Absolute difference accepted as equal
+        @return: DataFrame with department_id, metric, stored, derived, difference and matches columns
+        """
+        metrics = [column for column in DERIVED_KPI_COLUMNS if column in stored_kpi.columns]
+        department_index = stored_kpi.index.union(derived_kpi.index)
+
+        stored = stored_kpi[metrics].reindex(department_index).astype(float)
+        derived = derived_kpi[metrics].reindex(department_index).astype(float)
+        stored.index.name = derived.index.name = 'department_id'
+        comparison = stored.reset_index().melt(id_vars='department_id', var_name='metric', value_name='stored')
+        comparison['derived'] = derived.reset_index().melt(
+            id_vars='department_id', var_name='metric', value_name='derived'
+        )['derived']
+        comparison['difference'] = comparison['derived'] - comparison['stored']
+        comparison['matches'] = np.isclose(comparison['derived'], comparison['stored'],
+                                           rtol=relative_tolerance, atol=absolute_tolerance)
+        return comparison
@@ -0,0 +1,120 @@
+"""
+@brief Employee x language matrix
+Encodes language_skills lists once so language queries become NumPy reductions
+"""
+
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+
+class LanguageMatrix:
+    """
+    @brief Boolean employee x language matrix aligned with employees table rows
+    """
+
+    def __init__(self, employees):
+        """
+        @brief Encode language skills of all employees
+
+        @param employees: Employees DataFrame with department_id and language_skills columns
+        """
+        language_skills = employees['language_skills']
+        if isinstance(language_skills.dtype, pd.ArrowDtype):
+            lengths, flat_languages = self._arrow_languages(language_skills)
+        else:
+            language_lists = language_skills.tolist()
+            lengths = np.fromiter((len(languages) for languages in language_lists), dtype=np.int64,
+                                  count=len(language_lists))
+            flat_languages = pd.Series(list(chain.from_iterable(language_lists)), dtype=object)
+        codes, languages = pd.factorize(flat_languages)
+        rows = np.repeat(np.arange(len(language_skills)), lengths)
+
+        self.languages = list(languages)
+        self.language_positions = {language: position for position, language in enumerate(self.languages)}
+        self.matrix = np.zeros((len(language_skills), len(self.languages)), dtype=bool)
+        self.matrix[rows, codes] = True
+
+        # Employees without department get code -1 and are not counted for any department
+        self.department_codes, self.department_ids = pd.factorize(employees['department_id'])
+        if self.department_ids.dtype.kind == 'f':
+            # Missing identifiers turned the column into floats
+            self.department_ids = self.department_ids.astype(np.int64)
+
+    @staticmethod
+    def _arrow_languages(language_skills):
+        """
+        @brief List lengths and flattened items of an Arrow-backed list column, no Python lists are created
+
+        @param language_skills: Series with pandas ArrowDtype of list of strings
+        @return: Tuple of int64 array of list lengths and Series of all languages
+        """
+        import pyarrow.compute as pc
+
+        language_lists = language_skills.array.__arrow_array__()
+        lengths = pc.list_value_length(language_lists).fill_null(0).to_numpy().astype(np.int64)
+        return lengths, pc.list_flatten(language_lists).to_pandas()
+
+    def knows_all(self, languages):
+        """
+        @brief Find employees who know every language of the set
+
+        @param languages: Iterable of language names
+        @return: Boolean array with one value per employee
+        """
+        return self.known(languages).all(axis=1)
+
+    def knows_any(self, languages):
+        """
+        @brief Find employees who know at least one language of the set
+
+        @param languages: Iterable of language names
+        @return: Boolean array with one value per employee
+        """
+        return self.known(languages).any(axis=1)
+
+    def known(self, languages):
+        """
+        @brief Select matrix columns for the languages, unknown languages give all-False columns
+
+        @param languages: Iterable of language names
+        @return: Boolean array employees x languages
+        """
+        languages = list(languages)
+        known_languages = np.zeros((self.matrix.shape[0], len(languages)), dtype=bool)
+        for column, language in enumerate(languages):
+            position = self.language_positions.get(language)
+            if position is not None:
+                known_languages[:, column] = self.matrix[:, position]
+        return known_languages
+
+    def department_counts(self, flags):
+        """
+        @brief Count flagged employees per department, employees without department are skipped
+
+        @param flags: Boolean array employees or employees x columns
+        @return: Array departments or departments x columns ordered as department_ids
+        """
+        department_count = len(self.department_ids)
+        valid_department = self.department_codes >= 0
+        department_codes = self.department_codes[valid_department]
+        flags = flags[valid_department]
+        if flags.ndim == 1:
+            return np.bincount(department_codes, weights=flags, minlength=department_count).astype(np.int64)
+
+        counts = np.zeros((department_count, flags.shape[1]), dtype=np.int64)
+        for column in range(flags.shape[1]):
+            counts[:, column] = np.bincount(department_codes, weights=flags[:, column], minlength=department_count)
+        return counts
+
+    def distribution(self):
+        """
+        @brief Count employees who know each language per department
+
+        @return: DataFrame departments x languages indexed by department_id
+        """
+        return pd.DataFrame(
+            self.department_counts(self.matrix),
+            index=pd.Index(self.department_ids, name='department_id'),
+            columns=self.languages,
+        )
@@ -0,0 +1,126 @@
+"""
+@brief Persisted store of batch analysis results
+Keeps per-department results together with the signature of the snapshot they were computed from,
+so the next snapshot only recomputes departments touched by changes
+"""
+
+import json
+import os
+from dataset.dataset_cache import CACHE_FORMAT, read_table, remove_table_files, table_file_name, write_table
+from config.messages import LogMessages
+
+RESULT_STORE_VERSION = 1
+RESULT_STORE_SUFFIX = '.results'
+MANIFEST_FILE_NAME = 'manifest.json'
+SIGNATURE_PREFIX = 'signature_'
+RESULT_PREFIX = 'result_'
+
+
+class ResultStore:
+    """
+    @brief Directory with snapshot signature and batch results of every analysis stage
+    """
+
+    def __init__(self, store_directory, logger):
+        """
+        @brief Initialize result store
+
+        @param store_directory: Directory holding stored tables and manifest
+        @param logger: Logger instance
+        """
+        self.store_directory = store_directory
+        self.logger = logger
+        self.manifest_path = os.path.join(store_directory, MANIFEST_FILE_NAME)
+
+    def load(self):
+        """
+        @brief Load previous snapshot signature and batch results
+
+        @return: Tuple of signature dictionary and results dictionary, both empty if nothing is stored
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get('version') != RESULT_STORE_VERSION \
+                or manifest.get('format') != CACHE_FORMAT:
+            self.logger.info(LogMessages.RESULT_STORE_EMPTY.format(self.store_directory))
+            return {}, {}
+
+        try:
+            signature = {
+                table_name: self._read(file_name) for table_name, file_name in manifest['signature'].items()
+            }
+            results = {
+                stage_name: self._read(file_name).set_index('department_id')
+                for stage_name, file_name in manifest['results'].items()
+            }
+        except Exception as reading_error:
+            self.logger.warning(LogMessages.RESULT_STORE_READ_ERROR.format(self.store_directory, str(reading_error)))
+            return {}, {}
+
+        self.logger.info(LogMessages.RESULT_STORE_LOADED.format(self.store_directory, len(results)))
+        return signature, results
+
+    def store(self, signature, results):
+        """
+        @brief Replace stored signature and results, failures are logged and never break analysis
+        Tables are written under new file names, files of the replaced manifest are removed after it
+
+        @param signature: Dictionary of signature table name to DataFrame
+        @param results: Dictionary of stage name to batch DataFrame indexed by department_id
+        """
+        try:
+            os.makedirs(self.store_directory, exist_ok=True)
+            previous_manifest = self._read_manifest() or {}
+            manifest = {
+                'version': RESULT_STORE_VERSION,
+                'format': CACHE_FORMAT,
+                'signature': {},
+                'results': {},
+            }
+            for table_name, table in signature.items():
+                manifest['signature'][table_name] = self._write(SIGNATURE_PREFIX + table_name, table)
+            for stage_name, batch_results in results.items():
+                manifest['results'][stage_name] = self._write(RESULT_PREFIX + stage_name, batch_results.reset_index())
+
+            # Manifest is replaced last so readers never see partially written tables as valid
+            temporary_manifest_path = self.manifest_path + '.tmp'
+            with open(temporary_manifest_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file)
+            os.replace(temporary_manifest_path, self.manifest_path)
+            remove_table_files(self.store_directory, list(previous_manifest.get('signature', {}).values())
+                               + list(previous_manifest.get('results', {}).values()))
+            self.logger.info(LogMessages.RESULT_STORE_STORED.format(self.store_directory))
+        except Exception as writing_error:
+            self.logger.warning(LogMessages.RESULT_STORE_WRITE_ERROR.format(self.store_directory, str(writing_error)))
+
+    def _read_manifest(self):
+        """
+        @brief Read store manifest
+
+        @return: Manifest dictionary or None if it is missing or unreadable
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return None
+
+    def _read(self, file_name):
+        """
+        @brief Read one stored table
+
+        @param file_name: File name inside store directory
+        @return: DataFrame
+        """
+        return read_table(os.path.join(self.store_directory, file_name))
+
+    def _write(self, table_name, table):
+        """
+        @brief Write one table into store directory
+
+        @param table_name: Table name used in file name
+        @param table: DataFrame to write
+        @return: Written file name
+        """
+        file_name = table_file_name(table_name)
+        write_table(table, os.path.join(self.store_directory, file_name))
+        return file_name
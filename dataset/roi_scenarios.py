@@ -0,0 +1,98 @@
+"""
+@brief ROI what-if scenario engine
+Evaluates grids of ROI deltas, cost reductions and per-project ROI adjustments for all departments
+with one broadcasted array computation
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Default grid: ROI deltas in percentage points and cost reductions as shares of actual cost
+DEFAULT_ROI_DELTAS = tuple(range(-10, 21))
+DEFAULT_COST_REDUCTIONS = (0.0, 0.05, 0.1, 0.15, 0.2)
+NO_ADJUSTMENT = 'none'
+
+
+class RoiScenarioEngine:
+    """
+    @brief Projected department profit under ROI and cost scenarios
+    Uses the model of ROIUpAnalyzer: profit = actual cost of department projects x (average ROI + delta) / 100.
+    Cost reduction keeps revenue of the projects, so the saved cost is added to profit.
+    The model is linear in project cost, so project rows are reduced to per-department sums once
+    and every scenario costs a few multiplications per department
+    """
+
+    def __init__(self, department_projects_table, kpi_table):
+        """
+        @brief Reduce project rows to department arrays
+
+        @param department_projects_table: Long project x department DataFrame with project_id and actual_cost
+        @param kpi_table: Flattened KPI DataFrame indexed by department_id
+        """
+        self.department_ids = kpi_table.index.to_numpy()
+        self.total_profit = kpi_table['project_metrics.total_profit'].to_numpy(dtype=np.float64)
+        self.average_roi = kpi_table['project_metrics.average_roi'].to_numpy(dtype=np.float64)
+
+        # Project rows of known departments sorted by department, so department sums are contiguous segments
+        row_departments = pd.Index(self.department_ids).get_indexer(department_projects_table['department_id'])
+        known_rows = row_departments >= 0
+        order = np.argsort(row_departments[known_rows], kind='stable')
+        self.row_departments = row_departments[known_rows][order]
+        self.row_project_ids = department_projects_table['project_id'].to_numpy()[known_rows][order]
+        self.row_costs = department_projects_table['actual_cost'].to_numpy(dtype=np.float64)[known_rows][order]
+        self.actual_cost = np.bincount(self.row_departments, weights=self.row_costs,
+                                       minlength=len(self.department_ids))
+
+    def _adjustment_terms(self, project_adjustments):
+        """
+        @brief Cost-weighted ROI adjustment of every department and adjustment scenario
+
+        @param project_adjustments: Dictionary of scenario name to dictionary of project_id to ROI points
+        @return: Float array adjustments x departments
+        """
+        adjustments = np.zeros((len(project_adjustments), len(self.row_costs)))
+        project_ids = pd.Series(self.row_project_ids)
+        for position, project_roi in enumerate(project_adjustments.values()):
+            adjustments[position] = project_ids.map(project_roi).fillna(0).to_numpy(dtype=np.float64)
+
+        terms = np.zeros((len(project_adjustments), len(self.department_ids)))
+        if len(self.row_costs):
+            segment_departments, segment_starts = np.unique(self.row_departments, return_index=True)
+            terms[:, segment_departments] = np.add.reduceat(adjustments * self.row_costs, segment_starts, axis=1)
+        return terms
+
+    def evaluate(self, roi_deltas=DEFAULT_ROI_DELTAS, cost_reductions=DEFAULT_COST_REDUCTIONS,
+                 project_adjustments=None):
+        """
+        @brief Evaluate every combination of scenario parameters for every department
+
+        @param roi_deltas: ROI changes in percentage points applied to department average ROI
+        @param cost_reductions: Shares of actual cost saved, 0.1 means costs are 10% lower
+        @param project_adjustments: Dictionary of scenario name to dictionary of project_id to additional
+                                    ROI points of the project, only deltas and cost reductions if not specified
+        @return: DataFrame with adjustment, roi_delta, cost_reduction, department_id, projected_profit
+                 and potential_profit columns, potential profit is the change against current total profit
+        """
+        adjustment_names = [NO_ADJUSTMENT] + list(project_adjustments or {})
+        adjustment_terms = np.vstack([np.zeros((1, len(self.department_ids))),
+                                      self._adjustment_terms(project_adjustments or {})])
+        roi_deltas = np.asarray(roi_deltas, dtype=np.float64)
+        cost_reductions = np.asarray(cost_reductions, dtype=np.float64)
+
+        # adjustments x deltas x cost reductions x departments
+        roi_profit = (self.actual_cost * (self.average_roi + roi_deltas[:, None])[None, :, :]
+                      + adjustment_terms[:, None, :]) / 100
+        projected_profit = roi_profit[:, :, None, :] + cost_reductions[:, None] * self.actual_cost
+        potential_profit = projected_profit - self.total_profit
+
+        grid_shape = projected_profit.shape
+        grid = np.indices(grid_shape).reshape(len(grid_shape), -1)
+        return pd.DataFrame({
+            'adjustment': np.asarray(adjustment_names, dtype=object)[grid[0]],
+            'roi_delta': roi_deltas[grid[1]],
+            'cost_reduction': cost_reductions[grid[2]],
+            'department_id': self.department_ids[grid[3]],
+            'projected_profit': projected_profit.ravel(),
+            'potential_profit': potential_profit.ravel(),
+        })
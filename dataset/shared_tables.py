@@ -0,0 +1,148 @@
+"""
+@brief Dataset tables shared with worker processes
+Flattened tables are published once as uncompressed Arrow IPC files in shared memory. Worker processes
+memory-map them read-only, so numeric and string columns of every worker point to the same pages
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    SHARED_TABLES_AVAILABLE = True
+except ImportError:
+    SHARED_TABLES_AVAILABLE = False
+
+# RAM-backed file system of Linux, default temporary directory elsewhere
+SHARED_MEMORY_DIRECTORY = '/dev/shm'
+SHARED_DIRECTORY_PREFIX = 'company-tables-'
+SHARED_TABLE_SUFFIX = '.arrow'
+
+# Tables attached by this process, keyed by published directory
+_attached_tables = {}
+_attach_lock = threading.Lock()
+
+
+def write_shared_table(table, file_path):
+    """
+    @brief Write one table as uncompressed Arrow IPC file, compressed buffers could not be mapped
+
+    @param table: DataFrame with default index
+    @param file_path: Target file path
+    """
+    arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    with pa.OSFile(file_path, 'wb') as table_file:
+        with pa.ipc.new_file(table_file, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+
+
+def read_shared_table(file_path):
+    """
+    @brief Memory-map one published table
+    Numeric columns become read-only views of the mapping, strings and list columns stay Arrow-backed
+
+    @param file_path: Published table file path
+    @return: DataFrame
+    """
+    arrow_table = pa.ipc.open_file(pa.memory_map(file_path, 'r')).read_all()
+    return arrow_table.to_pandas(split_blocks=True, types_mapper=_list_dtype)
+
+
+def _list_dtype(arrow_type):
+    """
+    @brief Keep list columns in Arrow memory instead of converting them to Python lists
+
+    @param arrow_type: Arrow column type
+    @return: pandas ArrowDtype for list types, None for default conversion
+    """
+    return pd.ArrowDtype(arrow_type) if pa.types.is_list(arrow_type) else None
+
+
+class SharedTables:
+    """
+    @brief Handle of published tables, it is pickled to workers instead of the tables
+    Files are removed when the publishing handle is garbage collected or its process exits
+    """
+
+    def __init__(self, directory, table_names):
+        """
+        @brief Initialize handle of a published directory
+
+        @param directory: Directory with one Arrow file per table
+        @param table_names: Names of published tables
+        """
+        self.directory = directory
+        self.table_names = list(table_names)
+        self._finalizer = None
+
+    @classmethod
+    def publish(cls, tables):
+        """
+        @brief Write tables to a new shared directory owned by the returned handle
+
+        @param tables: Dictionary of table name to DataFrame
+        @return: SharedTables
+        """
+        parent_directory = SHARED_MEMORY_DIRECTORY if os.path.isdir(SHARED_MEMORY_DIRECTORY) else None
+        directory = tempfile.mkdtemp(prefix=SHARED_DIRECTORY_PREFIX, dir=parent_directory)
+        shared_tables = cls(directory, tables)
+        shared_tables._finalizer = weakref.finalize(shared_tables, shutil.rmtree, directory, ignore_errors=True)
+        try:
+            for table_name, table in tables.items():
+                write_shared_table(table, shared_tables.table_path(table_name))
+        except Exception:
+            shared_tables.close()
+            raise
+        return shared_tables
+
+    def table_path(self, table_name):
+        """
+        @brief Path of one published table
+
+        @param table_name: Table name
+        @return: File path
+        """
+        return os.path.join(self.directory, table_name + SHARED_TABLE_SUFFIX)
+
+    def attach(self):
+        """
+        @brief Map published tables, every process maps them once and reuses the DataFrames
+
+        @return: Dictionary of table name to read-only DataFrame
+        """
+        with _attach_lock:
+            tables = _attached_tables.get(self.directory)
+            if tables is None:
+                tables = {table_name: read_shared_table(self.table_path(table_name))
+                          for table_name in self.table_names}
+                _attached_tables[self.directory] = tables
+        return tables
+
+    def close(self):
+        """
+        @brief Remove published files, only the publishing handle owns them
+        Processes which already mapped the tables keep reading them until they unmap
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __getstate__(self):
+        """
+        @brief Pickle directory and table names, unpickled handles never remove the files
+
+        @return: State dictionary
+        """
+        return {'directory': self.directory, 'table_names': self.table_names}
+
+    def __setstate__(self, state):
+        """
+        @brief Restore handle without ownership of the files
+
+        @param state: State dictionary from __getstate__
+        """
+        self.__dict__.update(state)
+        self._finalizer = None
@@ -0,0 +1,154 @@
+"""
+@brief Difference between successive company snapshots
+Compares per-record signatures of two snapshots and finds departments touched by the changes
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SnapshotTables:
+    """
+    @brief Names of signature tables, analyzers declare their inputs with these names
+    """
+    EMPLOYEES = 'employees'
+    PROJECTS = 'projects'
+    KPI = 'kpi'
+    EQUIPMENT = 'equipment'
+
+
+# Signature table name -> key columns identifying one record
+SIGNATURE_KEYS = {
+    SnapshotTables.EMPLOYEES: ['employee_id'],
+    SnapshotTables.PROJECTS: ['project_id', 'department_id'],
+    SnapshotTables.KPI: ['department_id'],
+    SnapshotTables.EQUIPMENT: ['equipment_id'],
+}
+
+
+def _hashable_column(column):
+    """
+    @brief Convert column into values hashed identically whether tables came from JSON or cache
+    List values may be read back from cache as arrays, they are hashed by joined items
+
+    @param column: Series
+    @return: Series with hashable values
+    """
+    if column.dtype != object:
+        return column
+    return column.map(lambda value: '\x1f'.join(map(str, value))
+                      if isinstance(value, (list, tuple, np.ndarray)) else str(value))
+
+
+def _row_hashes(table):
+    """
+    @brief Hash every row of the table
+
+    @param table: DataFrame
+    @return: Array of uint64 row hashes
+    """
+    return pd.util.hash_pandas_object(table.apply(_hashable_column), index=False).to_numpy()
+
+
+def _signature(table, key_columns):
+    """
+    @brief Build signature of one table
+
+    @param table: DataFrame with key columns and department_id
+    @param key_columns: Columns identifying one record
+    @return: DataFrame with key columns, department_id and row_hash
+    """
+    signature_columns = list(dict.fromkeys(key_columns + ['department_id']))
+    signature = table[signature_columns].reset_index(drop=True)
+    signature['row_hash'] = _row_hashes(table)
+    return signature
+
+
+def snapshot_signature(dataset):
+    """
+    @brief Build record signatures of a loaded snapshot
+    Projects are signed per participating department, so a project moving between departments
+    touches both of them
+
+    @param dataset: CompanyDataset
+    @return: Dictionary of signature table name to DataFrame
+    """
+    return {
+        SnapshotTables.EMPLOYEES: _signature(dataset.employees, SIGNATURE_KEYS[SnapshotTables.EMPLOYEES]),
+        SnapshotTables.PROJECTS: _signature(dataset.department_projects_table,
+                                            SIGNATURE_KEYS[SnapshotTables.PROJECTS]),
+        SnapshotTables.KPI: _signature(dataset.kpi_table.reset_index(), SIGNATURE_KEYS[SnapshotTables.KPI]),
+        SnapshotTables.EQUIPMENT: _signature(dataset.equipment, SIGNATURE_KEYS[SnapshotTables.EQUIPMENT]),
+    }
+
+
+class SnapshotDiff:
+    """
+    @brief Changed records and affected departments between two snapshot signatures
+    """
+
+    def __init__(self, previous_signature, current_signature):
+        """
+        @brief Compare signatures table by table
+
+        @param previous_signature: Signature of previous snapshot, None if there is no previous snapshot
+        @param current_signature: Signature of current snapshot
+        """
+        self.changed_records = {}
+        self.affected_departments = {}
+
+        for table_name, key_columns in SIGNATURE_KEYS.items():
+            previous_table = previous_signature.get(table_name) if previous_signature else None
+            if previous_table is None:
+                # Without previous records every department is treated as changed
+                self.changed_records[table_name] = None
+                self.affected_departments[table_name] = None
+                continue
+            self._compare(table_name, key_columns, previous_table, current_signature[table_name])
+
+    def _compare(self, table_name, key_columns, previous_table, current_table):
+        """
+        @brief Find added, removed and modified records of one table
+
+        @param table_name: Signature table name
+        @param key_columns: Columns identifying one record
+        @param previous_table: Signature of previous snapshot
+        @param current_table: Signature of current snapshot
+        """
+        comparison = previous_table.merge(current_table, on=key_columns, how='outer',
+                                          suffixes=('_previous', '_current'), indicator=True)
+        changed = comparison[(comparison['_merge'] != 'both')
+                             | (comparison['row_hash_previous'] != comparison['row_hash_current'])]
+
+        if 'department_id' in key_columns:
+            department_ids = changed['department_id'].to_numpy()
+        else:
+            # Record may have moved, both old and new departments are affected
+            department_ids = np.concatenate([changed['department_id_previous'].to_numpy(),
+                                             changed['department_id_current'].to_numpy()])
+
+        self.changed_records[table_name] = len(changed)
+        self.affected_departments[table_name] = set(pd.Series(department_ids).dropna().tolist())
+
+    def is_complete(self, source_tables):
+        """
+        @brief Check that all source tables could be compared with a previous snapshot
+
+        @param source_tables: Iterable of signature table names
+        @return: True if affected departments are known for every table
+        """
+        return all(self.affected_departments.get(table_name) is not None for table_name in source_tables)
+
+    def departments_for(self, source_tables):
+        """
+        @brief Departments affected by changes of the given tables
+
+        @param source_tables: Iterable of signature table names
+        @return: Set of department identifiers, None if the tables cannot be compared
+        """
+        if not self.is_complete(source_tables):
+            return None
+        affected_departments = set()
+        for table_name in source_tables:
+            affected_departments.update(self.affected_departments[table_name])
+        return affected_departments
@@ -0,0 +1,188 @@
+"""
+@brief History of dated company snapshots
+Finds dated exports in a directory, reduces batch results of one snapshot to numeric per-department
+aggregates and keeps them in a trend store, so a new export costs one analysis instead of the whole history
+"""
+
+import json
+import os
+import re
+import pandas as pd
+from dataset.dataset_cache import CACHE_FORMAT, read_table, remove_table_files, table_file_name, write_table
+from config.messages import LogMessages, ErrorMessages
+
+TREND_STORE_VERSION = 1
+TREND_STORE_DIRECTORY = '.trend'
+MANIFEST_FILE_NAME = 'manifest.json'
+SNAPSHOT_SUFFIXES = ('.json', '.json.gz', '.json.xz', '.json.bz2', '.json.zst', '.zip')
+# Date in file name, e.g. company_2026-10-18.json or company_20261018.json
+SNAPSHOT_DATE_PATTERN = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+
+def snapshot_date(file_name):
+    """
+    @brief Parse snapshot date from file name
+
+    @param file_name: Snapshot file name
+    @return: ISO date string or None if the name carries no valid date
+    """
+    match = SNAPSHOT_DATE_PATTERN.search(file_name)
+    if match is None:
+        return None
+    try:
+        return pd.Timestamp('-'.join(match.groups())).date().isoformat()
+    except ValueError:
+        return None
+
+
+def discover_snapshots(directory, logger):
+    """
+    @brief List dated snapshot files of a directory
+
+    @param directory: Directory with snapshot files
+    @param logger: Logger instance
+    @return: List of (ISO date, file path) tuples ordered by date
+    """
+    snapshots = {}
+    for file_name in sorted(os.listdir(directory)):
+        file_path = os.path.join(directory, file_name)
+        if not file_name.endswith(SNAPSHOT_SUFFIXES) or not os.path.isfile(file_path):
+            continue
+        file_date = snapshot_date(file_name)
+        if file_date is None:
+            logger.warning(LogMessages.SNAPSHOT_SKIPPED.format(file_path))
+            continue
+        if file_date in snapshots:
+            raise ValueError(ErrorMessages.DUPLICATE_SNAPSHOT_DATE.format(file_date, [snapshots[file_date], file_path]))
+        snapshots[file_date] = file_path
+
+    if not snapshots:
+        raise FileNotFoundError(ErrorMessages.NO_SNAPSHOTS.format(directory))
+    return sorted(snapshots.items())
+
+
+def snapshot_aggregates(batch_results):
+    """
+    @brief Reduce batch results of one snapshot to numeric per-department columns
+    Lists and names are left out, they are not compared across snapshots
+
+    @param batch_results: Batch DataFrame indexed by department_id
+    @return: DataFrame indexed by department_id with numeric columns only
+    """
+    return batch_results.select_dtypes(include='number')
+
+
+def trend_table(snapshot_aggregates, category_prefixes=()):
+    """
+    @brief Join aggregates of all snapshots into one trend table
+    A category count column missing in a snapshot means zero occurrences in its departments
+
+    @param snapshot_aggregates: Dictionary of ISO date to DataFrame indexed by department_id, in date order
+    @param category_prefixes: Prefixes of per-category count columns
+    @return: DataFrame with snapshot_date, department_id and aggregate columns, one row per snapshot and department
+    """
+    columns = pd.Index([])
+    for aggregates in snapshot_aggregates.values():
+        columns = columns.union(aggregates.columns, sort=False)
+
+    snapshot_tables = []
+    for aggregates in snapshot_aggregates.values():
+        missing_columns = columns.difference(aggregates.columns)
+        aggregates = aggregates.reindex(columns=columns)
+        for column in missing_columns:
+            if str(column).startswith(tuple(category_prefixes)):
+                aggregates[column] = 0
+        snapshot_tables.append(aggregates)
+    trend = pd.concat(snapshot_tables, keys=list(snapshot_aggregates), names=['snapshot_date', 'department_id'])
+    return trend.reset_index()
+
+
+class TrendStore:
+    """
+    @brief Directory with numeric batch aggregates of every analyzed snapshot
+    Entries are keyed by snapshot file name and valid while file size, mtime and selected analyses are unchanged
+    """
+
+    def __init__(self, store_directory, logger):
+        """
+        @brief Initialize trend store
+
+        @param store_directory: Directory holding stored aggregates and manifest
+        @param logger: Logger instance
+        """
+        self.store_directory = store_directory
+        self.logger = logger
+        self.manifest_path = os.path.join(store_directory, MANIFEST_FILE_NAME)
+        self.manifest = self._read_manifest()
+
+    def load(self, snapshot_path, analysis_key):
+        """
+        @brief Load stored aggregates of a snapshot
+
+        @param snapshot_path: Snapshot file path
+        @param analysis_key: Identifier of selected analyses and KPI source
+        @return: DataFrame indexed by department_id or None if the snapshot has to be analyzed
+        """
+        entry = self.manifest['snapshots'].get(os.path.basename(snapshot_path))
+        if entry is None or entry.get('analysis') != analysis_key:
+            return None
+        if any(entry.get(key) != value for key, value in self._source_state(snapshot_path).items()):
+            return None
+        try:
+            return read_table(os.path.join(self.store_directory, entry['table'])).set_index('department_id')
+        except Exception as reading_error:
+            self.logger.warning(LogMessages.TREND_STORE_READ_ERROR.format(self.store_directory, str(reading_error)))
+            return None
+
+    def store(self, snapshot_path, analysis_key, aggregates):
+        """
+        @brief Store aggregates of a snapshot, failures are logged and never break analysis
+        Table is written under a new file name, the replaced one is removed after the manifest
+
+        @param snapshot_path: Snapshot file path
+        @param analysis_key: Identifier of selected analyses and KPI source
+        @param aggregates: DataFrame indexed by department_id
+        """
+        try:
+            os.makedirs(self.store_directory, exist_ok=True)
+            file_name = os.path.basename(snapshot_path)
+            aggregates_file_name = table_file_name(file_name)
+            write_table(aggregates.reset_index(), os.path.join(self.store_directory, aggregates_file_name))
+            previous_entry = self.manifest['snapshots'].get(file_name, {})
+            self.manifest['snapshots'][file_name] = dict(self._source_state(snapshot_path), analysis=analysis_key,
+                                                         table=aggregates_file_name)
+
+            # Manifest is replaced last so readers never see partially written tables as valid
+            temporary_manifest_path = self.manifest_path + '.tmp'
+            with open(temporary_manifest_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump(self.manifest, manifest_file)
+            os.replace(temporary_manifest_path, self.manifest_path)
+            remove_table_files(self.store_directory, [previous_entry['table']] if 'table' in previous_entry else [])
+        except Exception as writing_error:
+            self.logger.warning(LogMessages.TREND_STORE_WRITE_ERROR.format(self.store_directory, str(writing_error)))
+
+    @staticmethod
+    def _source_state(snapshot_path):
+        """
+        @brief Size and modification time identifying snapshot content
+
+        @param snapshot_path: Snapshot file path
+        @return: Dictionary with size and mtime_ns
+        """
+        source_stat = os.stat(snapshot_path)
+        return {'size': source_stat.st_size, 'mtime_ns': source_stat.st_mtime_ns}
+
+    def _read_manifest(self):
+        """
+        @brief Read store manifest
+
+        @return: Manifest dictionary, empty one if it is missing, unreadable or outdated
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest.get('version') == TREND_STORE_VERSION and manifest.get('format') == CACHE_FORMAT:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': TREND_STORE_VERSION, 'format': CACHE_FORMAT, 'snapshots': {}}
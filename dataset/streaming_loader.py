@@ -0,0 +1,203 @@
+"""
+@brief Streaming reader for large company JSON exports
+Walks top-level arrays record by record with bounded memory
+"""
+
+import json
+import re
+from dataset.compressed_input import open_input
+from config.messages import LogMessages
+
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Characters one value may span, corrupt input fails here instead of buffering the rest of the file
+MAX_VALUE_CHARS = 16 * STREAM_CHUNK_SIZE
+WHITESPACE = ' \t\n\r'
+# Characters a JSON number may continue with
+NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*')
+
+
+class StreamingJsonReader:
+    """
+    @brief Incremental reader of a JSON document with a top-level object
+    Only one array element is decoded at a time, everything else is read in fixed-size chunks
+    """
+
+    def __init__(self, text_file, chunk_size=STREAM_CHUNK_SIZE, max_value_chars=MAX_VALUE_CHARS):
+        """
+        @brief Initialize reader over an open text file
+
+        @param text_file: File object opened in text mode
+        @param chunk_size: Number of characters read per chunk
+        @param max_value_chars: Characters one decoded value may span
+        """
+        self.text_file = text_file
+        self.chunk_size = chunk_size
+        self.max_value_chars = max_value_chars
+        self.encoding = getattr(text_file, 'encoding', None) or 'utf-8'
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        # Encoded size of the document part dropped from the buffer
+        self.consumed_bytes = 0
+        self.end_of_file = False
+
+    def stream_sections(self, handlers):
+        """
+        @brief Read the whole document and pass array records to section handlers
+        Records of sections without handler and non-array values are decoded and dropped
+
+        @param handlers: Dictionary of top-level key to callable accepting one record
+        @return: Dictionary of top-level key to number of records read
+        """
+        record_counts = {}
+        self._expect('{')
+        if self._peek() == '}':
+            self.position += 1
+            return record_counts
+
+        while True:
+            section_name = self._read_value()
+            self._expect(':')
+            handler = handlers.get(section_name)
+            if self._peek() == '[':
+                record_counts[section_name] = self._stream_array(handler)
+            else:
+                self._read_value()
+
+            separator = self._next_char()
+            if separator == '}':
+                return record_counts
+            if separator != ',':
+                raise ValueError("Expected ',' or '}}' at byte offset {}".format(self._byte_offset()))
+
+    def _stream_array(self, handler):
+        """
+        @brief Decode array elements one by one
+
+        @param handler: Callable accepting one record or None to skip records
+        @return: Number of records read
+        """
+        self._expect('[')
+        record_count = 0
+        if self._peek() == ']':
+            self.position += 1
+            return record_count
+
+        while True:
+            record = self._read_value()
+            record_count += 1
+            if handler is not None:
+                handler(record)
+
+            separator = self._next_char()
+            if separator == ']':
+                return record_count
+            if separator != ',':
+                raise ValueError("Expected ',' or ']' at byte offset {}".format(self._byte_offset()))
+
+    def _fill(self):
+        """
+        @brief Read next chunk, dropping already consumed part of the buffer
+
+        @return: False if end of file was reached
+        """
+        if self.end_of_file:
+            return False
+        chunk = self.text_file.read(self.chunk_size)
+        if not chunk:
+            self.end_of_file = True
+            return False
+        self.consumed_bytes += len(self.buffer[:self.position].encode(self.encoding))
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def _byte_offset(self):
+        """
+        @brief Offset of current position in the document
+
+        @return: Number of encoded bytes before current position
+        """
+        return self.consumed_bytes + len(self.buffer[:self.position].encode(self.encoding))
+
+    def _peek(self):
+        """
+        @brief Skip whitespace and return next character without consuming it
+
+        @return: Next non-whitespace character
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def _next_char(self):
+        """
+        @brief Consume next non-whitespace character
+
+        @return: Consumed character
+        """
+        char = self._peek()
+        self.position += 1
+        return char
+
+    def _expect(self, expected_char):
+        """
+        @brief Consume next non-whitespace character and check it
+
+        @param expected_char: Character required at current position
+        """
+        char = self._next_char()
+        if char != expected_char:
+            raise ValueError("Expected '{}' at byte offset {}, got '{}'".format(expected_char, self._byte_offset(),
+                                                                                char))
+
+    def _read_value(self):
+        """
+        @brief Decode one JSON value, reading more chunks until it is complete
+        Value longer than max_value_chars is treated as corrupt input
+
+        @return: Decoded value
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as decode_error:
+                if len(self.buffer) - self.position > self.max_value_chars:
+                    raise ValueError("JSON value at byte offset {} is not complete after {} characters: {}".format(
+                        self._byte_offset(), self.max_value_chars, decode_error.msg)) from decode_error
+                if not self._fill():
+                    raise ValueError("Invalid JSON value at byte offset {}: {}".format(
+                        self._byte_offset(), decode_error.msg)) from decode_error
+                continue
+            # Number decoded up to the buffer end, or up to a cut fraction or exponent, may continue in the next chunk
+            if not self.end_of_file and NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer) \
+                    and self._fill():
+                continue
+            self.position = end
+            return value
+
+
+def stream_company_file(json_file_path, handlers, logger):
+    """
+    @brief Stream top-level sections of company JSON file into handlers
+
+    @param json_file_path: Path to JSON data file, plain or compressed
+    @param handlers: Dictionary of top-level key to callable accepting one record
+    @param logger: Logger instance
+    @return: Dictionary of top-level key to number of records read
+    """
+    logger.info(LogMessages.DATA_STREAM_START)
+    try:
+        with open_input(json_file_path) as json_file:
+            record_counts = StreamingJsonReader(json_file).stream_sections(handlers)
+        logger.info(LogMessages.DATA_LOAD_SUCCESS.format(json_file_path))
+        return record_counts
+    except Exception as loading_error:
+        logger.error(LogMessages.DATA_LOAD_ERROR.format(json_file_path, str(loading_error)))
+        raise loading_error
@@ -0,0 +1,342 @@
+"""
+@brief Column-wise builder of company dataset tables
+Accumulates only the fields used by analyzers from individual JSON records and converts them
+to compact typed columns in chunks, so Python objects of all records are never held at once
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+
+
+PROJECT_COLUMNS = [
+    'project_id', 'name', 'description', 'status', 'start_date', 'end_date', 'duration_days',
+    'budget', 'actual_cost', 'profit', 'roi_percentage', 'completion_percentage', 'risk_level', 'priority',
+]
+
+PROJECT_DEPARTMENT_COLUMNS = ['project_id', 'department_id', 'department_name', 'budget_allocation']
+
+DEPARTMENT_COLUMNS = ['department_id', 'department_name', 'type', 'budget']
+
+EMPLOYEE_COLUMNS = [
+    'employee_id', 'full_name', 'department_id', 'department_name', 'position', 'salary', 'hire_date',
+    'experience_years', 'performance_score', 'certifications', 'language_skills',
+]
+
+EQUIPMENT_COLUMNS = [
+    'equipment_id', 'name', 'type', 'department_id', 'department_name', 'purchase_date', 'cost', 'status',
+    'efficiency_percentage', 'maintenance_cost_per_month', 'hours_used_daily', 'utilization_rate',
+]
+
+# Repeated labels stored as categorical codes
+CATEGORY_COLUMNS = {
+    'departments': ['type'],
+    'projects': ['status', 'risk_level', 'priority'],
+    'project_departments': ['department_name'],
+    'employees': ['department_name', 'position'],
+    'equipment': ['type', 'department_name', 'status'],
+}
+
+DATE_COLUMNS = {
+    'projects': ['start_date', 'end_date'],
+    'employees': ['hire_date'],
+    'equipment': ['purchase_date'],
+}
+
+# Free text not used by analyzers, collected only on request
+TEXT_COLUMNS = {
+    'projects': ['description'],
+}
+
+# Records kept as Python values before conversion to typed columns
+TABLE_CHUNK_ROWS = 65536
+
+INT32_RANGE = np.iinfo(np.int32)
+
+
+def compact_integers(column):
+    """
+    @brief Store integer column as int32 when all values fit
+    Conversion is lossless, sums and grouped aggregations of int32 columns are still calculated in int64
+
+    @param column: Series
+    @return: Series
+    """
+    if pd.api.types.is_integer_dtype(column.dtype) and column.dtype.itemsize > 4 and (
+            column.empty or (column.min() >= INT32_RANGE.min and column.max() <= INT32_RANGE.max)):
+        return column.astype(np.int32)
+    return column
+
+
+class TableColumns:
+    """
+    @brief Column storage of one table
+    Values are appended to per-column lists like to a dictionary of lists. Every TABLE_CHUNK_ROWS records
+    the lists are converted to a typed chunk: labels to int32 codes of a category dictionary shared by all chunks,
+    dates to datetime64 and integers to int32 where they fit
+    """
+
+    def __init__(self, columns, category_columns=(), date_columns=()):
+        """
+        @brief Initialize empty columns
+
+        @param columns: List of column names
+        @param category_columns: Columns of repeated labels
+        @param date_columns: Columns of ISO date strings
+        """
+        self.columns = list(columns)
+        self.date_columns = [column for column in date_columns if column in self.columns]
+        self.categories = {column: {} for column in category_columns if column in self.columns}
+        self.values = {column: [] for column in self.columns}
+        self.chunks = []
+
+    def __getitem__(self, column):
+        """
+        @brief Pending values of a column
+
+        @param column: Column name
+        @return: List receiving values of the following records
+        """
+        return self.values[column]
+
+    def __contains__(self, column):
+        """
+        @brief Check whether the column is collected
+
+        @param column: Column name
+        @return: True for collected columns
+        """
+        return column in self.values
+
+    def end_record(self):
+        """
+        @brief Mark values of one or more records as complete, converts a full chunk
+        """
+        if len(self.values[self.columns[0]]) >= TABLE_CHUNK_ROWS:
+            self._convert_chunk()
+
+    def _convert_chunk(self):
+        """
+        @brief Convert pending values to a typed DataFrame chunk and release them
+        """
+        chunk = {}
+        for column in self.columns:
+            values = self.values[column]
+            if column in self.categories:
+                chunk[column] = self._category_codes(column, values)
+            elif column in self.date_columns:
+                chunk[column] = pd.to_datetime(pd.Series(values, dtype=object))
+            else:
+                chunk[column] = compact_integers(pd.Series(values))
+        self.chunks.append(pd.DataFrame(chunk, columns=self.columns))
+        self.values = {column: [] for column in self.columns}
+
+    def _category_codes(self, column, values):
+        """
+        @brief Encode labels with the category dictionary of the column, missing labels get code -1
+
+        @param column: Column name
+        @param values: List of labels
+        @return: int32 array of codes
+        """
+        categories = self.categories[column]
+        chunk_codes, labels = pd.factorize(pd.Series(values, dtype=object))
+        label_codes = np.array([categories.setdefault(label, len(categories)) for label in labels], dtype=np.int32)
+        return np.where(chunk_codes >= 0, label_codes[chunk_codes] if len(label_codes) else -1, -1).astype(np.int32)
+
+    def build(self):
+        """
+        @brief Concatenate converted chunks into one DataFrame
+
+        @return: DataFrame with categorical label columns
+        """
+        if self.values[self.columns[0]] or not self.chunks:
+            self._convert_chunk()
+        table = self.chunks[0] if len(self.chunks) == 1 else pd.concat(self.chunks, ignore_index=True)
+        self.chunks = []
+        for column, categories in self.categories.items():
+            # Categories are sorted, so sorted factorization and grouping order labels as plain strings.
+            # Code -1 of missing labels selects the last lookup element, which stays -1
+            labels = list(categories)
+            order = sorted(range(len(labels)), key=lambda code: str(labels[code]))
+            sorted_codes = np.full(len(labels) + 1, -1, dtype=np.int32)
+            sorted_codes[order] = np.arange(len(labels), dtype=np.int32)
+            table[column] = pd.Categorical.from_codes(sorted_codes[table[column].to_numpy()],
+                                                      categories=[labels[code] for code in order])
+        return table
+
+
+class CompanyTableBuilder:
+    """
+    @brief Builder of flattened company tables
+    Records are added one by one, so the whole JSON document never has to be held in memory
+    """
+
+    def __init__(self, text_columns=False):
+        """
+        @brief Initialize empty column storage for all tables
+
+        @param text_columns: Collect free text columns of TEXT_COLUMNS, such as project description
+        """
+        self.department_columns = self._table_columns('departments', DEPARTMENT_COLUMNS, text_columns)
+        self.project_columns = self._table_columns('projects', PROJECT_COLUMNS, text_columns)
+        self.project_department_columns = self._table_columns('project_departments', PROJECT_DEPARTMENT_COLUMNS,
+                                                              text_columns)
+        self.employee_columns = self._table_columns('employees', EMPLOYEE_COLUMNS, text_columns)
+        self.equipment_columns = self._table_columns('equipment', EQUIPMENT_COLUMNS, text_columns)
+        self.kpi_records = []
+
+    @staticmethod
+    def _table_columns(table_name, columns, text_columns):
+        """
+        @brief Column storage of one table
+
+        @param table_name: Table name of CATEGORY_COLUMNS, DATE_COLUMNS and TEXT_COLUMNS
+        @param columns: All column names of the table
+        @param text_columns: Keep free text columns
+        @return: TableColumns
+        """
+        skipped_columns = [] if text_columns else TEXT_COLUMNS.get(table_name, [])
+        return TableColumns([column for column in columns if column not in skipped_columns],
+                            CATEGORY_COLUMNS.get(table_name, ()), DATE_COLUMNS.get(table_name, ()))
+
+    def record_handlers(self):
+        """
+        @brief Map top-level JSON sections to record handlers
+
+        @return: Dictionary of section name to callable accepting one record
+        """
+        return {
+            'departments': self.add_department,
+            'projects': self.add_project,
+            'employees': self.add_employee,
+            'equipment': self.add_equipment,
+            'kpi_metrics': self.add_kpi,
+        }
+
+    def add_department(self, department):
+        """
+        @brief Add one record of departments section
+
+        @param department: Department dictionary
+        """
+        self.department_columns['department_id'].append(department['id'])
+        self.department_columns['department_name'].append(department.get('name'))
+        self.department_columns['type'].append(department.get('type'))
+        self.department_columns['budget'].append(department.get('budget', 0))
+        self.department_columns.end_record()
+
+    def add_project(self, project):
+        """
+        @brief Add one record of projects section with its participating departments
+
+        @param project: Project dictionary
+        """
+        timeline = project['timeline']
+        financials = project['financials']
+        metrics = project['metrics']
+        self.project_columns['project_id'].append(project['project_id'])
+        self.project_columns['name'].append(project['name'])
+        if 'description' in self.project_columns:
+            self.project_columns['description'].append(project['description'])
+        self.project_columns['status'].append(project['status'])
+        self.project_columns['start_date'].append(timeline['start_date'])
+        self.project_columns['end_date'].append(timeline['end_date'])
+        self.project_columns['duration_days'].append(timeline['duration_days'])
+        self.project_columns['budget'].append(financials['budget'])
+        self.project_columns['actual_cost'].append(financials['actual_cost'])
+        self.project_columns['profit'].append(financials['profit'])
+        self.project_columns['roi_percentage'].append(financials['roi_percentage'])
+        self.project_columns['completion_percentage'].append(metrics['completion_percentage'])
+        self.project_columns['risk_level'].append(metrics['risk_level'])
+        self.project_columns['priority'].append(metrics['priority'])
+        self.project_columns.end_record()
+
+        for department in project.get('participating_departments', []):
+            self.project_department_columns['project_id'].append(project['project_id'])
+            self.project_department_columns['department_id'].append(department.get('department_id'))
+            self.project_department_columns['department_name'].append(department.get('department_name'))
+            self.project_department_columns['budget_allocation'].append(department.get('budget_allocation', 0))
+        self.project_department_columns.end_record()
+
+    def add_employee(self, employee):
+        """
+        @brief Add one record of employees section
+
+        @param employee: Employee dictionary
+        """
+        work_info = employee['work_info']
+        additional_info = employee.get('additional_info', {})
+        self.employee_columns['employee_id'].append(employee['employee_id'])
+        self.employee_columns['full_name'].append(employee['personal_info']['full_name'])
+        self.employee_columns['department_id'].append(work_info['department_id'])
+        self.employee_columns['department_name'].append(work_info.get('department_name'))
+        self.employee_columns['position'].append(work_info.get('position'))
+        self.employee_columns['salary'].append(work_info['salary'])
+        self.employee_columns['hire_date'].append(work_info.get('hire_date'))
+        self.employee_columns['experience_years'].append(work_info.get('experience_years'))
+        self.employee_columns['performance_score'].append(work_info['performance_score'])
+        self.employee_columns['certifications'].append(additional_info.get('certifications', 0))
+        # Language names repeat across all employees, one string object is shared by every list
+        self.employee_columns['language_skills'].append(
+            [sys.intern(language) for language in additional_info.get('language_skills', [])]
+        )
+        self.employee_columns.end_record()
+
+    def add_equipment(self, equipment):
+        """
+        @brief Add one record of equipment section
+
+        @param equipment: Equipment dictionary
+        """
+        purchase_info = equipment.get('purchase_info', {})
+        operational_info = equipment.get('operational_info', {})
+        utilization = equipment.get('utilization', {})
+        self.equipment_columns['equipment_id'].append(equipment['equipment_id'])
+        self.equipment_columns['name'].append(equipment.get('name'))
+        self.equipment_columns['type'].append(equipment.get('type'))
+        self.equipment_columns['department_id'].append(equipment.get('department_id'))
+        self.equipment_columns['department_name'].append(equipment.get('department_name'))
+        self.equipment_columns['purchase_date'].append(purchase_info.get('purchase_date'))
+        self.equipment_columns['cost'].append(purchase_info.get('cost', 0))
+        self.equipment_columns['status'].append(operational_info.get('status'))
+        self.equipment_columns['efficiency_percentage'].append(operational_info.get('efficiency_percentage'))
+        self.equipment_columns['maintenance_cost_per_month'].append(
+            operational_info.get('maintenance_cost_per_month', 0)
+        )
+        self.equipment_columns['hours_used_daily'].append(utilization.get('hours_used_daily'))
+        self.equipment_columns['utilization_rate'].append(utilization.get('utilization_rate'))
+        self.equipment_columns.end_record()
+
+    def add_kpi(self, kpi_record):
+        """
+        @brief Add one record of kpi_metrics section
+
+        @param kpi_record: KPI dictionary
+        """
+        self.kpi_records.append(kpi_record)
+
+    def add_document(self, data):
+        """
+        @brief Add all records of an already parsed JSON document
+
+        @param data: Dictionary with company data
+        """
+        for section_name, handler in self.record_handlers().items():
+            for record in data.get(section_name, []):
+                handler(record)
+
+    def build(self):
+        """
+        @brief Convert accumulated columns to DataFrames
+
+        @return: Dictionary of table name to DataFrame
+        """
+        return {
+            'departments': self.department_columns.build(),
+            'projects': self.project_columns.build(),
+            'project_departments': self.project_department_columns.build(),
+            'employees': self.employee_columns.build(),
+            'equipment': self.equipment_columns.build(),
+            'kpi_metrics': pd.json_normalize(self.kpi_records),
+        }
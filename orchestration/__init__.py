@@ -0,0 +1,18 @@
+"""
+@brief Orchestration package for commercial department analysis
+Contains analysis stages, the orchestrator of analysis modes and the command line interface
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'ANALYSIS_STAGES': 'orchestration.stages',
+    'ANALYSIS_NAMES': 'orchestration.stages',
+    'CommercialDepartmentAnalysisOrchestrator': 'orchestration.orchestrator',
+    'AnalysisModes': 'orchestration.cli',
+    'write_results': 'orchestration.cli',
+    'main': 'orchestration.cli',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,354 @@
+"""
+@brief Command line interface of commercial department analysis
+Parses arguments, runs the selected orchestrator mode and writes results, streams and rendered reports
+
+Analyzer modules, pandas and the dataset layer are imported when they are needed,
+so argument errors and --help return immediately and unselected analyzers are never loaded
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from orchestration.stages import ANALYSIS_NAMES
+from orchestration.orchestrator import CommercialDepartmentAnalysisOrchestrator
+from utils.task_graph import ExecutorTypes
+from utils.serialization import serializable
+from config.messages import LogMessages
+from config.helper_const import KpiSources, Departments
+
+
+class AnalysisModes:
+    """
+    @brief Analyses selectable from the command line
+    """
+    COMPREHENSIVE = 'comprehensive'
+    BATCH = 'batch'
+    INCREMENTAL = 'incremental'
+    KPI_RECONCILIATION = 'kpi-reconciliation'
+    ROI_SCENARIOS = 'roi-scenarios'
+    TREND = 'trend'
+
+
+# Formats of rendered department reports, keys of reports.renderers.RENDERERS
+REPORT_FORMATS = ['docx', 'html', 'md']
+
+
+class OutputFormats:
+    """
+    @brief Result formats of the command line
+    """
+    TEXT = 'text'
+    JSON = 'json'
+    CSV = 'csv'
+
+
+class ConsoleViews:
+    """
+    @brief Console output of analysis results
+    """
+    FULL = 'full'
+    SUMMARY = 'summary'
+    NONE = 'none'
+
+
+# Formats of streamed result files, keys of utils.result_sink.FILE_SINKS
+SINK_FORMATS = ['jsonl', 'parquet']
+
+
+def _result_rows(results):
+    """
+    @brief Flatten analysis results into CSV rows
+    Tables keep their columns, dictionaries of results become department, analysis, metric and value rows
+
+    @param results: DataFrame or dictionary of department_id to analysis results collection
+    @return: Tuple of header list and list of row lists
+    """
+    if hasattr(results, 'columns'):
+        table = results.reset_index() if results.index.name else results
+        return list(table.columns), table.values.tolist()
+
+    rows = []
+    for department_id, results_collection in results.items():
+        for analysis_name, analysis_result in results_collection.items():
+            for metric, value in serializable(analysis_result).items():
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value, ensure_ascii=False)
+                rows.append([department_id, analysis_name, metric, value])
+    return ['department_id', 'analysis', 'metric', 'value'], rows
+
+
+def write_results(results, output_format, output_file):
+    """
+    @brief Write analysis results in machine-readable format
+
+    @param results: DataFrame or dictionary of department_id to analysis results collection
+    @param output_format: OutputFormats.JSON or OutputFormats.CSV
+    @param output_file: Text stream
+    """
+    if output_format == OutputFormats.JSON:
+        json.dump(serializable(results), output_file, ensure_ascii=False, indent=2, default=str)
+        output_file.write('\n')
+    else:
+        header, rows = _result_rows(results)
+        csv_writer = csv.writer(output_file)
+        csv_writer.writerow(header)
+        csv_writer.writerows(rows)
+
+
+def _selected_analyses(only, skip):
+    """
+    @brief Resolve --only and --skip analyzer names into analysis stage names
+
+    @param only: Analyzer names to run or None
+    @param skip: Analyzer names to leave out or None
+    @return: List of analysis stage names in execution order
+    """
+    selected_names = only or [name for name in ANALYSIS_NAMES if name not in (skip or [])]
+    return [ANALYSIS_NAMES[name] for name in ANALYSIS_NAMES if name in selected_names]
+
+
+def _parse_arguments(argv=None):
+    """
+    @brief Parse command line arguments
+
+    @param argv: Argument list, sys.argv if not specified
+    @return: argparse.Namespace
+    """
+    argument_parser = argparse.ArgumentParser(description="Commercial department analysis")
+    argument_parser.add_argument('input', nargs='?', default="company.json",
+                                 help="company data JSON file, directory of dated snapshots for trend mode")
+    argument_parser.add_argument('--mode', default=AnalysisModes.COMPREHENSIVE,
+                                 choices=[AnalysisModes.COMPREHENSIVE, AnalysisModes.BATCH,
+                                          AnalysisModes.INCREMENTAL, AnalysisModes.KPI_RECONCILIATION,
+                                          AnalysisModes.ROI_SCENARIOS, AnalysisModes.TREND],
+                                 help="comprehensive report of departments or one per-department table")
+    department_selection = argument_parser.add_mutually_exclusive_group()
+    department_selection.add_argument('--departments', type=int, nargs='+',
+                                      help="department ids, commercial department for comprehensive mode "
+                                           "and all departments for table modes by default")
+    department_selection.add_argument('--all-departments', action='store_true',
+                                      help="analyze every department of the data file")
+    selection = argument_parser.add_mutually_exclusive_group()
+    selection.add_argument('--only', nargs='+', choices=list(ANALYSIS_NAMES), help="run only these analyzers")
+    selection.add_argument('--skip', nargs='+', choices=list(ANALYSIS_NAMES), help="do not run these analyzers")
+    argument_parser.add_argument('--format', default=OutputFormats.TEXT,
+                                 choices=[OutputFormats.TEXT, OutputFormats.JSON, OutputFormats.CSV],
+                                 help="text prints console reports, json and csv write results")
+    argument_parser.add_argument('--output', help="result file for json and csv formats, stdout by default")
+    argument_parser.add_argument('--console', default=ConsoleViews.FULL,
+                                 choices=[ConsoleViews.FULL, ConsoleViews.SUMMARY, ConsoleViews.NONE],
+                                 help="full console reports, one line per department and analysis or nothing")
+    argument_parser.add_argument('--sink', choices=SINK_FORMATS,
+                                 help="stream every department and analysis result to a file as it is produced")
+    argument_parser.add_argument('--sink-path', default='-',
+                                 help="result stream file, stdout by default for jsonl")
+    argument_parser.add_argument('--report', nargs='+', choices=REPORT_FORMATS,
+                                 help="render department reports of comprehensive analysis in these formats")
+    argument_parser.add_argument('--report-directory', default='rendered_reports', help="directory of reports")
+    argument_parser.add_argument('--roi-deltas', type=float, nargs='+',
+                                 help="ROI changes in percentage points for roi-scenarios mode, -10 to 20 by default")
+    argument_parser.add_argument('--cost-reductions', type=float, nargs='+',
+                                 help="shares of saved actual cost for roi-scenarios mode, 0 to 0.2 by default")
+    argument_parser.add_argument('--kpi-source', default=KpiSources.STORED,
+                                 choices=[KpiSources.STORED, KpiSources.DERIVED],
+                                 help="use exported kpi_metrics or recompute them from projects and employees")
+    argument_parser.add_argument('--workers', type=int, help="number of workers running analyzers")
+    argument_parser.add_argument('--executor', default=ExecutorTypes.THREAD,
+                                 choices=[ExecutorTypes.THREAD, ExecutorTypes.PROCESS], help="worker pool type")
+    argument_parser.add_argument('--profile', action='store_true',
+                                 help="write CPU profile and allocation snapshots of every stage to profiles/")
+    argument_parser.add_argument('--trace-memory', action='store_true',
+                                 help="record traced Python heap peak of every stage, slows analysis down")
+    argument_parser.add_argument('--metrics-directory',
+                                 help="directory of stage metrics JSON and Prometheus textfile, logs/ by default")
+    argument_parser.add_argument('--serve', action='store_true',
+                                 help="keep dataset in memory and answer analysis requests over HTTP")
+    argument_parser.add_argument('--host', default='127.0.0.1', help="service listening address")
+    argument_parser.add_argument('--port', type=int, default=8765, help="service listening port")
+    arguments = argument_parser.parse_args(argv)
+    if arguments.report and arguments.mode != AnalysisModes.COMPREHENSIVE:
+        argument_parser.error("--report requires comprehensive mode")
+    if arguments.report:
+        from reports.renderers import create_renderer
+
+        # Missing optional rendering package is reported before any analysis runs
+        for report_format in arguments.report:
+            try:
+                create_renderer(report_format)
+            except ImportError as import_error:
+                argument_parser.error(str(import_error))
+    if (arguments.roi_deltas or arguments.cost_reductions) and arguments.mode != AnalysisModes.ROI_SCENARIOS:
+        argument_parser.error("--roi-deltas and --cost-reductions require roi-scenarios mode")
+    if arguments.mode == AnalysisModes.TREND and not os.path.isdir(arguments.input):
+        argument_parser.error("trend mode requires a directory of dated snapshot files")
+    if arguments.sink == 'parquet' and arguments.sink_path == '-':
+        argument_parser.error("--sink parquet requires --sink-path")
+    if arguments.sink and arguments.sink_path == '-' and arguments.format != OutputFormats.TEXT \
+            and not arguments.output:
+        argument_parser.error("--sink and --format cannot both write to stdout, use --sink-path or --output")
+    return arguments
+
+
+def _create_result_sink(arguments):
+    """
+    @brief Create result sink selected by --sink and --console
+
+    @param arguments: Parsed command line arguments
+    @return: ResultSink or None when results are not streamed
+    """
+    if not arguments.sink and arguments.console != ConsoleViews.SUMMARY:
+        return None
+    from utils.result_sink import FILE_SINKS, ConsoleSummarySink, MultiSink
+
+    sinks = []
+    if arguments.sink:
+        sinks.append(FILE_SINKS[arguments.sink](arguments.sink_path))
+    if arguments.console == ConsoleViews.SUMMARY:
+        sinks.append(ConsoleSummarySink())
+    return sinks[0] if len(sinks) == 1 else MultiSink(sinks)
+
+
+def _run_analysis(arguments, result_sink=None):
+    """
+    @brief Run analysis selected by command line arguments
+
+    @param arguments: Parsed command line arguments
+    @param result_sink: ResultSink receiving results of every department and analysis
+    @return: Tuple of results and last orchestrator, results are a DataFrame for table modes
+             and a dictionary of department_id to analysis results collection for comprehensive mode
+    """
+    orchestrator_arguments = {
+        'max_workers': arguments.workers,
+        'executor_type': arguments.executor,
+        'kpi_source': arguments.kpi_source,
+        'profile': arguments.profile,
+        'metrics_directory': arguments.metrics_directory,
+        'trace_memory': arguments.trace_memory,
+        'analyses': _selected_analyses(arguments.only, arguments.skip),
+        'result_sink': result_sink,
+        'print_reports': arguments.console == ConsoleViews.FULL,
+    }
+
+    if arguments.mode == AnalysisModes.COMPREHENSIVE:
+        department_ids = arguments.departments or [Departments.COMMERCIAL]
+        shared_dataset = None
+        if arguments.all_departments:
+            from dataset.company_dataset import CompanyDataset
+
+            shared_dataset = CompanyDataset(arguments.input, kpi_source=arguments.kpi_source)
+            department_ids = shared_dataset.department_ids()
+
+        results = {}
+        analysis_orchestrator = None
+        for department_id in department_ids:
+            # Departments share the dataset loaded once
+            analysis_orchestrator = CommercialDepartmentAnalysisOrchestrator(
+                arguments.input, department_id=department_id, dataset=shared_dataset, **orchestrator_arguments
+            )
+            results[department_id] = analysis_orchestrator.execute_comprehensive_analysis()
+            shared_dataset = analysis_orchestrator.dataset
+        return results, analysis_orchestrator
+
+    analysis_orchestrator = CommercialDepartmentAnalysisOrchestrator(arguments.input, **orchestrator_arguments)
+    if arguments.mode == AnalysisModes.BATCH:
+        results = analysis_orchestrator.execute_batch_analysis(arguments.departments)
+    elif arguments.mode == AnalysisModes.INCREMENTAL:
+        # Stored results always cover all departments, selection only filters the output
+        results = analysis_orchestrator.execute_incremental_analysis()
+        if arguments.departments:
+            results = results.reindex(arguments.departments).rename_axis('department_id')
+    elif arguments.mode == AnalysisModes.TREND:
+        results = analysis_orchestrator.execute_trend_analysis(arguments.departments)
+    elif arguments.mode == AnalysisModes.ROI_SCENARIOS:
+        results = analysis_orchestrator.execute_roi_scenarios(arguments.roi_deltas, arguments.cost_reductions,
+                                                              arguments.departments)
+    else:
+        results = analysis_orchestrator.execute_kpi_reconciliation()
+        if arguments.departments:
+            results = results[results['department_id'].isin(arguments.departments)]
+    if result_sink is not None:
+        # Table modes produce all departments at once, rows are streamed after the final selection
+        from utils.result_sink import table_records
+
+        for record in table_records(results, arguments.mode):
+            result_sink.write(record)
+    return results, analysis_orchestrator
+
+
+def _render_reports(arguments, results, dataset):
+    """
+    @brief Render department reports of comprehensive analysis results
+
+    @param arguments: Parsed command line arguments
+    @param results: Dictionary of department_id to analysis results collection
+    @param dataset: CompanyDataset the results were computed on
+    @return: List of written report files
+    """
+    from reports.report_renderer import ReportRenderer
+
+    department_names = dataset.departments.set_index('department_id')['department_name'].to_dict()
+    report_renderer = ReportRenderer(arguments.report_directory, arguments.report, arguments.workers)
+    return report_renderer.render_all(results, department_names)
+
+
+def main(argv=None):
+    """
+    @brief Main execution function for Commercial department Analysis
+    Handles command line arguments and orchestrates analysis execution
+
+    @param argv: Argument list, sys.argv if not specified
+    """
+    arguments = _parse_arguments(argv)
+    if arguments.serve:
+        from service.analysis_service import run_service
+
+        try:
+            run_service(arguments.input, arguments.host, arguments.port, arguments.kpi_source, arguments.workers)
+        except KeyboardInterrupt:
+            print("\nANALYSIS SERVICE STOPPED")
+        return
+
+    write_to_stdout = arguments.format != OutputFormats.TEXT and not arguments.output
+    stream_to_stdout = arguments.sink and arguments.sink_path == '-'
+
+    try:
+        # Sink writing to stdout is created before console reports are redirected to stderr
+        result_sink = _create_result_sink(arguments)
+        # Console reports go to stderr when stdout carries the results
+        with contextlib.redirect_stdout(sys.stderr) if write_to_stdout or stream_to_stdout \
+                else contextlib.nullcontext():
+            with result_sink if result_sink is not None else contextlib.nullcontext():
+                results, analysis_orchestrator = _run_analysis(arguments, result_sink)
+            if result_sink is not None and arguments.sink:
+                analysis_orchestrator.logger.info(LogMessages.RESULTS_STREAMED.format(
+                    result_sink.records_written, arguments.sink_path
+                ))
+            if arguments.format == OutputFormats.TEXT and arguments.mode != AnalysisModes.COMPREHENSIVE \
+                    and arguments.console == ConsoleViews.FULL:
+                print(results.to_string())
+
+            print(f"\nANALYSIS COMPLETED SUCCESSFULLY!")
+            print(f"Log files generated in 'logs/' directory")
+            if analysis_orchestrator.profiler:
+                print(f"Profiling results generated in '{analysis_orchestrator.profiler.run_directory}' directory")
+            if arguments.report:
+                report_paths = _render_reports(arguments, results, analysis_orchestrator.dataset)
+                print(f"Reports generated in '{arguments.report_directory}' directory: {len(report_paths)} files")
+
+        if write_to_stdout:
+            write_results(results, arguments.format, sys.stdout)
+        elif arguments.format != OutputFormats.TEXT:
+            with open(arguments.output, 'w', encoding='utf-8', newline='') as output_file:
+                write_results(results, arguments.format, output_file)
+            print(f"Results written to {arguments.output}")
+
+    except FileNotFoundError as file_error:
+        print(f"\nFILE ERROR: {str(file_error)}")
+        print("Please check the file path and ensure the JSON file exists")
+        sys.exit(1)
+    except Exception as main_execution_error:
+        print(f"\nCRITICAL ERROR DURING ANALYSIS EXECUTION: {str(main_execution_error)}")
+        sys.exit(1)
@@ -0,0 +1,558 @@
+"""
+@brief Commercial department analysis orchestrator
+Runs selected analyzers of comprehensive, batch, incremental, trend, ROI scenario and KPI reconciliation modes
+on the task graph and compiles their results
+"""
+
+import os
+from functools import partial
+from analyzers.registry import analyzer_class
+from orchestration.stages import (ANALYSIS_STAGES, ANALYSIS_NAMES, _execute_analyzer_stage, _execute_batch_stage,
+                                  _execute_incremental_stage, _execute_snapshot_stage, _execute_profiled_stage)
+from utils.logger import analysis_logger, configure_worker_logging
+from utils.task_graph import TaskGraph, ExecutorTypes, StageStatus
+from utils.instrumentation import instrumentation
+from config.messages import LogMessages, ReportMessages
+from config.helper_const import KpiSources, Departments
+
+
+class CommercialDepartmentAnalysisOrchestrator:
+    """
+    @brief Main orchestrator for commercial departments analysis system
+    Coordinates execution of all analysis modules and compiles results
+    """
+
+    def __init__(self, json_data_file_path, max_workers=None, executor_type=ExecutorTypes.THREAD,
+                 kpi_source=KpiSources.STORED, metrics_directory=None, trace_memory=False, profile=False,
+                 analyses=None, department_id=Departments.COMMERCIAL, dataset=None, result_sink=None,
+                 print_reports=True):
+        """
+        @brief Initialize analysis orchestrator with data source
+        Analyzer instances are created by the load stage of the task graph
+
+        @param json_data_file_path: Path to company data JSON file
+        @param max_workers: Number of workers running independent stages, pool default if not specified
+        @param executor_type: ExecutorTypes.THREAD or ExecutorTypes.PROCESS
+        @param kpi_source: KpiSources.STORED to use exported kpi_metrics, KpiSources.DERIVED to recompute them
+        @param metrics_directory: Directory for stage metrics JSON and Prometheus textfile, log directory by default
+        @param trace_memory: Record traced Python heap peak of every stage, slows analysis down
+        @param profile: Write CPU profile and allocation snapshots of every stage into a per-run directory,
+                        stages run one at a time so snapshots are not mixed
+        @param analyses: Analysis stage names to run, all stages if not specified
+        @param department_id: Department analyzed by comprehensive analysis
+        @param dataset: Already loaded CompanyDataset of the data file, loaded by the load stage if not specified
+        @param result_sink: ResultSink receiving every analysis result of comprehensive analysis when it is ready
+        @param print_reports: Print console reports of analyzers and comprehensive summary
+        """
+        self.json_data_file_path = json_data_file_path
+        self.kpi_source = kpi_source
+        self.metrics_directory = metrics_directory or analysis_logger.log_directory
+        if trace_memory:
+            instrumentation.enable_memory_tracing()
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.profiler = None
+        if profile:
+            from utils.profiler import AnalysisProfiler, PROFILE_DIRECTORY
+
+            self.max_workers = 1
+            self.executor_type = ExecutorTypes.THREAD
+            self.profiler = AnalysisProfiler(
+                os.path.join(os.path.dirname(analysis_logger.log_directory), PROFILE_DIRECTORY)
+            )
+        self.analysis_stages = [stage for stage in ANALYSIS_STAGES if analyses is None or stage[0] in analyses]
+        self.department_id = department_id
+        self.result_sink = result_sink
+        self.print_reports = print_reports
+        self.analysis_results_collection = {}
+        self.analysis_errors = {}
+        self.logger = analysis_logger.get_analysis_logger("Orchestrator")
+
+        # Verify file exists before initializing analyzers
+        self._verify_data_file_exists()
+
+        self.dataset = dataset
+        self.analyzers_created = False
+        self.projects_metric_module = None
+        self.person_efficiency_module = None
+        self.language_analyzer = None
+        self.clients_analyzer = None
+        self.roi_up_analyzer = None
+        self.equipment_analyzer = None
+
+    def _verify_data_file_exists(self):
+        """
+        @brief Verify that the data file exists before analysis
+        Provides clear error message if file is not found
+        """
+        if not os.path.exists(self.json_data_file_path):
+            error_message = f"Data file not found: {self.json_data_file_path}"
+            print(f"ERROR: {error_message}")
+            print("Please ensure the JSON data file exists in the specified path")
+            raise FileNotFoundError(error_message)
+
+    def _load_stage(self):
+        """
+        @brief Load data once and share it between all analyzers
+        Does nothing if analyzers were already created
+        """
+        if self.analyzers_created:
+            return
+
+        with instrumentation.measure("Orchestrator", 'load') as stage_metrics:
+            if self.profiler:
+                _execute_profiled_stage(self.profiler, 'load', self._create_analyzers)
+            else:
+                self._create_analyzers()
+            if self.executor_type == ExecutorTypes.PROCESS:
+                # Workers map published tables instead of unpickling a copy of the dataset for every stage
+                self.dataset.share_tables()
+            stage_metrics.rows = len(self.dataset.employees) + len(self.dataset.projects)
+
+    def _create_analyzers(self):
+        """
+        @brief Load shared dataset and create instances of selected analyzers on top of it
+        Modules of analyzers which are not selected are not imported
+        """
+        if self.dataset is None:
+            from dataset.company_dataset import CompanyDataset
+
+            self.dataset = CompanyDataset(self.json_data_file_path, kpi_source=self.kpi_source)
+
+        # Initialize analyzer instances
+        analyzer_names = {stage_name: analyzer_name for analyzer_name, stage_name in ANALYSIS_NAMES.items()}
+        for stage_name, analyzer_attribute, _, _ in self.analysis_stages:
+            stage_analyzer_class = analyzer_class(analyzer_names[stage_name])
+            analyzer = stage_analyzer_class(self.json_data_file_path, self.dataset, self.department_id)
+            setattr(self, analyzer_attribute, analyzer)
+        self.analyzers_created = True
+
+    def _build_task_graph(self):
+        """
+        @brief Create task graph with the pool configured for this orchestrator
+
+        @return: Empty TaskGraph
+        """
+        if self.executor_type == ExecutorTypes.PROCESS:
+            # Worker processes send log records to the single writer of this process
+            return TaskGraph(self.max_workers, self.executor_type, self.logger,
+                             configure_worker_logging, (analysis_logger.process_queue(),))
+        return TaskGraph(self.max_workers, self.executor_type, self.logger)
+
+    def _stage_function(self, stage_name, function):
+        """
+        @brief Wrap stage function with the profiler in profile mode
+
+        @param stage_name: Stage name
+        @param function: Module-level stage function
+        @return: Callable executed by the task graph
+        """
+        if self.profiler is None:
+            return function
+        return partial(_execute_profiled_stage, self.profiler, stage_name, function)
+
+    def _stage_arguments(self, analyzer_attribute, *extra_arguments):
+        """
+        @brief Resolve analyzer attribute into stage arguments at submission time
+        Analyzers are created by the load stage, so they cannot be bound when the graph is built
+
+        @param analyzer_attribute: Name of orchestrator attribute holding the analyzer
+        @param extra_arguments: Additional positional arguments for the stage function
+        @return: Tuple of stage arguments
+        """
+        return (getattr(self, analyzer_attribute),) + extra_arguments
+
+    def execute_comprehensive_analysis(self):
+        """
+        @brief Execute complete commercial department analysis
+        Runs load stage, independent analyzer stages on the worker pool, then report and summary stages.
+        A failing analyzer does not stop the others, its error is kept in analysis_errors
+
+        @return: Dictionary containing all analysis results
+        """
+        if self.print_reports:
+            print("INITIATING COMPREHENSIVE COMMERCIAL DEPARTMENT ANALYSIS")
+            print("=" * 70)
+
+        task_graph = self._build_task_graph()
+        task_graph.add_stage('load', self._load_stage, run_in_pool=False)
+        for stage_name, analyzer_attribute, _, _ in self.analysis_stages:
+            task_graph.add_stage(stage_name, self._stage_function(stage_name, _execute_analyzer_stage), ['load'],
+                                 arguments=partial(self._stage_arguments, analyzer_attribute))
+        analysis_stage_names = [stage[0] for stage in self.analysis_stages]
+        task_graph.add_stage('report', partial(self._report_stage, task_graph), analysis_stage_names,
+                             run_in_pool=False, allow_failed_dependencies=True)
+        task_graph.add_stage('summary', self._generate_comprehensive_summary_report, ['report'],
+                             run_in_pool=False)
+
+        try:
+            with instrumentation.measure("Orchestrator", 'comprehensive_analysis'):
+                stage_results = task_graph.execute()
+        finally:
+            self._export_metrics()
+        for stage_result in stage_results.values():
+            if stage_result.status == StageStatus.FAILED and stage_result.name not in analysis_stage_names:
+                print(f"\nCOMPREHENSIVE ANALYSIS FAILED: {str(stage_result.error)}")
+                raise stage_result.error
+
+        return self.analysis_results_collection
+
+    def _report_stage(self, task_graph):
+        """
+        @brief Collect analyzer stage results, pass them to the result sink and print their reports in fixed order
+
+        @param task_graph: Executed task graph with analyzer stage results
+        """
+        from utils.result_sink import result_record
+
+        for stage_name, analyzer_attribute, result_key, header in self.analysis_stages:
+            if self.print_reports:
+                print(header)
+            stage_result = task_graph.results[stage_name]
+            if stage_result.status == StageStatus.COMPLETED:
+                self.analysis_results_collection[result_key] = stage_result.result
+                if self.result_sink is not None:
+                    self.result_sink.write(result_record(self.department_id, stage_name, stage_result.result))
+                if self.print_reports:
+                    getattr(self, analyzer_attribute)._generate_report(stage_result.result)
+            else:
+                self.analysis_errors[result_key] = stage_result.error
+                if self.result_sink is not None:
+                    self.result_sink.write(result_record(self.department_id, stage_name, error=stage_result.error))
+                if self.print_reports:
+                    print(f"ANALYSIS FAILED: {str(stage_result.error)}")
+
+    def execute_batch_analysis(self, department_ids=None):
+        """
+        @brief Execute every analysis for many departments in one pass
+        Batch stages of all analysis modules run on the worker pool and are joined into one per-department table
+
+        @param department_ids: Departments to analyze, all departments if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        print("INITIATING " + ReportMessages.BATCH_HEADER)
+        print("=" * 70)
+
+        try:
+            with instrumentation.measure("Orchestrator", 'batch_analysis') as stage_metrics:
+                batch_results = self._batch_stage(department_ids)
+                stage_metrics.rows = len(batch_results)
+
+            self.analysis_results_collection['batch_analysis_result'] = batch_results
+            print(f"Departments analyzed: {len(batch_results)}")
+
+            return batch_results
+
+        except Exception as batch_analysis_error:
+            print(f"\nBATCH ANALYSIS FAILED: {str(batch_analysis_error)}")
+            raise batch_analysis_error
+        finally:
+            self._export_metrics()
+
+    def _batch_stage(self, department_ids):
+        """
+        @brief Run batch stages of all analyzers on the task graph
+
+        @param department_ids: Departments to analyze, all departments if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        self._load_stage()
+        if department_ids is None:
+            department_ids = self.dataset.department_ids()
+        department_ids = list(department_ids)
+
+        task_graph = self._build_task_graph()
+        for stage_name, analyzer_attribute, _, _ in self.analysis_stages:
+            task_graph.add_stage(stage_name, self._stage_function(stage_name, _execute_batch_stage),
+                                 arguments=partial(self._stage_arguments, analyzer_attribute, department_ids))
+        return self._join_batch_results(task_graph.execute(), department_ids)
+
+    def execute_incremental_analysis(self, result_store_path=None):
+        """
+        @brief Execute batch analysis of all departments reusing results of the previous snapshot
+        Snapshot is compared with the stored one by employee_id and project_id, each analyzer recomputes
+        only departments touched by changes of the tables it reads. Results are stored for the next run
+
+        @param result_store_path: Directory of persisted results, next to the data file if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        print("INITIATING " + ReportMessages.INCREMENTAL_HEADER)
+        print("=" * 70)
+
+        try:
+            with instrumentation.measure("Orchestrator", 'incremental_analysis') as stage_metrics:
+                batch_results = self._incremental_stage(result_store_path)
+                stage_metrics.rows = len(batch_results)
+
+            self.analysis_results_collection['batch_analysis_result'] = batch_results
+            print(f"Departments analyzed: {len(batch_results)}")
+
+            return batch_results
+
+        except Exception as incremental_analysis_error:
+            print(f"\nINCREMENTAL ANALYSIS FAILED: {str(incremental_analysis_error)}")
+            raise incremental_analysis_error
+        finally:
+            self._export_metrics()
+
+    def _incremental_stage(self, result_store_path):
+        """
+        @brief Recompute batch results of departments touched by snapshot changes and update result store
+
+        @param result_store_path: Directory of persisted results, next to the data file if not specified
+        @return: DataFrame with one row per department indexed by department_id
+        """
+        from dataset.result_store import ResultStore, RESULT_STORE_SUFFIX
+        from dataset.snapshot_diff import SnapshotDiff, snapshot_signature
+
+        self._load_stage()
+        department_ids = self.dataset.department_ids()
+
+        result_store = ResultStore(result_store_path or self.json_data_file_path + RESULT_STORE_SUFFIX, self.logger)
+        previous_signature, previous_results = result_store.load()
+        current_signature = snapshot_signature(self.dataset)
+        snapshot_diff = SnapshotDiff(previous_signature, current_signature)
+        for table_name, changed_records in snapshot_diff.changed_records.items():
+            if changed_records is None:
+                continue
+            self.logger.info(LogMessages.SNAPSHOT_DIFF.format(
+                table_name, changed_records, snapshot_diff.affected_departments[table_name]
+            ))
+
+        task_graph = self._build_task_graph()
+        for stage_name, analyzer_attribute, _, _ in self.analysis_stages:
+            analyzer = getattr(self, analyzer_attribute)
+            stage_arguments = partial(
+                self._stage_arguments, analyzer_attribute, previous_results.get(stage_name),
+                snapshot_diff.departments_for(analyzer.SOURCE_TABLES), department_ids
+            )
+            task_graph.add_stage(stage_name, self._stage_function(stage_name, _execute_incremental_stage),
+                                 arguments=stage_arguments)
+        stage_results = task_graph.execute()
+        batch_results = self._join_batch_results(stage_results, department_ids)
+
+        result_store.store(current_signature, {
+            stage_name: stage_result.result for stage_name, stage_result in stage_results.items()
+        })
+        return batch_results
+
+    def execute_trend_analysis(self, department_ids=None, trend_store_path=None):
+        """
+        @brief Execute batch analysis of every dated snapshot in the data directory and join results over time
+        Snapshots are independent stages of the worker pool, each keeps only numeric per-department aggregates.
+        Aggregates are stored per snapshot, so only new or changed snapshots are analyzed
+
+        @param department_ids: Departments to include, all departments if not specified
+        @param trend_store_path: Directory of stored aggregates, .trend inside the snapshot directory if not specified
+        @return: DataFrame with snapshot_date, department_id and numeric batch columns,
+                 one row per snapshot and department
+        """
+        print("INITIATING " + ReportMessages.TREND_HEADER)
+        print("=" * 70)
+
+        try:
+            with instrumentation.measure("Orchestrator", 'trend_analysis') as stage_metrics:
+                trend = self._trend_stage(trend_store_path)
+                stage_metrics.rows = len(trend)
+
+            if department_ids:
+                trend = trend[trend['department_id'].isin(department_ids)].reset_index(drop=True)
+            self.analysis_results_collection['trend_analysis_result'] = trend
+            print(f"Snapshots analyzed: {trend['snapshot_date'].nunique()}, rows: {len(trend)}")
+
+            return trend
+
+        except Exception as trend_analysis_error:
+            print(f"\nTREND ANALYSIS FAILED: {str(trend_analysis_error)}")
+            raise trend_analysis_error
+        finally:
+            self._export_metrics()
+
+    def _trend_stage(self, trend_store_path):
+        """
+        @brief Analyze snapshots missing in the trend store and join aggregates of all snapshots
+
+        @param trend_store_path: Directory of stored aggregates, .trend inside the snapshot directory if not specified
+        @return: DataFrame with snapshot_date, department_id and aggregate columns
+        """
+        from dataset.snapshot_history import TrendStore, TREND_STORE_DIRECTORY, discover_snapshots, trend_table
+
+        snapshots = discover_snapshots(self.json_data_file_path, self.logger)
+        trend_store = TrendStore(trend_store_path or os.path.join(self.json_data_file_path, TREND_STORE_DIRECTORY),
+                                 self.logger)
+        stage_names = [stage[0] for stage in self.analysis_stages]
+        analysis_key = ','.join(stage_names + [self.kpi_source])
+
+        snapshot_aggregates = {}
+        task_graph = self._build_task_graph()
+        for snapshot_date, snapshot_path in snapshots:
+            snapshot_aggregates[snapshot_date] = trend_store.load(snapshot_path, analysis_key)
+            if snapshot_aggregates[snapshot_date] is None:
+                task_graph.add_stage(snapshot_date, self._stage_function(snapshot_date, _execute_snapshot_stage),
+                                     arguments=partial(tuple, (snapshot_path, stage_names, self.kpi_source)))
+        stage_results = task_graph.execute()
+        self.logger.info(LogMessages.TREND_SNAPSHOTS.format(
+            self.json_data_file_path, len(snapshots), len(stage_results), len(snapshots) - len(stage_results)
+        ))
+
+        # Completed snapshots are stored before a failure is raised, so a rerun analyzes only the failed ones
+        for snapshot_date, snapshot_path in snapshots:
+            stage_result = stage_results.get(snapshot_date)
+            if stage_result is not None and stage_result.status == StageStatus.COMPLETED:
+                trend_store.store(snapshot_path, analysis_key, stage_result.result)
+                snapshot_aggregates[snapshot_date] = stage_result.result
+        for stage_result in stage_results.values():
+            if stage_result.status != StageStatus.COMPLETED:
+                raise stage_result.error
+
+        analyzer_names = {stage_name: analyzer_name for analyzer_name, stage_name in ANALYSIS_NAMES.items()}
+        category_prefixes = [prefix for stage_name in stage_names
+                             for prefix in analyzer_class(analyzer_names[stage_name]).CATEGORY_COLUMN_PREFIXES]
+        return trend_table(snapshot_aggregates, category_prefixes)
+
+    def _join_batch_results(self, stage_results, department_ids):
+        """
+        @brief Join batch stage results into one per-department table
+
+        @param stage_results: Dictionary of stage name to StageResult
+        @param department_ids: Analyzed departments
+        @return: DataFrame with department_name and all stage columns indexed by department_id
+        """
+        import pandas as pd
+
+        department_names = self.dataset.departments.set_index('department_id')['department_name']
+        batch_results = department_names.reindex(pd.Index(department_ids, name='department_id')).to_frame()
+        for stage_result in stage_results.values():
+            if stage_result.status != StageStatus.COMPLETED:
+                raise stage_result.error
+            batch_results = batch_results.join(stage_result.result)
+        return batch_results
+
+    def execute_kpi_reconciliation(self):
+        """
+        @brief Compare exported kpi_metrics with KPIs derived from projects and employees
+        Prints mismatching metrics so the upstream KPI export can be validated or replaced
+
+        @return: DataFrame with one row per department and metric
+        """
+        print("INITIATING " + ReportMessages.KPI_RECONCILIATION_HEADER)
+        print("=" * 70)
+
+        self._load_stage()
+        discrepancies = self.dataset.kpi_discrepancies()
+        self.analysis_results_collection['kpi_reconciliation_result'] = discrepancies
+
+        mismatches = discrepancies[~discrepancies['matches']]
+        print(f"Compared metrics: {len(discrepancies)}, mismatching: {len(mismatches)}")
+        for metric, metric_mismatches in mismatches.groupby('metric'):
+            print(f"{metric}: {len(metric_mismatches)} departments differ")
+
+        return discrepancies
+
+    def execute_roi_scenarios(self, roi_deltas=None, cost_reductions=None, department_ids=None):
+        """
+        @brief Evaluate grid of ROI what-if scenarios for many departments
+
+        @param roi_deltas: ROI changes in percentage points, default grid if not specified
+        @param cost_reductions: Shares of actual cost saved, default grid if not specified
+        @param department_ids: Departments to evaluate, all departments with KPI records if not specified
+        @return: DataFrame with one row per scenario and department
+        """
+        from dataset.roi_scenarios import DEFAULT_ROI_DELTAS, DEFAULT_COST_REDUCTIONS
+
+        print("INITIATING " + ReportMessages.ROI_SCENARIOS_HEADER)
+        print("=" * 70)
+
+        try:
+            self._load_stage()
+            # Scenarios reuse the ROI model even when roi_up is not among selected analyses
+            roi_up_analyzer = self.roi_up_analyzer or analyzer_class('roi_up')(self.json_data_file_path, self.dataset,
+                                                                               self.department_id)
+            with instrumentation.measure("Orchestrator", 'roi_scenarios') as stage_metrics:
+                scenarios = roi_up_analyzer.execute_scenario_analysis(
+                    roi_deltas or DEFAULT_ROI_DELTAS, cost_reductions or DEFAULT_COST_REDUCTIONS,
+                    department_ids=department_ids
+                )
+                stage_metrics.rows = len(scenarios)
+
+            self.analysis_results_collection['roi_scenarios_result'] = scenarios
+            print(f"Scenarios evaluated: {len(scenarios)}")
+
+            return scenarios
+
+        except Exception as scenario_error:
+            print(f"\nROI SCENARIO ANALYSIS FAILED: {str(scenario_error)}")
+            raise scenario_error
+        finally:
+            self._export_metrics()
+
+    def _export_metrics(self):
+        """
+        @brief Write collected stage metrics as JSON summary and Prometheus textfile
+        Failures are logged and never break analysis
+        """
+        try:
+            json_path, prometheus_path = instrumentation.export(self.metrics_directory)
+            self.logger.info(LogMessages.METRICS_EXPORTED.format(json_path, prometheus_path))
+        except Exception as export_error:
+            self.logger.warning(LogMessages.METRICS_EXPORT_ERROR.format(self.metrics_directory, str(export_error)))
+
+    def _generate_comprehensive_summary_report(self):
+        """
+        @brief Generate final comprehensive summary report
+        Compiles key findings and recommendations from all analyses
+        """
+        if not self.print_reports:
+            return
+
+        print("\n" + "=" * 70)
+        print("COMPREHENSIVE COMMERCIAL DEPARTMENT ANALYSIS SUMMARY")
+        print("=" * 70)
+
+        # Extract key metrics from all analyses, failed analyses are reported as None
+        profit_analysis_result = self.analysis_results_collection.get('profit_analysis_result', {})
+        personal_analysis_result = self.analysis_results_collection.get('personal_analysis_result', {})
+        language_analysis_result = self.analysis_results_collection.get('language_analysis_result', {})
+        client_analysis_result = self.analysis_results_collection.get('client_analysis_result', {})
+        roi_up_analysis_result = self.analysis_results_collection.get('roi_up_analysis_result', {})
+        equipment_analysis_result = self.analysis_results_collection.get('equipment_analysis_result', {})
+
+        total_profit = profit_analysis_result.get('total_profit')
+        average_roi = profit_analysis_result.get('average_roi')
+
+        revenue_per_employee = personal_analysis_result.get('revenue-per-employee')
+        corr = personal_analysis_result.get('correlation')
+
+        lang_distribution = language_analysis_result.get('distribution')
+        need_upgrade_language = language_analysis_result.get('needs')
+        person_with_two_language = language_analysis_result.get('persons-who-know')
+
+        priority_risk = client_analysis_result.get('priorities-risk')
+        ratio = client_analysis_result.get('ratio')
+        good_projects = client_analysis_result.get('projects')
+
+        potential_profit = roi_up_analysis_result.get('potential_profit')
+
+        equipment_count = equipment_analysis_result.get('equipment_count')
+        operational_ratio = equipment_analysis_result.get('operational_ratio')
+        maintenance_cost = equipment_analysis_result.get('total_maintenance_cost')
+
+        print(f"\nKEY PERFORMANCE INDICATORS:")
+        print(f"Total profit: {total_profit}")
+        print(f"Average ROI: {average_roi}")
+
+        print(f"Revenue per employee: {revenue_per_employee}")
+        print(f"Correlation: {corr}")
+
+        print(f"Language distribution: {lang_distribution}")
+        print(f"Need upgrade: {need_upgrade_language}")
+        print(f"Person with two language: {person_with_two_language}")
+
+        print(f"Priority risk: {priority_risk}")
+        print(f"Ratio high/critical to low priority: {ratio}")
+        print(f"Projects with high risk and profit: {good_projects}")
+
+        print(f"If roi up for 5%, potential profit: {potential_profit}")
+
+        print(f"Equipment count: {equipment_count}, operational: {operational_ratio}%")
+        print(f"Monthly equipment maintenance cost: {maintenance_cost}")
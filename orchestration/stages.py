@@ -0,0 +1,99 @@
+"""
+@brief Analysis stages of the orchestrator
+Stage table and module-level stage functions, kept at module level so they can be sent to a process pool
+"""
+
+# Analysis stages: stage name, analyzer attribute, result collection key, console header
+ANALYSIS_STAGES = [
+    ('profit_analysis', 'projects_metric_module', 'profit_analysis_result', "INITIATING PROJECT ANALYSIS"),
+    ('personal_analysis', 'person_efficiency_module', 'personal_analysis_result', "INITIATING PERSONAL ANALYSIS"),
+    ('language_analysis', 'language_analyzer', 'language_analysis_result', "INITIATING LANGUAGE ANALYSIS"),
+    ('client_analysis', 'clients_analyzer', 'client_analysis_result', "INITIATING CLIENT ANALYSIS"),
+    ('roi_up_analysis', 'roi_up_analyzer', 'roi_up_analysis_result', "INITIATING ROI UP ANALYSIS"),
+    ('equipment_analysis', 'equipment_analyzer', 'equipment_analysis_result', "INITIATING EQUIPMENT ANALYSIS"),
+]
+
+# Analyzer name in analyzers.registry: analysis stage name
+ANALYSIS_NAMES = {
+    'profit': 'profit_analysis',
+    'personal': 'personal_analysis',
+    'language': 'language_analysis',
+    'client': 'client_analysis',
+    'roi_up': 'roi_up_analysis',
+    'equipment': 'equipment_analysis',
+}
+
+
+def _execute_analyzer_stage(analyzer):
+    """
+    @brief Run one analyzer without console output
+    Module-level function so it can be sent to a process pool
+
+    @param analyzer: BaseAnalyzer instance
+    @return: Analysis results dictionary
+    """
+    return analyzer.execute_analysis(generate_report=False)
+
+
+def _execute_batch_stage(analyzer, department_ids):
+    """
+    @brief Run batch analysis of one analyzer
+    Module-level function so it can be sent to a process pool
+
+    @param analyzer: BaseAnalyzer instance
+    @param department_ids: Departments to analyze
+    @return: DataFrame indexed by department_id
+    """
+    return analyzer.execute_batch_analysis(department_ids)
+
+
+def _execute_incremental_stage(analyzer, previous_results, affected_department_ids, department_ids):
+    """
+    @brief Run incremental batch analysis of one analyzer
+    Module-level function so it can be sent to a process pool
+
+    @param analyzer: BaseAnalyzer instance
+    @param previous_results: Stored batch results of previous snapshot or None
+    @param affected_department_ids: Departments touched by snapshot changes or None
+    @param department_ids: Departments to analyze
+    @return: DataFrame indexed by department_id
+    """
+    return analyzer.execute_incremental_analysis(previous_results, affected_department_ids, department_ids)
+
+
+def _execute_snapshot_stage(snapshot_path, analyses, kpi_source):
+    """
+    @brief Run batch analysis of one snapshot and reduce it to numeric per-department aggregates
+    Module-level function so it can be sent to a process pool. Only the aggregates leave the stage,
+    dataset of the snapshot is released when it returns
+
+    @param snapshot_path: Snapshot JSON file
+    @param analyses: Analysis stage names to run
+    @param kpi_source: KpiSources.STORED or KpiSources.DERIVED
+    @return: DataFrame indexed by department_id
+    """
+    from dataset.company_dataset import CompanyDataset
+    from dataset.snapshot_history import snapshot_aggregates
+    from orchestration.orchestrator import CommercialDepartmentAnalysisOrchestrator
+
+    # Results are kept in the trend store, table cache of every snapshot would only fill the disk
+    dataset = CompanyDataset(snapshot_path, use_cache=False, kpi_source=kpi_source)
+    snapshot_orchestrator = CommercialDepartmentAnalysisOrchestrator(
+        snapshot_path, max_workers=1, kpi_source=kpi_source, analyses=analyses, dataset=dataset, print_reports=False
+    )
+    return snapshot_aggregates(snapshot_orchestrator._batch_stage(None))
+
+
+def _execute_profiled_stage(profiler, stage_name, function, *arguments):
+    """
+    @brief Run stage function under the profiler
+
+    @param profiler: AnalysisProfiler of the run
+    @param stage_name: Stage name used in report file names
+    @param function: Stage function
+    @param arguments: Positional arguments of stage function
+    @return: Result of stage function
+    """
+    with profiler.profile(stage_name):
+        return function(*arguments)
+
@@ -0,0 +1,18 @@
+"""
+@brief Reports package for commercial department analysis
+Contains department report builder and Markdown, HTML and DOCX renderers
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'ReportBlocks': 'reports.report_builder',
+    'build_department_report': 'reports.report_builder',
+    'MarkdownRenderer': 'reports.renderers',
+    'HtmlRenderer': 'reports.renderers',
+    'DocxRenderer': 'reports.renderers',
+    'ReportRenderer': 'reports.report_renderer',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
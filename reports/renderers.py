@@ -0,0 +1,220 @@
+"""
+@brief Renderers writing report blocks as Markdown, HTML and DOCX files
+Styles are defined once per renderer: HTML shares one stylesheet, DOCX reports are created
+from an optional template document holding Word styles
+"""
+
+import html
+from config.messages import ErrorMessages
+from reports.report_builder import ReportBlocks
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+
+HTML_STYLESHEET = """
+body { font-family: "Segoe UI", Arial, sans-serif; margin: 2em auto; max-width: 60em; color: #222; }
+h1 { font-size: 1.8em; border-bottom: 2px solid #2f5496; padding-bottom: 0.2em; }
+h2 { font-size: 1.4em; color: #2f5496; margin-top: 1.5em; }
+h3 { font-size: 1.15em; color: #2f5496; }
+table { border-collapse: collapse; margin: 0.8em 0; }
+th, td { border: 1px solid #999; padding: 0.3em 0.6em; text-align: left; vertical-align: top; }
+th { background: #dbe5f1; }
+"""
+DOCX_TABLE_STYLE = 'Table Grid'
+DOCX_LIST_STYLES = {False: 'List Bullet', True: 'List Number'}
+
+
+class MarkdownRenderer:
+    """
+    @brief Render report as Markdown document
+    """
+
+    FILE_EXTENSION = 'md'
+
+    def render(self, blocks, file_path):
+        """
+        @brief Write report file
+
+        @param blocks: Report blocks
+        @param file_path: Target file path
+        """
+        lines = []
+        for block in blocks:
+            block_type = block[0]
+            if block_type == ReportBlocks.HEADING:
+                lines.append('#' * (block[2] + 1) + ' ' + block[1])
+            elif block_type == ReportBlocks.PARAGRAPH:
+                lines.append(block[1])
+            elif block_type == ReportBlocks.TABLE:
+                lines.append(self._row(block[1]))
+                lines.append(self._row(['---'] * len(block[1])))
+                lines.extend(self._row(row) for row in block[2])
+            elif block_type == ReportBlocks.LIST:
+                lines.extend('{} {}'.format('{}.'.format(position) if block[2] else '-', item)
+                             for position, item in enumerate(block[1], 1))
+            lines.append('')
+
+        with open(file_path, 'w', encoding='utf-8') as report_file:
+            report_file.write('\n'.join(lines))
+
+    @staticmethod
+    def _row(cells):
+        """
+        @brief Format Markdown table row
+
+        @param cells: Cell values
+        @return: Row string
+        """
+        return '| ' + ' | '.join(str(cell).replace('|', '\\|') for cell in cells) + ' |'
+
+
+class HtmlRenderer:
+    """
+    @brief Render report as standalone HTML page
+    """
+
+    FILE_EXTENSION = 'html'
+
+    def render(self, blocks, file_path):
+        """
+        @brief Write report file
+
+        @param blocks: Report blocks
+        @param file_path: Target file path
+        """
+        title = next((block[1] for block in blocks if block[0] == ReportBlocks.HEADING), '')
+        parts = ['<!DOCTYPE html>', '<html lang="ru">', '<head>', '<meta charset="utf-8">',
+                 '<title>{}</title>'.format(html.escape(title)), '<style>{}</style>'.format(HTML_STYLESHEET),
+                 '</head>', '<body>']
+        for block in blocks:
+            block_type = block[0]
+            if block_type == ReportBlocks.HEADING:
+                parts.append('<h{0}>{1}</h{0}>'.format(block[2] + 1, html.escape(block[1])))
+            elif block_type == ReportBlocks.PARAGRAPH:
+                parts.append('<p>{}</p>'.format(html.escape(block[1])))
+            elif block_type == ReportBlocks.TABLE:
+                parts.append('<table>')
+                parts.append(self._row('th', block[1]))
+                parts.extend(self._row('td', row) for row in block[2])
+                parts.append('</table>')
+            elif block_type == ReportBlocks.LIST:
+                list_tag = 'ol' if block[2] else 'ul'
+                parts.append('<{}>'.format(list_tag))
+                parts.extend('<li>{}</li>'.format(html.escape(str(item))) for item in block[1])
+                parts.append('</{}>'.format(list_tag))
+        parts.extend(['</body>', '</html>', ''])
+
+        with open(file_path, 'w', encoding='utf-8') as report_file:
+            report_file.write('\n'.join(parts))
+
+    @staticmethod
+    def _row(cell_tag, cells):
+        """
+        @brief Format HTML table row
+
+        @param cell_tag: th or td
+        @param cells: Cell values
+        @return: Row string
+        """
+        return '<tr>' + ''.join('<{0}>{1}</{0}>'.format(cell_tag, html.escape(str(cell))) for cell in cells) + '</tr>'
+
+
+class DocxRenderer:
+    """
+    @brief Render report as Word document, requires python-docx
+    """
+
+    FILE_EXTENSION = 'docx'
+
+    def __init__(self, template_path=None):
+        """
+        @brief Initialize renderer
+
+        @param template_path: Word document whose styles are used, python-docx default template if not specified
+        """
+        if docx is None:
+            raise ImportError(ErrorMessages.REPORT_FORMAT_UNAVAILABLE.format(self.FILE_EXTENSION, 'python-docx'))
+        self.template_path = template_path
+
+        # python-docx resolves style names by scanning style definitions on every paragraph,
+        # identifiers are resolved once and written to paragraphs directly
+        styles = docx.Document(template_path).styles
+        self.heading_style_ids = [styles['Title'].style_id] + [styles['Heading {}'.format(level)].style_id
+                                                               for level in range(1, 10)]
+        self.list_style_ids = {numbered: styles[style_name].style_id
+                               for numbered, style_name in DOCX_LIST_STYLES.items()}
+        self.table_style_id = styles[DOCX_TABLE_STYLE].style_id
+
+    def render(self, blocks, file_path):
+        """
+        @brief Write report file
+
+        @param blocks: Report blocks
+        @param file_path: Target file path
+        """
+        document = docx.Document(self.template_path)
+        for block in blocks:
+            block_type = block[0]
+            if block_type == ReportBlocks.HEADING:
+                self._add_paragraph(document, block[1], self.heading_style_ids[block[2]])
+            elif block_type == ReportBlocks.PARAGRAPH:
+                document.add_paragraph(block[1])
+            elif block_type == ReportBlocks.TABLE:
+                self._add_table(document, block[1], block[2])
+            elif block_type == ReportBlocks.LIST:
+                for item in block[1]:
+                    self._add_paragraph(document, str(item), self.list_style_ids[block[2]])
+        document.save(file_path)
+
+    @staticmethod
+    def _add_paragraph(document, text, style_id):
+        """
+        @brief Add paragraph with style given by identifier
+
+        @param document: docx Document
+        @param text: Paragraph text
+        @param style_id: Style identifier in the document
+        """
+        paragraph = document.add_paragraph(text)
+        paragraph._p.style = style_id
+
+    def _add_table(self, document, header, rows):
+        """
+        @brief Add table with bold header row
+
+        @param document: docx Document
+        @param header: Header cell values
+        @param rows: List of row lists
+        """
+        table = document.add_table(rows=len(rows) + 1, cols=len(header))
+        table._tbl.tblPr.style = self.table_style_id
+        for row_position, row in enumerate([header] + rows):
+            cells = table.rows[row_position].cells
+            for cell, value in zip(cells, row):
+                cell.text = str(value)
+                if row_position == 0:
+                    cell.paragraphs[0].runs[0].bold = True
+
+
+# Report format: renderer class
+RENDERERS = {
+    MarkdownRenderer.FILE_EXTENSION: MarkdownRenderer,
+    HtmlRenderer.FILE_EXTENSION: HtmlRenderer,
+    DocxRenderer.FILE_EXTENSION: DocxRenderer,
+}
+
+
+def create_renderer(report_format, docx_template=None):
+    """
+    @brief Create renderer of report format
+
+    @param report_format: Key of RENDERERS
+    @param docx_template: Word template for DOCX reports
+    @return: Renderer instance
+    """
+    if report_format == DocxRenderer.FILE_EXTENSION:
+        return DocxRenderer(docx_template)
+    return RENDERERS[report_format]()
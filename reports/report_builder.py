@@ -0,0 +1,215 @@
+"""
+@brief Format-independent department report built from analysis results
+A report is a list of blocks: headings, paragraphs, tables and lists. Blocks are plain tuples,
+so reports are cheap to send to worker processes and every renderer reads the same structure
+"""
+
+from config.messages import DocumentMessages
+
+
+class ReportBlocks:
+    """
+    @brief Block types of a report
+
+    ('heading', text, level), ('paragraph', text), ('table', header, rows), ('list', items, numbered)
+    """
+    HEADING = 'heading'
+    PARAGRAPH = 'paragraph'
+    TABLE = 'table'
+    LIST = 'list'
+
+
+def format_number(value):
+    """
+    @brief Format number with thousands separators, integers without decimals
+
+    @param value: Number or None
+    @return: Formatted string
+    """
+    if value is None:
+        return DocumentMessages.NO_DATA
+    if float(value).is_integer():
+        return '{:,}'.format(int(value))
+    return '{:,.2f}'.format(value)
+
+
+def format_money(value):
+    """
+    @brief Format amount in roubles
+
+    @param value: Number or None
+    @return: Formatted string
+    """
+    if value is None:
+        return DocumentMessages.NO_DATA
+    return DocumentMessages.CURRENCY.format(format_number(value))
+
+
+def describe_correlation(correlation):
+    """
+    @brief Verbal description of correlation coefficient
+
+    @param correlation: Coefficient in [-1, 1] or None
+    @return: Description string
+    """
+    if correlation is None:
+        return DocumentMessages.NO_DATA
+    direction = DocumentMessages.POSITIVE if correlation >= 0 else DocumentMessages.NEGATIVE
+    for threshold, strength in DocumentMessages.CORRELATION_STRENGTHS:
+        if abs(correlation) >= threshold:
+            return DocumentMessages.CORRELATION_CONCLUSION.format(strength, direction)
+
+
+def _indicator_table(rows):
+    """
+    @brief Table block of indicator, value and conclusion rows
+
+    @param rows: List of row lists
+    @return: Table block
+    """
+    return (ReportBlocks.TABLE, [DocumentMessages.INDICATOR, DocumentMessages.VALUE, DocumentMessages.CONCLUSION],
+            rows)
+
+
+def _profit_section(profit_result):
+    """
+    @brief Blocks of project profit analysis
+    """
+    average_roi = profit_result.get('average_roi')
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.PROFIT_SECTION, 1),
+        _indicator_table([
+            [DocumentMessages.TOTAL_PROFIT, format_money(profit_result.get('total_profit')),
+             DocumentMessages.TOTAL_PROFIT_CONCLUSION],
+            [DocumentMessages.AVERAGE_ROI,
+             DocumentMessages.PERCENT.format(average_roi) if average_roi is not None else DocumentMessages.NO_DATA,
+             DocumentMessages.AVERAGE_ROI_CONCLUSION],
+        ]),
+    ]
+
+
+def _personal_section(personal_result):
+    """
+    @brief Blocks of personal efficiency analysis
+    """
+    correlation = personal_result.get('correlation')
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.PERSONAL_SECTION, 1),
+        _indicator_table([
+            [DocumentMessages.REVENUE_PER_EMPLOYEE, format_money(personal_result.get('revenue-per-employee')),
+             DocumentMessages.REVENUE_PER_EMPLOYEE_CONCLUSION],
+            [DocumentMessages.CORRELATION,
+             '{:.2f}'.format(correlation) if correlation is not None else DocumentMessages.NO_DATA,
+             describe_correlation(correlation)],
+        ]),
+    ]
+
+
+def _language_section(language_result):
+    """
+    @brief Blocks of language skills analysis
+    """
+    distribution = language_result.get('distribution') or {}
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.LANGUAGE_SECTION, 1),
+        (ReportBlocks.HEADING, DocumentMessages.LANGUAGE_NEEDS, 2),
+        (ReportBlocks.LIST, list(language_result.get('needs') or []), False),
+        (ReportBlocks.HEADING, DocumentMessages.LANGUAGE_DISTRIBUTION, 2),
+        (ReportBlocks.TABLE, [DocumentMessages.LANGUAGE_SKILL, DocumentMessages.EMPLOYEE_COUNT],
+         [[language, format_number(count)]
+          for language, count in sorted(distribution.items(), key=lambda item: (-item[1], item[0]))]),
+        (ReportBlocks.HEADING, DocumentMessages.LANGUAGE_COMBINED, 2),
+        (ReportBlocks.LIST, list(language_result.get('persons-who-know') or []), False),
+    ]
+
+
+def _client_section(client_result):
+    """
+    @brief Blocks of client analysis
+    """
+    priority_risk = client_result.get('priorities-risk') or {}
+    ratio = client_result.get('ratio')
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.CLIENT_SECTION, 1),
+        (ReportBlocks.HEADING, DocumentMessages.PRIORITY_RISK, 2),
+        (ReportBlocks.TABLE, [DocumentMessages.PRIORITY_RISK_PAIR, DocumentMessages.PROJECT_COUNT],
+         [[pair, format_number(count)] for pair, count in sorted(priority_risk.items())]),
+        (ReportBlocks.PARAGRAPH, DocumentMessages.PRIORITY_RATIO.format(
+            '{:.2f}'.format(ratio) if ratio is not None else DocumentMessages.NO_DATA)),
+        (ReportBlocks.HEADING, DocumentMessages.RISKY_PROJECTS, 2),
+        (ReportBlocks.TABLE, [DocumentMessages.PROJECT, DocumentMessages.PRIORITY, DocumentMessages.PROFIT],
+         [[project.get('name'), project.get('priority'), format_money(project.get('profit'))]
+          for project in client_result.get('projects') or []]),
+    ]
+
+
+def _roi_up_section(roi_up_result):
+    """
+    @brief Blocks of ROI increase analysis
+    """
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.STRATEGY_SECTION, 1),
+        (ReportBlocks.PARAGRAPH, DocumentMessages.POTENTIAL_PROFIT.format(
+            format_money(roi_up_result.get('potential_profit')))),
+    ]
+
+
+def _equipment_section(equipment_result):
+    """
+    @brief Blocks of equipment analysis
+    """
+    average_efficiency = equipment_result.get('average_efficiency')
+    operational_ratio = equipment_result.get('operational_ratio')
+    statuses = equipment_result.get('statuses') or {}
+    return [
+        (ReportBlocks.HEADING, DocumentMessages.EQUIPMENT_SECTION, 1),
+        _indicator_table([
+            [DocumentMessages.EQUIPMENT_COUNT, format_number(equipment_result.get('equipment_count')),
+             DocumentMessages.EQUIPMENT_COUNT_CONCLUSION],
+            [DocumentMessages.AVERAGE_EFFICIENCY,
+             DocumentMessages.PERCENT.format(average_efficiency) if average_efficiency is not None
+             else DocumentMessages.NO_DATA,
+             DocumentMessages.AVERAGE_EFFICIENCY_CONCLUSION],
+            [DocumentMessages.MAINTENANCE_COST, format_money(equipment_result.get('total_maintenance_cost')),
+             DocumentMessages.MAINTENANCE_COST_CONCLUSION],
+            [DocumentMessages.OPERATIONAL_RATIO,
+             DocumentMessages.PERCENT.format(operational_ratio) if operational_ratio is not None
+             else DocumentMessages.NO_DATA,
+             DocumentMessages.OPERATIONAL_RATIO_CONCLUSION],
+        ]),
+        (ReportBlocks.HEADING, DocumentMessages.EQUIPMENT_STATUSES, 2),
+        (ReportBlocks.TABLE, [DocumentMessages.EQUIPMENT_STATUS, DocumentMessages.EQUIPMENT_COUNT],
+         [[status, format_number(count)] for status, count in sorted(statuses.items())]),
+    ]
+
+
+# Result collection key and section builder in report order
+REPORT_SECTIONS = [
+    ('profit_analysis_result', _profit_section),
+    ('personal_analysis_result', _personal_section),
+    ('language_analysis_result', _language_section),
+    ('client_analysis_result', _client_section),
+    ('roi_up_analysis_result', _roi_up_section),
+    ('equipment_analysis_result', _equipment_section),
+]
+
+
+def build_department_report(department_id, department_name, analysis_results_collection):
+    """
+    @brief Build report blocks of one department
+    Sections of analyses missing from the collection are left out
+
+    @param department_id: Department identifier
+    @param department_name: Department name
+    @param analysis_results_collection: Orchestrator results with JSON-compatible values
+    @return: List of report blocks
+    """
+    blocks = [
+        (ReportBlocks.HEADING, DocumentMessages.TITLE, 0),
+        (ReportBlocks.PARAGRAPH, DocumentMessages.DEPARTMENT.format(department_name, department_id)),
+    ]
+    for result_key, build_section in REPORT_SECTIONS:
+        analysis_result = analysis_results_collection.get(result_key)
+        if analysis_result is not None:
+            blocks.extend(build_section(analysis_result))
+    return blocks
@@ -0,0 +1,135 @@
+"""
+@brief Parallel rendering of department reports
+Departments are split into chunks rendered by worker processes, every worker creates
+its renderers once and reuses them for all reports of all its chunks
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from reports.report_builder import build_department_report
+from reports.renderers import RENDERERS, create_renderer
+from utils.logger import analysis_logger
+from utils.serialization import serializable
+from utils.task_graph import ExecutorTypes
+from config.messages import LogMessages
+
+
+DEFAULT_REPORT_DIRECTORY = 'rendered_reports'
+REPORT_FILE_NAME = 'department_{}.{}'
+# Formats rendered when none are requested, DOCX needs python-docx and is opt-in
+DEFAULT_REPORT_FORMATS = ('md', 'html')
+# Departments rendered by one worker task
+DEPARTMENTS_PER_TASK = 8
+
+# Renderers created in this process: (report format, docx template) to renderer
+_process_renderers = {}
+
+
+def _renderer(report_format, docx_template):
+    """
+    @brief Renderer of the format, created once per process
+
+    @param report_format: Key of RENDERERS
+    @param docx_template: Word template for DOCX reports
+    @return: Renderer instance
+    """
+    renderer_key = (report_format, docx_template)
+    if renderer_key not in _process_renderers:
+        _process_renderers[renderer_key] = create_renderer(report_format, docx_template)
+    return _process_renderers[renderer_key]
+
+
+def _render_reports(report_tasks, output_directory, report_formats, docx_template):
+    """
+    @brief Render reports of a chunk of departments
+    Module-level function so it can be sent to a process pool
+
+    @param report_tasks: List of (department_id, department_name, serialized results collection)
+    @param output_directory: Directory of report files
+    @param report_formats: Keys of RENDERERS
+    @param docx_template: Word template for DOCX reports
+    @return: List of written file paths
+    """
+    renderers = [_renderer(report_format, docx_template) for report_format in report_formats]
+    written_paths = []
+    for department_id, department_name, analysis_results_collection in report_tasks:
+        blocks = build_department_report(department_id, department_name, analysis_results_collection)
+        for renderer in renderers:
+            file_path = os.path.join(output_directory, REPORT_FILE_NAME.format(department_id,
+                                                                               renderer.FILE_EXTENSION))
+            renderer.render(blocks, file_path)
+            written_paths.append(file_path)
+    return written_paths
+
+
+class ReportRenderer:
+    """
+    @brief Render orchestrator results of many departments into report files
+    """
+
+    def __init__(self, output_directory=DEFAULT_REPORT_DIRECTORY, report_formats=DEFAULT_REPORT_FORMATS,
+                 max_workers=None, executor_type=ExecutorTypes.PROCESS, docx_template=None):
+        """
+        @brief Initialize renderer and check that all formats can be rendered
+
+        @param output_directory: Directory of report files
+        @param report_formats: Report formats, keys of reports.renderers.RENDERERS
+        @param max_workers: Number of rendering workers, executor default if not specified
+        @param executor_type: ExecutorTypes.PROCESS or ExecutorTypes.THREAD
+        @param docx_template: Word document whose styles are used by DOCX reports
+        """
+        for report_format in report_formats:
+            if report_format not in RENDERERS:
+                raise ValueError("Unknown report format: {}".format(report_format))
+            # Fails early when an optional rendering package is missing
+            create_renderer(report_format, docx_template)
+
+        self.output_directory = output_directory
+        self.report_formats = list(report_formats)
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.docx_template = docx_template
+        self.logger = analysis_logger.get_analysis_logger("ReportRenderer")
+
+    def render_all(self, department_results, department_names=None):
+        """
+        @brief Render reports of all departments
+
+        @param department_results: Dictionary of department_id to orchestrator analysis_results_collection
+        @param department_names: Dictionary of department_id to department name
+        @return: List of written file paths
+        """
+        started_at = time.perf_counter()
+        os.makedirs(self.output_directory, exist_ok=True)
+        department_names = department_names or {}
+        report_tasks = [
+            (department_id, department_names.get(department_id, ''), serializable(analysis_results_collection))
+            for department_id, analysis_results_collection in department_results.items()
+        ]
+        task_chunks = [report_tasks[position:position + DEPARTMENTS_PER_TASK]
+                       for position in range(0, len(report_tasks), DEPARTMENTS_PER_TASK)]
+        render_chunk = partial(_render_reports, output_directory=self.output_directory,
+                               report_formats=self.report_formats, docx_template=self.docx_template)
+
+        written_paths = []
+        try:
+            if len(task_chunks) <= 1:
+                # Starting a pool costs more than rendering a few reports
+                for task_chunk in task_chunks:
+                    written_paths.extend(render_chunk(task_chunk))
+            else:
+                executor_class = ProcessPoolExecutor if self.executor_type == ExecutorTypes.PROCESS \
+                    else ThreadPoolExecutor
+                with executor_class(max_workers=self.max_workers) as executor:
+                    for chunk_paths in executor.map(render_chunk, task_chunks):
+                        written_paths.extend(chunk_paths)
+        except Exception as render_error:
+            self.logger.error(LogMessages.REPORT_RENDER_ERROR.format(self.output_directory, str(render_error)))
+            raise render_error
+
+        self.logger.info(LogMessages.REPORTS_RENDERED.format(len(written_paths), len(report_tasks),
+                                                             self.output_directory,
+                                                             time.perf_counter() - started_at))
+        return written_paths
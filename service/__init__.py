@@ -0,0 +1,14 @@
+"""
+@brief Service package for commercial department analysis
+Contains the long-running HTTP analysis service
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'AnalysisService': 'service.analysis_service',
+    'run_service': 'service.analysis_service',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
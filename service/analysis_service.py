@@ -0,0 +1,384 @@
+"""
+@brief Long-running analysis service with a hot in-memory dataset
+Keeps the parsed company dataset and its indexes resident and answers per-department analysis
+requests as JSON over HTTP on localhost. The data file is watched and reloaded in the background,
+the new dataset replaces the old one in a single reference swap, so requests in flight finish
+with the snapshot they started with
+
+Endpoints:
+    GET /health                                   service and dataset state
+    GET /analyzers                                analyzer names
+    GET /departments                              department ids of the loaded dataset
+    GET /analysis/<analyzer>?department_id=<id>   analysis result of one department
+
+Usage: python main.py company.json --serve --port 8765
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from analyzers.registry import ANALYZER_MODULES, analyzer_class
+from dataset.company_dataset import CompanyDataset
+from utils.instrumentation import instrumentation
+from utils.logger import analysis_logger
+from utils.serialization import serializable
+from config.messages import LogMessages
+from config.helper_const import KpiSources, Departments
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Seconds between checks of the data file
+DEFAULT_RELOAD_INTERVAL = 2.0
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = 15.0
+MAX_HEADERS = 100
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+
+
+class ServiceError(Exception):
+    """
+    @brief Request error answered with HTTP status and message
+    """
+
+    def __init__(self, status, message):
+        """
+        @brief Initialize error
+
+        @param status: HTTP status code
+        @param message: Error description returned to the client
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def file_state(file_path):
+    """
+    @brief Modification time and size of a file, a change of either triggers reload
+
+    @param file_path: Watched file path
+    @return: Tuple of mtime in nanoseconds and size in bytes
+    """
+    file_stat = os.stat(file_path)
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+class DatasetSnapshot:
+    """
+    @brief Loaded dataset version with results computed on it
+    Results are valid as long as the snapshot is, so they are dropped together with it on reload
+    """
+
+    def __init__(self, dataset, version, source_state):
+        """
+        @brief Initialize snapshot
+
+        @param dataset: Loaded CompanyDataset
+        @param version: Sequential number of the snapshot
+        @param source_state: file_state() of the data file taken before loading
+        """
+        self.dataset = dataset
+        self.version = version
+        self.source_state = source_state
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        self.department_ids = [int(department_id) for department_id in dataset.department_ids()]
+        # (analyzer name, department_id): future of serialized result, shared by concurrent requests
+        self.results = {}
+
+
+class AnalysisService:
+    """
+    @brief asyncio HTTP service answering analysis requests from a resident dataset
+    Analyzers and dataset reloads run in thread pools, the event loop only parses requests and writes responses
+    """
+
+    def __init__(self, json_file_path, kpi_source=KpiSources.STORED, max_workers=None,
+                 reload_interval=DEFAULT_RELOAD_INTERVAL):
+        """
+        @brief Initialize service, the dataset is loaded by serve()
+
+        @param json_file_path: Path to company data JSON file
+        @param kpi_source: KpiSources.STORED to use exported kpi_metrics, KpiSources.DERIVED to recompute them
+        @param max_workers: Number of threads running analyzers, executor default if not specified
+        @param reload_interval: Seconds between checks of the data file
+        """
+        self.json_file_path = json_file_path
+        self.kpi_source = kpi_source
+        self.reload_interval = reload_interval
+        self.snapshot = None
+        self.server = None
+        self.logger = analysis_logger.get_analysis_logger("AnalysisService")
+        self._analysis_executor = ThreadPoolExecutor(max_workers, thread_name_prefix='analysis')
+        # Reload has its own thread, so a slow load never delays analyses of the current snapshot
+        self._reload_executor = ThreadPoolExecutor(1, thread_name_prefix='reload')
+        self._failed_state = None
+
+    def _load_snapshot(self, version):
+        """
+        @brief Load dataset and build its lazy indexes, runs in the reload thread
+
+        @param version: Version number of the new snapshot
+        @return: DatasetSnapshot
+        """
+        started_at = time.perf_counter()
+        source_state = file_state(self.json_file_path)
+        dataset = CompanyDataset(self.json_file_path, kpi_source=self.kpi_source)
+        dataset.language_matrix()
+        self.logger.info(LogMessages.SERVICE_DATASET_LOADED.format(version, self.json_file_path,
+                                                                   time.perf_counter() - started_at))
+        return DatasetSnapshot(dataset, version, source_state)
+
+    async def reload(self):
+        """
+        @brief Load the data file into a new snapshot and make it current
+        """
+        version = self.snapshot.version + 1 if self.snapshot else 1
+        snapshot = await asyncio.get_running_loop().run_in_executor(self._reload_executor,
+                                                                    self._load_snapshot, version)
+        self.snapshot = snapshot
+
+    async def _watch(self):
+        """
+        @brief Reload dataset whenever the data file changes
+        A file which failed to load is retried only after it changes again
+        """
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                current_state = file_state(self.json_file_path)
+            except OSError:
+                # File is being replaced, check again later
+                continue
+            if current_state in (self.snapshot.source_state, self._failed_state):
+                continue
+
+            try:
+                await self.reload()
+                self._failed_state = None
+            except Exception as reload_error:
+                self._failed_state = current_state
+                self.logger.error(LogMessages.SERVICE_RELOAD_ERROR.format(self.json_file_path, str(reload_error),
+                                                                          self.snapshot.version))
+
+    def _run_analyzer(self, dataset, analyzer_name, department_id):
+        """
+        @brief Execute analyzer for one department and serialize its result, runs in an analysis thread
+
+        @param dataset: CompanyDataset of the snapshot
+        @param analyzer_name: Key of ANALYZER_MODULES
+        @param department_id: Analyzed department
+        @return: JSON-compatible analysis result
+        """
+        analyzer = analyzer_class(analyzer_name)(self.json_file_path, dataset, department_id)
+        try:
+            return serializable(analyzer.execute_analysis(generate_report=False))
+        finally:
+            # Stage metrics are never exported by the service, they would accumulate with every request
+            instrumentation.reset()
+
+    async def analyze(self, analyzer_name, department_id):
+        """
+        @brief Analysis result of one department on the current snapshot
+        Equal concurrent requests share one computation, results are kept until the next reload
+
+        @param analyzer_name: Key of ANALYZER_MODULES
+        @param department_id: Analyzed department
+        @return: Response dictionary
+        """
+        snapshot = self.snapshot
+        if analyzer_name not in ANALYZER_MODULES:
+            raise ServiceError(404, "Unknown analyzer: {}".format(analyzer_name))
+        if department_id not in snapshot.department_ids:
+            raise ServiceError(404, "Unknown department: {}".format(department_id))
+
+        result_key = (analyzer_name, department_id)
+        result_future = snapshot.results.get(result_key)
+        if result_future is None:
+            result_future = asyncio.get_running_loop().run_in_executor(
+                self._analysis_executor, self._run_analyzer, snapshot.dataset, analyzer_name, department_id
+            )
+            snapshot.results[result_key] = result_future
+        try:
+            # Shield keeps the shared computation alive when one waiting client disconnects
+            result = await asyncio.shield(result_future)
+        except Exception:
+            snapshot.results.pop(result_key, None)
+            raise
+
+        return {
+            'analyzer': analyzer_name,
+            'department_id': department_id,
+            'dataset_version': snapshot.version,
+            'result': result,
+        }
+
+    async def handle_request(self, method, target):
+        """
+        @brief Route one request
+
+        @param method: HTTP method
+        @param target: Request target with path and query
+        @return: Tuple of HTTP status and response dictionary
+        """
+        try:
+            if method != 'GET':
+                raise ServiceError(405, "Only GET is supported")
+            url = urlsplit(target)
+            path_parts = [part for part in url.path.split('/') if part]
+            query = parse_qs(url.query)
+
+            if path_parts == ['health']:
+                snapshot = self.snapshot
+                return 200, {'status': 'ok', 'data_file': self.json_file_path,
+                             'dataset_version': snapshot.version, 'loaded_at': snapshot.loaded_at}
+            if path_parts == ['analyzers']:
+                return 200, {'analyzers': list(ANALYZER_MODULES)}
+            if path_parts == ['departments']:
+                return 200, {'dataset_version': self.snapshot.version, 'departments': self.snapshot.department_ids}
+            if len(path_parts) == 2 and path_parts[0] == 'analysis':
+                department_values = query.get('department_id', [Departments.COMMERCIAL])
+                try:
+                    department_id = int(department_values[0])
+                except ValueError:
+                    raise ServiceError(400, "department_id must be an integer")
+                return 200, await self.analyze(path_parts[1], department_id)
+            raise ServiceError(404, "Unknown path: {}".format(url.path))
+
+        except ServiceError as service_error:
+            return service_error.status, {'error': service_error.message}
+        except Exception as request_error:
+            self.logger.error(LogMessages.SERVICE_REQUEST_ERROR.format(target, str(request_error)))
+            return 500, {'error': str(request_error)}
+
+    async def _handle_connection(self, reader, writer):
+        """
+        @brief Serve HTTP/1.x requests of one connection, keep-alive connections are reused
+
+        @param reader: asyncio.StreamReader
+        @param writer: asyncio.StreamWriter
+        """
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+
+                request_parts = request_line.decode('latin-1').split()
+                headers = await self._read_headers(reader)
+                if len(request_parts) != 3:
+                    self._write_response(writer, 400, {'error': "Malformed request line"}, False)
+                    break
+                method, target, http_version = request_parts
+
+                # Request bodies are not used, but must be consumed to find the next request
+                content_length = headers.get('content-length', '0')
+                if not content_length.isdigit():
+                    self._write_response(writer, 400, {'error': "Malformed Content-Length header"}, False)
+                    break
+                content_length = int(content_length)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                status, payload = await self.handle_request(method, target)
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if http_version == 'HTTP/1.1' else connection == 'keep-alive'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _read_headers(reader):
+        """
+        @brief Read request headers up to the empty line
+
+        @param reader: asyncio.StreamReader
+        @return: Dictionary of lower-case header name to value
+        """
+        headers = {}
+        for _ in range(MAX_HEADERS):
+            header_line = await reader.readline()
+            if not header_line.strip():
+                return headers
+            name, _, value = header_line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError("Too many request headers")
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        """
+        @brief Write JSON response
+
+        @param writer: asyncio.StreamWriter
+        @param status: HTTP status code
+        @param payload: Response dictionary
+        @param keep_alive: Keep connection open for the next request
+        """
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        head = '\r\n'.join([
+            'HTTP/1.1 {} {}'.format(status, HTTP_REASONS[status]),
+            'Content-Type: application/json; charset=utf-8',
+            'Content-Length: {}'.format(len(body)),
+            'Connection: {}'.format('keep-alive' if keep_alive else 'close'),
+            '', '',
+        ])
+        writer.write(head.encode('latin-1') + body)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        @brief Load dataset, start watching the data file and serve requests until cancelled
+
+        @param host: Listening address, localhost by default
+        @param port: Listening port, 0 selects a free port
+        """
+        await self.reload()
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        bound_host, bound_port = self.server.sockets[0].getsockname()[:2]
+        self.logger.info(LogMessages.SERVICE_STARTED.format(bound_host, bound_port))
+
+        watcher = asyncio.create_task(self._watch())
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            watcher.cancel()
+            self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+            self._reload_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_service(json_file_path, host=DEFAULT_HOST, port=DEFAULT_PORT, kpi_source=KpiSources.STORED,
+                max_workers=None, reload_interval=DEFAULT_RELOAD_INTERVAL):
+    """
+    @brief Run analysis service in a new event loop until interrupted
+
+    @param json_file_path: Path to company data JSON file
+    @param host: Listening address
+    @param port: Listening port
+    @param kpi_source: KpiSources.STORED or KpiSources.DERIVED
+    @param max_workers: Number of threads running analyzers
+    @param reload_interval: Seconds between checks of the data file
+    """
+    analysis_service = AnalysisService(json_file_path, kpi_source, max_workers, reload_interval)
+    asyncio.run(analysis_service.serve(host, port))
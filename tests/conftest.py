@@ -0,0 +1,23 @@
+"""
+@brief Shared pytest setup
+Makes repository packages importable when tests are run from any directory
+"""
+
+import os
+import sys
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPOSITORY_DIRECTORY not in sys.path:
+    sys.path.insert(0, REPOSITORY_DIRECTORY)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    @brief Write queued log records while the captured console stream is still open
+
+    @param session: pytest Session
+    @param exitstatus: Exit status of the test run
+    """
+    logger_module = sys.modules.get('utils.logger')
+    if logger_module is not None:
+        logger_module.analysis_logger.shutdown()
@@ -0,0 +1,136 @@
+"""
+@brief Tests of per-department employee metric correlation
+"""
+
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+from dataset.correlation_engine import CorrelationEngine, EMPLOYEE_METRICS, DAYS_PER_YEAR
+
+REFERENCE_DATE = '2025-10-05'
+SAMPLE_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'company.json')
+
+
+def employees_table(department_ids):
+    """
+    @brief Employees table with reproducible random metrics
+
+    @param department_ids: Department of every employee
+    @return: DataFrame in the layout of CompanyDataset.employees
+    """
+    generator = np.random.default_rng(7)
+    employee_count = len(department_ids)
+    return pd.DataFrame({
+        'department_id': department_ids,
+        'salary': generator.normal(100000, 20000, employee_count),
+        'performance_score': generator.uniform(1, 5, employee_count),
+        'experience_years': generator.integers(0, 30, employee_count).astype(float),
+        'certifications': generator.integers(0, 6, employee_count).astype(float),
+        'hire_date': pd.Timestamp(REFERENCE_DATE) - pd.to_timedelta(generator.integers(30, 9000, employee_count),
+                                                                    unit='D'),
+    })
+
+
+def expected_correlations(employees):
+    """
+    @brief Per-department correlation matrices computed by DataFrame.corr
+
+    @param employees: Employees DataFrame with department_id, hire_date and metric columns
+    @return: DataFrame indexed by department_id and metric with one column per metric
+    """
+    metrics = employees[EMPLOYEE_METRICS[:-1]].astype(float)
+    metrics['tenure_years'] = (pd.Timestamp(REFERENCE_DATE) - pd.to_datetime(employees['hire_date'])).dt.days \
+        / DAYS_PER_YEAR
+    metrics['department_id'] = employees['department_id']
+    correlations = metrics.dropna(subset=['department_id']).groupby('department_id')[EMPLOYEE_METRICS].corr()
+    return correlations.rename_axis(['department_id', 'metric'])
+
+
+def assert_matches_pandas(correlation_engine, employees):
+    """
+    @brief Compare engine matrices with DataFrame.corr
+
+    @param correlation_engine: CorrelationEngine fed with the employees
+    @param employees: Employees DataFrame
+    """
+    pd.testing.assert_frame_equal(correlation_engine.correlation_matrices(), expected_correlations(employees),
+                                  check_index_type=False, rtol=1e-9, atol=1e-12)
+
+
+def test_sample_file_matches_dataframe_corr():
+    with open(SAMPLE_FILE_PATH, encoding='utf-8') as sample_file:
+        company = json.load(sample_file)
+    employees = pd.DataFrame([{
+        'department_id': employee['work_info']['department_id'],
+        'salary': employee['work_info']['salary'],
+        'performance_score': employee['work_info']['performance_score'],
+        'experience_years': employee['work_info'].get('experience_years'),
+        'certifications': employee.get('additional_info', {}).get('certifications', 0),
+        'hire_date': employee['work_info'].get('hire_date'),
+    } for employee in company['employees']])
+
+    correlation_engine, _ = CorrelationEngine.from_file(SAMPLE_FILE_PATH, logging.getLogger(__name__), REFERENCE_DATE)
+
+    assert_matches_pandas(correlation_engine, employees)
+    assert correlation_engine.person_counts.sum() == len(employees)
+
+
+def test_missing_metrics_are_deleted_pairwise_across_chunks():
+    employees = employees_table(np.repeat([3, 1, 2], [60, 50, 40]))
+    generator = np.random.default_rng(11)
+    for metric in ['salary', 'performance_score', 'experience_years']:
+        employees.loc[generator.random(len(employees)) < 0.2, metric] = np.nan
+    employees.loc[generator.random(len(employees)) < 0.2, 'hire_date'] = pd.NaT
+    correlation_engine = CorrelationEngine(REFERENCE_DATE)
+    correlation_engine.update_employees(employees, chunk_rows=7)
+
+    assert_matches_pandas(correlation_engine, employees)
+
+
+def test_departments_without_pairs_or_variation_are_nan():
+    employees = employees_table([1] * 30 + [2] + [3] * 20)
+    # Department 2 has one employee, department 3 knows no salary and has constant certifications
+    employees.loc[employees['department_id'] == 3, 'salary'] = np.nan
+    employees.loc[employees['department_id'] == 3, 'certifications'] = 2.0
+    correlation_engine = CorrelationEngine(REFERENCE_DATE)
+    correlation_engine.update_employees(employees, chunk_rows=16)
+
+    assert_matches_pandas(correlation_engine, employees)
+    assert correlation_engine.correlation_matrices().loc[2].isna().all().all()
+    assert correlation_engine.person_counts.tolist() == [30, 1, 20]
+
+
+def test_employee_without_department_is_skipped():
+    employees = employees_table([1.0] * 40 + [np.nan] + [2.0] * 30)
+    correlation_engine = CorrelationEngine(REFERENCE_DATE)
+    correlation_engine.update_employees(employees)
+
+    assert correlation_engine.department_ids == [1, 2]
+    assert correlation_engine.person_counts.tolist() == [40, 30]
+    expected_engine = CorrelationEngine(REFERENCE_DATE)
+    expected_engine.update_employees(employees.dropna(subset=['department_id']).astype({'department_id': int}))
+    pd.testing.assert_frame_equal(correlation_engine.correlation_matrices(),
+                                  expected_engine.correlation_matrices())
+    assert correlation_engine.correlation_matrices().shape == (2 * len(EMPLOYEE_METRICS), len(EMPLOYEE_METRICS))
+
+
+def test_streamed_employee_without_department_is_skipped():
+    correlation_engine = CorrelationEngine(REFERENCE_DATE)
+    for department_id, salary in [(1, 100.0), (None, 500.0), (1, 200.0)]:
+        correlation_engine.add_employee({'work_info': {'department_id': department_id, 'salary': salary,
+                                                       'performance_score': salary / 100,
+                                                       'hire_date': '2020-01-01'}})
+    correlation_engine.flush_employees()
+
+    assert correlation_engine.department_ids == [1]
+    assert correlation_engine.person_counts.tolist() == [2]
+
+
+def test_employee_without_department_matches_dataframe_corr():
+    employees = employees_table([1.0, np.nan] * 30 + [2.0] * 20)
+    correlation_engine = CorrelationEngine(REFERENCE_DATE)
+    correlation_engine.update_employees(employees, chunk_rows=9)
+
+    assert_matches_pandas(correlation_engine, employees)
@@ -0,0 +1,23 @@
+"""
+@brief Tests of employee x language matrix
+"""
+
+import numpy as np
+import pandas as pd
+from dataset.language_matrix import LanguageMatrix
+
+
+def test_employee_without_department_is_not_counted():
+    employees = pd.DataFrame({
+        'department_id': [1.0, 1.0, np.nan, 2.0],
+        'language_skills': [['Английский'], ['Английский', 'Немецкий'], ['Английский'], []],
+    })
+    language_matrix = LanguageMatrix(employees)
+
+    distribution = language_matrix.distribution()
+    expected = employees.dropna(subset=['department_id']).explode('language_skills').dropna() \
+        .groupby(['department_id', 'language_skills']).size().unstack(fill_value=0)
+    assert distribution.index.tolist() == [1, 2]
+    assert distribution.loc[1].to_dict() == expected.loc[1].to_dict()
+    assert distribution.loc[2].sum() == 0
+    assert language_matrix.department_counts(language_matrix.knows_any(['Английский'])).tolist() == [2, 0]
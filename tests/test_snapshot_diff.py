@@ -0,0 +1,92 @@
+"""
+@brief Tests of departments affected by changes between company snapshots
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from dataset.company_dataset import CompanyDataset
+from dataset.snapshot_diff import SnapshotDiff, SnapshotTables, SIGNATURE_KEYS, snapshot_signature
+
+SAMPLE_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'company.json')
+
+
+def signature(employees=None, projects=None):
+    """
+    @brief Snapshot signature with the given employee and project records, other tables are empty
+
+    @param employees: List of (employee_id, department_id, row_hash) tuples
+    @param projects: List of (project_id, department_id, row_hash) tuples
+    @return: Dictionary of signature table name to DataFrame
+    """
+    records = {SnapshotTables.EMPLOYEES: employees or [], SnapshotTables.PROJECTS: projects or []}
+    snapshot_signature_tables = {}
+    for table_name, key_columns in SIGNATURE_KEYS.items():
+        columns = list(dict.fromkeys(key_columns + ['department_id'])) + ['row_hash']
+        snapshot_signature_tables[table_name] = pd.DataFrame(records.get(table_name, []), columns=columns)
+    return snapshot_signature_tables
+
+
+def test_without_previous_snapshot_every_department_is_affected():
+    snapshot_diff = SnapshotDiff(None, signature([(1, 1, 10)]))
+
+    assert snapshot_diff.affected_departments == dict.fromkeys(SIGNATURE_KEYS)
+    assert snapshot_diff.departments_for([SnapshotTables.EMPLOYEES]) is None
+
+
+def test_identical_snapshots_affect_no_department():
+    employees = [(1, 1, 10), (2, 2, 20)]
+    snapshot_diff = SnapshotDiff(signature(employees), signature(employees))
+
+    assert snapshot_diff.changed_records[SnapshotTables.EMPLOYEES] == 0
+    assert snapshot_diff.departments_for(SIGNATURE_KEYS) == set()
+
+
+def test_added_removed_modified_and_moved_employees():
+    previous = signature([(1, 1, 10), (2, 2, 20), (3, 3, 30), (4, 4, 40), (5, 5, 50)])
+    # 2 modified, 3 moved to department 6, 4 removed, 7 added to department 8
+    current = signature([(1, 1, 10), (2, 2, 21), (3, 6, 31), (5, 5, 50), (7, 8, 70)])
+    snapshot_diff = SnapshotDiff(previous, current)
+
+    assert snapshot_diff.changed_records[SnapshotTables.EMPLOYEES] == 4
+    assert snapshot_diff.affected_departments[SnapshotTables.EMPLOYEES] == {2, 3, 4, 6, 8}
+    assert snapshot_diff.affected_departments[SnapshotTables.PROJECTS] == set()
+
+
+def test_project_moved_between_departments_affects_both():
+    previous = signature(projects=[(1, 1, 10), (2, 2, 20)])
+    current = signature(projects=[(1, 3, 11), (2, 2, 20)])
+    snapshot_diff = SnapshotDiff(previous, current)
+
+    assert snapshot_diff.affected_departments[SnapshotTables.PROJECTS] == {1, 3}
+    assert snapshot_diff.departments_for([SnapshotTables.EMPLOYEES, SnapshotTables.PROJECTS]) == {1, 3}
+
+
+def test_employee_without_department_affects_only_known_departments():
+    previous = signature([(1, 1, 10), (2, np.nan, 20), (3, np.nan, 30)])
+    # 2 modified without department, 3 joins department 4
+    current = signature([(1, 1, 10), (2, np.nan, 21), (3, 4, 31)])
+    snapshot_diff = SnapshotDiff(previous, current)
+
+    assert snapshot_diff.changed_records[SnapshotTables.EMPLOYEES] == 2
+    assert snapshot_diff.affected_departments[SnapshotTables.EMPLOYEES] == {4}
+
+
+def test_sample_snapshot_change_affects_department_of_changed_employee(tmp_path):
+    with open(SAMPLE_FILE_PATH, encoding='utf-8') as sample_file:
+        company = json.load(sample_file)
+    changed_employee = company['employees'][0]
+    changed_employee['work_info']['salary'] += 1000
+    changed_file_path = tmp_path / 'company.json'
+    changed_file_path.write_text(json.dumps(company, ensure_ascii=False), encoding='utf-8')
+
+    previous_signature = snapshot_signature(CompanyDataset(SAMPLE_FILE_PATH, use_cache=False))
+    current_signature = snapshot_signature(CompanyDataset(str(changed_file_path), use_cache=False))
+    snapshot_diff = SnapshotDiff(previous_signature, current_signature)
+
+    assert snapshot_diff.changed_records[SnapshotTables.EMPLOYEES] == 1
+    assert snapshot_diff.affected_departments[SnapshotTables.EMPLOYEES] == {
+        changed_employee['work_info']['department_id']
+    }
+    assert snapshot_diff.changed_records[SnapshotTables.EQUIPMENT] == 0
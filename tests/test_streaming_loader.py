@@ -0,0 +1,95 @@
+"""
+@brief Tests of the streaming company JSON reader against json.load
+"""
+
+import io
+import json
+import os
+import pytest
+from dataset.streaming_loader import StreamingJsonReader
+
+SAMPLE_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'company.json')
+
+# Small document with multibyte text, escapes, scalars and empty or non-array sections
+EDGE_DOCUMENT = json.dumps({
+    'metadata': {'company': 'Компания "Север"', 'version': 2},
+    'departments': [{'department_id': 1, 'department_name': 'Коммерческий\nотдел'}, None, 12345.678e-3],
+    'employees': [],
+    'projects': [[1, [2, [3]]], {'budget': 1e300, 'active': True}, 'проект', -0.0, 1234567890123],
+    'company_overview': 'summary',
+}, ensure_ascii=False, indent=1)
+
+
+def streamed_sections(text, chunk_size, max_value_chars=None):
+    """
+    @brief Stream document and collect records of every array section
+
+    @param text: JSON document
+    @param chunk_size: Characters read per chunk
+    @param max_value_chars: Characters one value may span, reader default if not specified
+    @return: Tuple of dictionary of section name to records and dictionary of record counts
+    """
+    sections = {}
+    handlers = {section_name: sections.setdefault(section_name, []).append
+                for section_name, value in json.loads(text).items() if isinstance(value, list)}
+    reader_arguments = {} if max_value_chars is None else {'max_value_chars': max_value_chars}
+    reader = StreamingJsonReader(io.StringIO(text), chunk_size=chunk_size, **reader_arguments)
+    return sections, reader.stream_sections(handlers)
+
+
+def array_sections(text):
+    """
+    @brief Array sections of the document decoded by json.loads
+
+    @param text: JSON document
+    @return: Dictionary of section name to records
+    """
+    return {section_name: value for section_name, value in json.loads(text).items() if isinstance(value, list)}
+
+
+@pytest.mark.parametrize('chunk_size', [7, 4096, 1024 * 1024])
+def test_sample_file_matches_json_load(chunk_size):
+    with open(SAMPLE_FILE_PATH, encoding='utf-8') as sample_file:
+        text = sample_file.read()
+    sections, record_counts = streamed_sections(text, chunk_size)
+
+    expected_sections = array_sections(text)
+    assert sections == expected_sections
+    assert record_counts == {section_name: len(records) for section_name, records in expected_sections.items()}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 64])
+def test_chunk_boundaries_match_json_loads(chunk_size):
+    sections, record_counts = streamed_sections(EDGE_DOCUMENT, chunk_size)
+
+    assert sections == array_sections(EDGE_DOCUMENT)
+    assert record_counts == {'departments': 3, 'employees': 0, 'projects': 5}
+
+
+def test_empty_document_has_no_sections():
+    assert StreamingJsonReader(io.StringIO(' { } '), chunk_size=1).stream_sections({}) == {}
+
+
+def test_oversize_value_reports_its_byte_offset():
+    prefix = '{"metadata": "Отчёт", "employees": [1, '
+    text = prefix + '"' + 'x' * 100 + '"]}'
+
+    with pytest.raises(ValueError, match='byte offset {} is not complete after 50 characters'.format(
+            len(prefix.encode('utf-8')))):
+        StreamingJsonReader(io.StringIO(text), chunk_size=8, max_value_chars=50).stream_sections({})
+
+
+def test_value_within_limit_is_read():
+    text = '{"employees": ["' + 'x' * 100 + '"]}'
+    sections, record_counts = streamed_sections(text, 8, max_value_chars=200)
+
+    assert sections == array_sections(text)
+    assert record_counts == {'employees': 1}
+
+
+@pytest.mark.parametrize('text', ['{"employees": [1, 2', '{"employees": [1 2]}', '{"employees": [1, ]}'])
+def test_corrupt_document_is_rejected_like_json_loads(text):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    with pytest.raises(ValueError):
+        StreamingJsonReader(io.StringIO(text), chunk_size=3).stream_sections({})
@@ -0,0 +1,31 @@
+"""
+@brief Utilities package for Commercial Department analysis
+Contains logging and helper functionality
+"""
+
+from utils.lazy_exports import lazy_exports
+
+# Exported name: module defining it
+_EXPORTS = {
+    'AnalysisLogger': 'utils.logger',
+    'analysis_logger': 'utils.logger',
+    'configure_worker_logging': 'utils.logger',
+    'TaskGraph': 'utils.task_graph',
+    'ExecutorTypes': 'utils.task_graph',
+    'StageStatus': 'utils.task_graph',
+    'Instrumentation': 'utils.instrumentation',
+    'instrumentation': 'utils.instrumentation',
+    'measured_stage': 'utils.instrumentation',
+    'AnalysisProfiler': 'utils.profiler',
+    'lazy_exports': 'utils.lazy_exports',
+    'serializable': 'utils.serialization',
+    'ResultSink': 'utils.result_sink',
+    'JsonLinesSink': 'utils.result_sink',
+    'ParquetSink': 'utils.result_sink',
+    'ConsoleSummarySink': 'utils.result_sink',
+    'MultiSink': 'utils.result_sink',
+    'result_record': 'utils.result_sink',
+    'table_records': 'utils.result_sink',
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -1,11 +0,0 @@
-"""
-@brief Utilities package for Commercial Department analysis
-Contains logging and helper functionality
-"""
-
-from logger import AnalysisLogger, analysis_logger
-
-__all__ = [
-    'AnalysisLogger',
-    'analysis_logger'
-]
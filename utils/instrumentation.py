@@ -0,0 +1,315 @@
+"""
+@brief Per-stage timing and memory instrumentation for commercial department analysis
+Records wall time, CPU time, memory and processed rows of analysis stages and exports them
+as JSON summary and Prometheus textfile
+"""
+
+import functools
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+METRIC_PREFIX = 'commercial_analysis'
+JSON_SUMMARY_FILE_NAME = 'analysis_metrics.json'
+PROMETHEUS_FILE_NAME = 'analysis_metrics.prom'
+ALL_DEPARTMENTS = 'all'
+# Stage records kept in memory, the oldest ones are dropped by long-running processes
+MAX_STAGE_RECORDS = 10000
+
+# Prometheus metric name suffix, help text and stage record field
+PROMETHEUS_STAGE_METRICS = [
+    ('stage_wall_seconds', 'Wall time of analysis stage', 'wall_seconds'),
+    ('stage_cpu_seconds', 'CPU time of analysis stage thread', 'cpu_seconds'),
+    ('stage_max_rss_bytes', 'Process max resident set size at the end of analysis stage', 'max_rss_bytes'),
+    ('stage_max_rss_growth_bytes', 'Growth of process max resident set size during analysis stage',
+     'max_rss_growth_bytes'),
+    ('stage_peak_traced_bytes', 'Peak traced Python heap during analysis stage', 'peak_traced_bytes'),
+    ('stage_rows', 'Rows processed by analysis stage', 'rows'),
+]
+
+
+def max_rss_bytes():
+    """
+    @brief Peak resident set size of the process
+
+    @return: Bytes or None where resource module is unavailable
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss if platform.system() == 'Darwin' else max_rss * 1024
+
+
+class StageMetrics:
+    """
+    @brief Measurements of one executed stage
+    """
+
+    def __init__(self, component, stage, department_id=None):
+        """
+        @brief Initialize empty stage measurements
+
+        @param component: Analyzer or orchestrator name
+        @param stage: Stage name
+        @param department_id: Analyzed department, None for stages not bound to a department
+        """
+        self.component = component
+        self.stage = stage
+        self.department_id = department_id
+        self.started_at = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.max_rss_bytes = None
+        self.max_rss_growth_bytes = None
+        self.peak_traced_bytes = None
+        self.rows = None
+        self.failed = False
+
+    def to_dict(self):
+        """
+        @brief Convert measurements into JSON-serializable dictionary
+
+        @return: Dictionary of measurement values
+        """
+        return {
+            'component': self.component,
+            'stage': self.stage,
+            'department_id': self.department_id,
+            'started_at': self.started_at,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'max_rss_bytes': self.max_rss_bytes,
+            'max_rss_growth_bytes': self.max_rss_growth_bytes,
+            'peak_traced_bytes': self.peak_traced_bytes,
+            'rows': self.rows,
+            'failed': self.failed,
+        }
+
+
+class Instrumentation:
+    """
+    @brief Thread-safe collector of stage measurements
+    Process max RSS is a high-water mark, so its growth during a stage is recorded as the memory
+    the stage added on top of all previous peaks.
+    Traced heap peak is only measured when memory tracing is enabled, because tracemalloc slows
+    allocations down. The peak is reset at every stage start and end and folded into all running stages,
+    so nested stages get their own peaks. Concurrent stages share it, so it is an upper bound for each of them.
+    At most MAX_STAGE_RECORDS latest stages are kept
+    """
+
+    def __init__(self):
+        """
+        @brief Initialize empty collector
+        """
+        self.stages = deque(maxlen=MAX_STAGE_RECORDS)
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self._lock = threading.Lock()
+        self._active_stages = []
+
+    def enable_memory_tracing(self):
+        """
+        @brief Start tracemalloc so stages record their traced heap peak
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def reset(self):
+        """
+        @brief Drop collected measurements
+        """
+        with self._lock:
+            self.stages.clear()
+
+    def merge(self, stage_records):
+        """
+        @brief Add stages measured in another process
+
+        @param stage_records: Iterable of StageMetrics
+        """
+        with self._lock:
+            self.stages.extend(stage_records)
+
+    @contextmanager
+    def measure(self, component, stage, department_id=None):
+        """
+        @brief Measure code block as one stage
+
+        @param component: Analyzer or orchestrator name
+        @param stage: Stage name
+        @param department_id: Analyzed department, None for stages not bound to a department
+        @return: Context manager yielding StageMetrics, rows can be set inside the block
+        """
+        stage_metrics = StageMetrics(component, stage, department_id)
+        tracing = tracemalloc.is_tracing()
+        with self._lock:
+            if tracing:
+                self._fold_traced_peak()
+                stage_metrics.peak_traced_bytes = tracemalloc.get_traced_memory()[0]
+            self._active_stages.append(stage_metrics)
+
+        stage_metrics.started_at = datetime.now().isoformat(timespec='milliseconds')
+        started_max_rss = max_rss_bytes()
+        wall_started_at = time.perf_counter()
+        cpu_started_at = time.thread_time()
+        try:
+            yield stage_metrics
+        except Exception:
+            stage_metrics.failed = True
+            raise
+        finally:
+            stage_metrics.wall_seconds = time.perf_counter() - wall_started_at
+            stage_metrics.cpu_seconds = time.thread_time() - cpu_started_at
+            stage_metrics.max_rss_bytes = max_rss_bytes()
+            if started_max_rss is not None:
+                stage_metrics.max_rss_growth_bytes = stage_metrics.max_rss_bytes - started_max_rss
+            with self._lock:
+                if tracing:
+                    self._fold_traced_peak()
+                self._active_stages.remove(stage_metrics)
+                self.stages.append(stage_metrics)
+
+    def _fold_traced_peak(self):
+        """
+        @brief Merge traced peak since the last reset into running stages and reset it, called under lock
+        """
+        peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+        for stage_metrics in self._active_stages:
+            stage_metrics.peak_traced_bytes = max(stage_metrics.peak_traced_bytes or 0, peak_traced_bytes)
+        tracemalloc.reset_peak()
+
+    def summary(self):
+        """
+        @brief Build structured summary of collected measurements
+
+        @return: JSON-serializable dictionary
+        """
+        with self._lock:
+            stages = [stage_metrics.to_dict() for stage_metrics in self.stages]
+        return {
+            'created_at': self.created_at,
+            'exported_at': datetime.now().isoformat(timespec='seconds'),
+            'max_rss_bytes': max_rss_bytes(),
+            'stages': stages,
+        }
+
+    def write_json(self, file_path):
+        """
+        @brief Write structured summary as JSON file
+
+        @param file_path: Target file path
+        """
+        self._write_atomically(file_path, json.dumps(self.summary(), indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, file_path):
+        """
+        @brief Write measurements in Prometheus text exposition format
+        File is replaced atomically, as required by node_exporter textfile collector
+
+        @param file_path: Target file path, should end with .prom
+        """
+        summary = self.summary()
+        lines = []
+        for metric_suffix, help_text, field in PROMETHEUS_STAGE_METRICS:
+            metric_name = '{}_{}'.format(METRIC_PREFIX, metric_suffix)
+            lines.append('# HELP {} {}'.format(metric_name, help_text))
+            lines.append('# TYPE {} gauge'.format(metric_name))
+            # Latest measurement wins when a stage of the same department was executed several times
+            samples = {}
+            for stage_metrics in summary['stages']:
+                if stage_metrics[field] is None:
+                    continue
+                labels = self._labels(stage_metrics)
+                samples[labels] = stage_metrics[field]
+            lines.extend('{}{{{}}} {}'.format(metric_name, labels, value) for labels, value in samples.items())
+
+        lines.append('# HELP {}_max_rss_bytes Process max resident set size'.format(METRIC_PREFIX))
+        lines.append('# TYPE {}_max_rss_bytes gauge'.format(METRIC_PREFIX))
+        lines.append('{}_max_rss_bytes {}'.format(METRIC_PREFIX, summary['max_rss_bytes'] or 0))
+        lines.append('# HELP {}_last_export_timestamp_seconds Unix time of metrics export'.format(METRIC_PREFIX))
+        lines.append('# TYPE {}_last_export_timestamp_seconds gauge'.format(METRIC_PREFIX))
+        lines.append('{}_last_export_timestamp_seconds {:.0f}'.format(METRIC_PREFIX, time.time()))
+        self._write_atomically(file_path, '\n'.join(lines) + '\n')
+
+    def export(self, directory):
+        """
+        @brief Write JSON summary and Prometheus textfile into directory
+
+        @param directory: Target directory
+        @return: Tuple of JSON summary path and Prometheus textfile path
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, JSON_SUMMARY_FILE_NAME)
+        prometheus_path = os.path.join(directory, PROMETHEUS_FILE_NAME)
+        self.write_json(json_path)
+        self.write_prometheus(prometheus_path)
+        return json_path, prometheus_path
+
+    @staticmethod
+    def _labels(stage_metrics):
+        """
+        @brief Format Prometheus labels of stage measurement
+
+        @param stage_metrics: Stage measurement dictionary
+        @return: Label string without braces
+        """
+        department_id = stage_metrics['department_id']
+        label_values = [
+            ('component', stage_metrics['component']),
+            ('stage', stage_metrics['stage']),
+            ('department', ALL_DEPARTMENTS if department_id is None else department_id),
+        ]
+        return ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+                                         .replace('\n', '\\n'))
+                        for name, value in label_values)
+
+    @staticmethod
+    def _write_atomically(file_path, content):
+        """
+        @brief Write file through temporary file and rename
+
+        @param file_path: Target file path
+        @param content: Text content
+        """
+        temporary_path = file_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as output_file:
+            output_file.write(content)
+        os.replace(temporary_path, file_path)
+
+
+def measured_stage(stage, rows=None, department=True):
+    """
+    @brief Decorator measuring analyzer method as one stage labelled with analyzer class name
+
+    @param stage: Stage name
+    @param rows: Callable (analyzer, result) returning processed rows
+    @param department: Label measurement with analyzer department_id
+    @return: Method decorator
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(analyzer, *args, **kwargs):
+            department_id = analyzer.department_id if department else None
+            with instrumentation.measure(type(analyzer).__name__, stage, department_id) as stage_metrics:
+                result = method(analyzer, *args, **kwargs)
+                if rows is not None:
+                    stage_metrics.rows = rows(analyzer, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# Global instrumentation instance
+instrumentation = Instrumentation()
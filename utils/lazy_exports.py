@@ -0,0 +1,23 @@
+"""
+@brief Lazy package exports
+Package __init__ modules export names of their modules without importing them,
+so importing one module of a package does not load the others and their dependencies
+"""
+
+import importlib
+
+
+def lazy_exports(package_name, exports):
+    """
+    @brief Build __all__ and module-level __getattr__ of a package
+
+    @param package_name: __name__ of the package
+    @param exports: Dictionary of exported name to module defining it
+    @return: Tuple of __all__ list and __getattr__ function importing exported name on first access
+    """
+    def package_getattr(name):
+        if name not in exports:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package_name, name))
+        return getattr(importlib.import_module(exports[name]), name)
+
+    return list(exports), package_getattr
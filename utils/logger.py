@@ -1,87 +1,309 @@
-"""
-@brief Custom logger configuration for Commercial Department Analysis
-Provides centralized logging functionality with file handlers
-"""
-
-import logging
-import os
-from datetime import datetime
-from config.messages import LogMessages
-
-
-class AnalysisLogger:
-    """
-    @brief Custom logger class for analysis operations
-    Handles log file creation and management for different analysis types
-    """
-
-    def __init__(self, log_directory="logs"):
-        """
-        @brief Initialize the analysis logger
-        Creates log directory and configures logging handlers
-
-        @param log_directory: Directory to store log files
-        """
-        self.log_directory = log_directory
-        self._ensure_log_directory()
-        self._configure_root_logger()
-
-    def _ensure_log_directory(self):
-        """
-        @brief Create log directory if it doesn't exist
-        Ensures proper directory structure for log files
-        """
-        try:
-            if not os.path.exists(self.log_directory):
-                os.makedirs(self.log_directory)
-        except Exception as error:
-            print(f"Error creating log directory: {error}")
-
-    def _configure_root_logger(self):
-        """
-        @brief Configure root logger with basic settings
-        Sets up logging format and level for all loggers
-        """
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-    def get_analysis_logger(self, analysis_name):
-        """
-        @brief Create and configure a dedicated logger for specific analysis
-        Each analysis gets its own log file and logger instance
-
-        @param analysis_name: Name of the analysis for log file naming
-        @return: Configured logger instance
-        """
-        logger = logging.getLogger(analysis_name)
-        logger.setLevel(logging.INFO)
-
-        # Remove existing handlers to avoid duplicates
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
-        # Create file handler for this analysis
-        log_filename = f"{analysis_name.lower()}_{datetime.now().strftime('%Y%m%d')}.log"
-        log_filepath = os.path.join(self.log_directory, log_filename)
-
-        try:
-            file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(formatter)
-
-            logger.addHandler(file_handler)
-        except Exception as error:
-            print(f"Error creating log file handler: {error}")
-
-        return logger
-
-
-# Global logger instance
-analysis_logger = AnalysisLogger()
+"""
+@brief Custom logger configuration for Commercial Department Analysis
+Provides centralized non-blocking logging: analyzers only put records into a queue,
+one background writer formats them and writes per-analysis log files and console output in batches
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler
+
+
+FILE_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Records written between two flushes of file handlers
+MAX_BATCH_SIZE = 512
+
+_STOP = 'stop'
+
+
+class _FlushRequest:
+    """
+    @brief Queue marker asking the writer to flush and report completion
+    """
+
+    def __init__(self):
+        """
+        @brief Initialize completion event
+        """
+        self.done = threading.Event()
+
+
+class BatchedFileHandler(logging.FileHandler):
+    """
+    @brief File handler which does not flush after every record
+    The writer thread flushes it once per batch
+    """
+
+    def flush(self):
+        """
+        @brief Skip per-record flush, batches are flushed by flush_batch
+        """
+
+    def flush_batch(self):
+        """
+        @brief Flush written records to disk
+        """
+        logging.FileHandler.flush(self)
+
+    def close(self):
+        """
+        @brief Flush pending records and close the file
+        """
+        self.flush_batch()
+        logging.FileHandler.close(self)
+
+
+class _LogWriter:
+    """
+    @brief Background writer routing queued records to per-analysis files and console
+    Handlers are only touched by the writer thread, so they need no cross-thread locking
+    """
+
+    def __init__(self, log_directory, log_queue):
+        """
+        @brief Initialize writer state
+
+        @param log_directory: Directory of log files
+        @param log_queue: Queue with log records
+        """
+        self.log_directory = log_directory
+        self.log_queue = log_queue
+        self.file_handlers = {}
+        self.console_handler = logging.StreamHandler(sys.stderr)
+        self.console_handler.setFormatter(logging.Formatter(CONSOLE_LOG_FORMAT, CONSOLE_DATE_FORMAT))
+        self.thread = threading.Thread(target=self._run, name='AnalysisLogWriter', daemon=True)
+
+    def _run(self):
+        """
+        @brief Write records batch by batch until stop marker is received
+        """
+        running = True
+        while running:
+            batch = [self.log_queue.get()]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self.log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flush_requests = []
+            for item in batch:
+                if item == _STOP:
+                    running = False
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    self._write(item)
+
+            self._flush()
+            for flush_request in flush_requests:
+                flush_request.done.set()
+
+        for file_handler in self.file_handlers.values():
+            file_handler.close()
+
+    def _write(self, record):
+        """
+        @brief Write one record to its analysis file and console
+
+        @param record: LogRecord
+        """
+        try:
+            file_handler = self._file_handler(record.name)
+            if file_handler is not None:
+                file_handler.handle(record)
+            self.console_handler.handle(record)
+        except Exception:
+            self.console_handler.handleError(record)
+
+    def _file_handler(self, analysis_name):
+        """
+        @brief Get file handler of the analysis, the file is opened on first record
+
+        @param analysis_name: Logger name
+        @return: BatchedFileHandler or None if the file cannot be opened
+        """
+        if analysis_name not in self.file_handlers:
+            log_filename = f"{analysis_name.lower()}_{datetime.now().strftime('%Y%m%d')}.log"
+            log_filepath = os.path.join(self.log_directory, log_filename)
+            try:
+                file_handler = BatchedFileHandler(log_filepath, encoding='utf-8')
+                file_handler.setFormatter(logging.Formatter(FILE_LOG_FORMAT))
+            except Exception as error:
+                print(f"Error creating log file handler: {error}")
+                file_handler = None
+            self.file_handlers[analysis_name] = file_handler
+        return self.file_handlers[analysis_name]
+
+    def _flush(self):
+        """
+        @brief Flush all files and console after a batch
+        """
+        for file_handler in self.file_handlers.values():
+            if file_handler is not None:
+                file_handler.flush_batch()
+        self.console_handler.flush()
+
+
+def _forward_process_records(process_queue, log_queue):
+    """
+    @brief Move records sent by worker processes into the writer queue
+
+    @param process_queue: multiprocessing queue filled by worker processes
+    @param log_queue: Queue of the writer thread
+    """
+    while True:
+        record = process_queue.get()
+        if record == _STOP:
+            break
+        log_queue.put(record)
+
+
+def configure_worker_logging(process_queue):
+    """
+    @brief Send log records of a worker process to the parent writer
+    Used as ProcessPoolExecutor initializer, works for forked and spawned workers
+
+    @param process_queue: Queue returned by AnalysisLogger.process_queue
+    """
+    analysis_logger.forward_to(process_queue)
+
+    # Loggers unpickled in spawned workers are fresh and propagate to root
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(process_queue))
+    root_logger.setLevel(logging.INFO)
+
+
+class AnalysisLogger:
+    """
+    @brief Custom logger class for analysis operations
+    Handles log file creation and management for different analysis types,
+    logging calls only enqueue records and never wait for file or console I/O
+    """
+
+    def __init__(self, log_directory="logs"):
+        """
+        @brief Initialize the analysis logger
+        Creates log directory and the shared queue, the writer thread starts with the first logger
+
+        @param log_directory: Directory to store log files
+        """
+        self.log_directory = log_directory
+        self._ensure_log_directory()
+        self.log_queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(self.log_queue)
+        self._writer = None
+        self._forwarding = False
+        self._process_queue = None
+        self._forwarder = None
+        self._lock = threading.Lock()
+
+    def _ensure_log_directory(self):
+        """
+        @brief Create log directory if it doesn't exist
+        Ensures proper directory structure for log files
+        """
+        try:
+            if not os.path.exists(self.log_directory):
+                os.makedirs(self.log_directory)
+        except Exception as error:
+            print(f"Error creating log directory: {error}")
+
+    def _ensure_writer(self):
+        """
+        @brief Start background writer once per process
+        """
+        with self._lock:
+            if self._writer is None and not self._forwarding:
+                self._writer = _LogWriter(self.log_directory, self.log_queue)
+                self._writer.thread.start()
+                atexit.register(self.shutdown)
+
+    def get_analysis_logger(self, analysis_name):
+        """
+        @brief Create and configure a dedicated logger for specific analysis
+        Each analysis gets its own log file, records reach it through the shared queue
+
+        @param analysis_name: Name of the analysis for log file naming
+        @return: Configured logger instance
+        """
+        self._ensure_writer()
+
+        logger = logging.getLogger(analysis_name)
+        logger.setLevel(logging.INFO)
+        # Records are written by the queue writer only, root handlers would write them twice
+        logger.propagate = False
+
+        # Remove existing handlers to avoid duplicates
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(self.queue_handler)
+
+        return logger
+
+    def process_queue(self):
+        """
+        @brief Queue for records of worker processes, created with its forwarding thread on first use
+
+        @return: multiprocessing queue to pass to configure_worker_logging
+        """
+        self._ensure_writer()
+        with self._lock:
+            if self._process_queue is None:
+                self._process_queue = multiprocessing.Queue()
+                self._forwarder = threading.Thread(target=_forward_process_records,
+                                                   args=(self._process_queue, self.log_queue),
+                                                   name='AnalysisLogForwarder', daemon=True)
+                self._forwarder.start()
+        return self._process_queue
+
+    def forward_to(self, process_queue):
+        """
+        @brief Send records of this worker process to the writer of the parent process
+
+        @param process_queue: Queue returned by process_queue() in the parent process
+        """
+        self._forwarding = True
+        self.queue_handler.queue = process_queue
+
+    def flush(self, timeout=None):
+        """
+        @brief Wait until records queued so far are written
+
+        @param timeout: Maximal wait in seconds, unlimited if not specified
+        @return: True if records were written in time
+        """
+        if self._forwarding or self._writer is None or not self._writer.thread.is_alive():
+            return True
+        flush_request = _FlushRequest()
+        self.log_queue.put(flush_request)
+        return flush_request.done.wait(timeout)
+
+    def shutdown(self):
+        """
+        @brief Write remaining records and stop background threads
+        """
+        with self._lock:
+            if self._forwarder is not None:
+                self._process_queue.put(_STOP)
+                self._forwarder.join()
+                self._forwarder = None
+            if self._writer is not None:
+                self.log_queue.put(_STOP)
+                self._writer.thread.join()
+                self._writer = None
+
+
+# Global logger instance
+analysis_logger = AnalysisLogger()
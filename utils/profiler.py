@@ -0,0 +1,374 @@
+"""
+@brief Deep profiling of analysis stages
+Captures a CPU profile and allocation snapshots per stage and writes them into a per-run directory:
+pstats dump, text report, collapsed stacks for flamegraph tools, speedscope JSON and allocation report.
+Allocation report lists both memory left after the stage and memory alive close to its peak, the latter
+also shows temporary copies released before the stage ends
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+PROFILE_DIRECTORY = 'profiles'
+TRACEBACK_FRAMES = 10
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+# Traced heap polling interval of the peak snapshot sampler
+PEAK_SAMPLE_SECONDS = 0.01
+# Peak snapshot is retaken when traced heap grew by this share since the previous one
+PEAK_SNAPSHOT_GROWTH = 0.1
+# Stacks contributing less than this share of stage time are dropped from flame graphs
+MIN_STACK_SHARE = 0.0005
+MAX_STACK_DEPTH = 128
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+# Repository root, allocations are attributed to frames below it wherever the process was started
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+def _frame_name(function_key):
+    """
+    @brief Format pstats function key as a frame name
+
+    @param function_key: Tuple of file name, line number and function name
+    @return: Frame name string
+    """
+    file_name, line_number, function_name = function_key
+    if file_name == '~':
+        return function_name
+    return '{} ({}:{})'.format(function_name, os.path.basename(file_name), line_number)
+
+
+def collapsed_stacks(profile_stats):
+    """
+    @brief Reconstruct weighted call stacks from caller-callee statistics
+    cProfile keeps only caller-callee edges, so time of a function is split between its callers
+    proportionally to the cumulative time of every edge
+
+    @param profile_stats: pstats.Stats instance
+    @return: Dictionary of stack tuple (root first) to self time in seconds
+    """
+    statistics = profile_stats.stats
+    callees = {}
+    for function_key, (_, _, _, _, callers) in statistics.items():
+        for caller_key in callers:
+            callees.setdefault(caller_key, []).append(function_key)
+
+    roots = [function_key for function_key, (_, _, _, _, callers) in statistics.items()
+             if not any(caller_key in statistics for caller_key in callers)]
+    total_time = sum(statistics[function_key][3] for function_key in roots) or 1.0
+    min_time = total_time * MIN_STACK_SHARE
+
+    stacks = {}
+
+    def walk(function_key, stack, share):
+        _, _, own_time, cumulative_time, _ = statistics[function_key]
+        if own_time * share > 0:
+            stacks[stack] = stacks.get(stack, 0.0) + own_time * share
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee_key in callees.get(function_key, []):
+            if callee_key in stack:
+                continue
+            callee_cumulative_time = statistics[callee_key][3]
+            edge_cumulative_time = statistics[callee_key][4][function_key][3]
+            if callee_cumulative_time <= 0 or edge_cumulative_time * share < min_time:
+                continue
+            walk(callee_key, stack + (callee_key,), share * edge_cumulative_time / callee_cumulative_time)
+
+    for root_key in roots:
+        walk(root_key, (root_key,), 1.0)
+    return stacks
+
+
+def _allocation_frame(traceback):
+    """
+    @brief Pick the most recent frame of repository code, allocations inside libraries are attributed to it
+
+    @param traceback: tracemalloc.Traceback sorted from oldest to most recent frame
+    @return: tracemalloc.Frame or None for empty traceback
+    """
+    for frame in reversed(traceback):
+        if os.path.abspath(frame.filename).startswith(PROJECT_DIRECTORY):
+            return frame
+    return traceback[-1] if len(traceback) else None
+
+
+class PeakSnapshotSampler:
+    """
+    @brief Background thread taking a tracemalloc snapshot close to the traced heap peak
+    tracemalloc keeps only the peak size, so the heap size is polled and a snapshot is taken every time
+    it grows past the previous one. Copies living shorter than PEAK_SAMPLE_SECONDS can still be missed.
+    Snapshots are traced too, so the peak is tracked here without the memory of the kept snapshot
+    """
+
+    def __init__(self):
+        """
+        @brief Start polling, tracemalloc must be tracing and its peak reset
+        """
+        self.snapshot = None
+        self.snapshot_bytes = tracemalloc.get_traced_memory()[0]
+        self.peak_bytes = self.snapshot_bytes
+        self._snapshot_overhead = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._poll, name='PeakSnapshotSampler', daemon=True)
+        self._thread.start()
+
+    def _poll(self):
+        """
+        @brief Snapshot traced heap whenever it grew by PEAK_SNAPSHOT_GROWTH
+        """
+        while not self._stopped.wait(PEAK_SAMPLE_SECONDS):
+            if tracemalloc.get_traced_memory()[0] - self._snapshot_overhead \
+                    > self.snapshot_bytes * (1 + PEAK_SNAPSHOT_GROWTH):
+                self._update_peak()
+                # Previous snapshot is released first, so it does not count towards the next one
+                self.snapshot = None
+                self.snapshot_bytes = tracemalloc.get_traced_memory()[0]
+                self.snapshot = tracemalloc.take_snapshot()
+                self._snapshot_overhead = tracemalloc.get_traced_memory()[0] - self.snapshot_bytes
+                # Peak of taking the snapshot is not a peak of the stage
+                tracemalloc.reset_peak()
+
+    def _update_peak(self):
+        """
+        @brief Merge traced peak since the last snapshot into peak_bytes
+        """
+        self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1] - self._snapshot_overhead)
+
+    def stop(self):
+        """
+        @brief Stop polling
+
+        @return: Snapshot closest to the peak or None if the heap never grew enough
+        """
+        self._stopped.set()
+        self._thread.join()
+        self._update_peak()
+        return self.snapshot
+
+
+class AnalysisProfiler:
+    """
+    @brief Per-run profiler writing one set of reports per profiled stage
+    Allocation snapshots are process-wide, so stages should run one at a time while profiling
+    """
+
+    def __init__(self, base_directory=PROFILE_DIRECTORY, run_name=None):
+        """
+        @brief Create run directory
+
+        @param base_directory: Directory holding all profiling runs
+        @param run_name: Name of run directory, current timestamp if not specified.
+                         A counter suffix is appended when the directory already exists
+        """
+        self.run_directory = self._create_run_directory(base_directory,
+                                                        run_name or datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.stages = []
+
+    @staticmethod
+    def _create_run_directory(base_directory, run_name):
+        """
+        @brief Create a new run directory, runs started in the same second get numbered suffixes
+
+        @param base_directory: Directory holding all profiling runs
+        @param run_name: Preferred name of run directory
+        @return: Path of the created directory
+        """
+        os.makedirs(base_directory, exist_ok=True)
+        run_directory = os.path.join(base_directory, run_name)
+        run_number = 1
+        while True:
+            try:
+                # Creation fails instead of reusing a directory of a concurrent run
+                os.mkdir(run_directory)
+                return run_directory
+            except FileExistsError:
+                run_number += 1
+                run_directory = os.path.join(base_directory, '{}_{}'.format(run_name, run_number))
+
+    @contextmanager
+    def profile(self, stage_name):
+        """
+        @brief Profile code block as one stage
+
+        @param stage_name: Stage name used in report file names
+        @return: Context manager
+        """
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEBACK_FRAMES)
+        start_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        peak_sampler = PeakSnapshotSampler()
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            peak_snapshot = peak_sampler.stop()
+            peak_memory = peak_sampler.peak_bytes
+            end_snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._write_stage(stage_name, profile, start_snapshot, end_snapshot, peak_snapshot, peak_memory)
+
+    def _write_stage(self, stage_name, profile, start_snapshot, end_snapshot, peak_snapshot, peak_memory):
+        """
+        @brief Write all reports of one stage
+
+        @param stage_name: Stage name
+        @param profile: Disabled cProfile.Profile
+        @param start_snapshot: tracemalloc snapshot taken before the stage
+        @param end_snapshot: tracemalloc snapshot taken after the stage
+        @param peak_snapshot: tracemalloc snapshot taken close to the peak or None
+        @param peak_memory: Peak traced memory in bytes
+        """
+        file_prefix = os.path.join(self.run_directory, stage_name)
+        profile_stats = pstats.Stats(profile)
+        profile_stats.dump_stats(file_prefix + '.pstats')
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        with open(file_prefix + '.txt', 'w', encoding='utf-8') as report_file:
+            report_file.write(report.getvalue())
+
+        stacks = collapsed_stacks(profile_stats)
+        self._write_collapsed(file_prefix + '.collapsed', stacks)
+        self._write_speedscope(file_prefix + '.speedscope.json', stage_name, stacks)
+        allocations, peak_allocations = self._write_allocations(file_prefix + '.allocations.txt', start_snapshot,
+                                                                end_snapshot, peak_snapshot, peak_memory)
+
+        self.stages.append({
+            'stage': stage_name,
+            'total_seconds': profile_stats.total_tt,
+            'peak_traced_bytes': peak_memory,
+            'top_allocations': allocations,
+            'top_peak_allocations': peak_allocations,
+        })
+        with open(os.path.join(self.run_directory, 'summary.json'), 'w', encoding='utf-8') as summary_file:
+            json.dump({'stages': self.stages}, summary_file, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def _write_collapsed(file_path, stacks):
+        """
+        @brief Write stacks in collapsed format read by flamegraph.pl, inferno and speedscope
+        Weights are integer microseconds
+
+        @param file_path: Target file path
+        @param stacks: Result of collapsed_stacks()
+        """
+        with open(file_path, 'w', encoding='utf-8') as collapsed_file:
+            for stack, seconds in stacks.items():
+                microseconds = int(round(seconds * 1e6))
+                if microseconds > 0:
+                    frames = ';'.join(_frame_name(function_key).replace(';', ',') for function_key in stack)
+                    collapsed_file.write('{} {}\n'.format(frames, microseconds))
+
+    @staticmethod
+    def _write_speedscope(file_path, stage_name, stacks):
+        """
+        @brief Write stacks as speedscope sampled profile
+
+        @param file_path: Target file path
+        @param stage_name: Profile name
+        @param stacks: Result of collapsed_stacks()
+        """
+        frame_positions = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, seconds in stacks.items():
+            sample = []
+            for function_key in stack:
+                if function_key not in frame_positions:
+                    frame_positions[function_key] = len(frames)
+                    file_name, line_number, _ = function_key
+                    frames.append({'name': _frame_name(function_key), 'file': file_name, 'line': line_number})
+                sample.append(frame_positions[function_key])
+            samples.append(sample)
+            weights.append(seconds)
+
+        speedscope_profile = {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': stage_name,
+            'exporter': 'commercial-analysis-profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': stage_name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+        with open(file_path, 'w', encoding='utf-8') as speedscope_file:
+            json.dump(speedscope_profile, speedscope_file)
+
+    @classmethod
+    def _write_allocations(cls, file_path, start_snapshot, end_snapshot, peak_snapshot, peak_memory):
+        """
+        @brief Write biggest allocation differences of the end and the peak snapshot against the start one
+
+        @param file_path: Target file path
+        @param start_snapshot: Snapshot before the stage
+        @param end_snapshot: Snapshot after the stage
+        @param peak_snapshot: Snapshot close to the peak or None
+        @param peak_memory: Peak traced memory in bytes
+        @return: Tuple of top allocation dictionaries after the stage and close to the peak
+        """
+        snapshot_filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ]
+        start_snapshot = start_snapshot.filter_traces(snapshot_filters)
+
+        with open(file_path, 'w', encoding='utf-8') as allocations_file:
+            allocations_file.write('Peak traced memory: {} bytes\n\n'.format(peak_memory))
+            allocations_file.write('== Left after the stage ==\n\n')
+            allocations = cls._write_differences(allocations_file, end_snapshot.filter_traces(snapshot_filters),
+                                                 start_snapshot)
+            allocations_file.write('== Alive close to the peak ==\n\n')
+            if peak_snapshot is None:
+                allocations_file.write('Traced memory did not grow by {:.0%}\n'.format(PEAK_SNAPSHOT_GROWTH))
+                return allocations, []
+            peak_allocations = cls._write_differences(allocations_file,
+                                                      peak_snapshot.filter_traces(snapshot_filters), start_snapshot)
+        return allocations, peak_allocations
+
+    @staticmethod
+    def _write_differences(allocations_file, snapshot, start_snapshot):
+        """
+        @brief Write TOP_ALLOCATIONS biggest differences of a snapshot against the start snapshot
+
+        @param allocations_file: Open text file
+        @param snapshot: Filtered snapshot taken during or after the stage
+        @param start_snapshot: Filtered snapshot before the stage
+        @return: List of top allocation dictionaries
+        """
+        allocations = []
+        for difference in snapshot.compare_to(start_snapshot, 'traceback')[:TOP_ALLOCATIONS]:
+            frame = _allocation_frame(difference.traceback)
+            allocations.append({
+                'location': '{}:{}'.format(frame.filename, frame.lineno) if frame else None,
+                'size_diff_bytes': difference.size_diff,
+                'count_diff': difference.count_diff,
+            })
+            allocations_file.write('{:+,} bytes in {:+,} blocks\n'.format(difference.size_diff,
+                                                                         difference.count_diff))
+            for line in difference.traceback.format():
+                allocations_file.write(line + '\n')
+            allocations_file.write('\n')
+        return allocations
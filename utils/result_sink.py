@@ -0,0 +1,307 @@
+"""
+@brief Streaming sinks for analysis results
+Results are written as records of one department and one analysis as soon as they are produced.
+Every sink keeps at most buffer_size records in memory and writes them out when the buffer is full,
+so memory use does not grow with company size
+"""
+
+import json
+import sys
+import threading
+from utils.serialization import serializable
+from config.messages import ErrorMessages
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+DEFAULT_BUFFER_SIZE = 100
+STDOUT_PATH = '-'
+# Lists and dictionaries longer than this are shown by size in console summary
+SUMMARY_MAX_ITEMS = 5
+
+
+def result_record(department_id, analysis, result=None, error=None):
+    """
+    @brief Build sink record of one analysis result
+
+    @param department_id: Analyzed department, None for results not bound to a department
+    @param analysis: Analysis stage name
+    @param result: Analysis result dictionary
+    @param error: Exception of failed analysis
+    @return: Record dictionary
+    """
+    record = {'department_id': department_id, 'analysis': analysis}
+    if error is not None:
+        record['error'] = str(error)
+    else:
+        record['result'] = result
+    return record
+
+
+def table_records(table, analysis, chunk_size=DEFAULT_BUFFER_SIZE):
+    """
+    @brief Sink records of per-department table rows
+    Rows are converted chunk by chunk, so the whole table is never held as Python objects
+
+    @param table: DataFrame with department_id index or column
+    @param analysis: Analysis name of the records
+    @param chunk_size: Number of rows converted at once
+    @return: Generator of record dictionaries
+    """
+    table = table.reset_index() if table.index.name else table
+    for position in range(0, len(table), chunk_size):
+        for row in table.iloc[position:position + chunk_size].to_dict(orient='records'):
+            yield result_record(row.pop('department_id', None), analysis, row)
+
+
+class ResultSink:
+    """
+    @brief Base class of result sinks with bounded buffering
+    Subclasses implement _write_records, records are converted to JSON-compatible values on arrival
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        @brief Initialize empty buffer
+
+        @param buffer_size: Maximal number of buffered records
+        """
+        self.buffer_size = buffer_size
+        self.records_written = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        """
+        @brief Add record, buffered records are written out when the buffer is full
+
+        @param record: Record dictionary from result_record()
+        """
+        with self._lock:
+            self._buffer.append(serializable(record))
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_buffer()
+
+    def flush(self):
+        """
+        @brief Write out buffered records
+        """
+        with self._lock:
+            self._flush_buffer()
+
+    def close(self):
+        """
+        @brief Write out buffered records and release the output
+        """
+        self.flush()
+
+    def _flush_buffer(self):
+        """
+        @brief Write buffered records, caller holds the lock
+        """
+        if self._buffer:
+            self._write_records(self._buffer)
+            self.records_written += len(self._buffer)
+            self._buffer = []
+
+    def _write_records(self, records):
+        """
+        @brief Write records to the output (to be implemented by subclasses)
+
+        @param records: List of serialized records
+        """
+        raise NotImplementedError("Subclasses must implement _write_records method")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+
+class JsonLinesSink(ResultSink):
+    """
+    @brief Write one JSON document per record and line
+    """
+
+    def __init__(self, file_path, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        @brief Open output file
+
+        @param file_path: Target file path, '-' for stdout
+        @param buffer_size: Maximal number of buffered records
+        """
+        super().__init__(buffer_size)
+        self.file_path = file_path
+        self._output_file = sys.stdout if file_path == STDOUT_PATH else open(file_path, 'w', encoding='utf-8')
+
+    def _write_records(self, records):
+        """
+        @brief Append records as JSON lines
+
+        @param records: List of serialized records
+        """
+        self._output_file.write(''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n'
+                                        for record in records))
+        self._output_file.flush()
+
+    def close(self):
+        """
+        @brief Write out buffered records and close the file
+        """
+        super().close()
+        if self._output_file is not sys.stdout:
+            self._output_file.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    @brief Write records as Parquet file in long format, requires pyarrow
+    Results of different analyses have different fields, so every scalar result field becomes one row
+    of department_id, analysis, metric and value. Lists, dictionaries and strings are stored as JSON text.
+    Every flush writes one row group
+    """
+
+    SCHEMA_FIELDS = [
+        ('department_id', 'int64'),
+        ('analysis', 'string'),
+        ('metric', 'string'),
+        ('value', 'float64'),
+        ('text', 'string'),
+    ]
+
+    def __init__(self, file_path, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        @brief Open Parquet writer
+
+        @param file_path: Target file path
+        @param buffer_size: Maximal number of buffered records
+        """
+        if pyarrow is None:
+            raise ImportError(ErrorMessages.RESULT_SINK_UNAVAILABLE.format('parquet', 'pyarrow'))
+        super().__init__(buffer_size)
+        self.file_path = file_path
+        self.schema = pyarrow.schema([(name, field_type) for name, field_type in self.SCHEMA_FIELDS])
+        self._writer = pyarrow.parquet.ParquetWriter(file_path, self.schema)
+
+    def _write_records(self, records):
+        """
+        @brief Write records as one row group
+
+        @param records: List of serialized records
+        """
+        columns = {name: [] for name, _ in self.SCHEMA_FIELDS}
+        for record in records:
+            fields = record.get('result') or {}
+            if 'error' in record:
+                fields = {'error': record['error']}
+            for metric, value in fields.items():
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                columns['department_id'].append(record['department_id'])
+                columns['analysis'].append(record['analysis'])
+                columns['metric'].append(metric)
+                columns['value'].append(value if is_number else None)
+                columns['text'].append(None if is_number or value is None
+                                       else json.dumps(value, ensure_ascii=False, default=str))
+        self._writer.write_table(pyarrow.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        """
+        @brief Write out buffered records and finish the file
+        """
+        super().close()
+        self._writer.close()
+
+
+class ConsoleSummarySink(ResultSink):
+    """
+    @brief Print one short line per record, long lists and dictionaries are shown by size
+    """
+
+    def __init__(self, output_file=None):
+        """
+        @brief Initialize console sink, every record is printed immediately
+
+        @param output_file: Text stream, current stdout if not specified
+        """
+        super().__init__(buffer_size=1)
+        self.output_file = output_file
+
+    @staticmethod
+    def summarize(value):
+        """
+        @brief Short text of result value
+
+        @param value: Serialized result value
+        @return: Summary string
+        """
+        if isinstance(value, list) and len(value) > SUMMARY_MAX_ITEMS:
+            return '[{} items]'.format(len(value))
+        if isinstance(value, dict) and len(value) > SUMMARY_MAX_ITEMS:
+            return '{{{} keys}}'.format(len(value))
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    def _write_records(self, records):
+        """
+        @brief Print record summaries
+
+        @param records: List of serialized records
+        """
+        for record in records:
+            if 'error' in record:
+                details = 'FAILED: {}'.format(record['error'])
+            else:
+                details = ', '.join('{}={}'.format(metric, self.summarize(value))
+                                    for metric, value in (record.get('result') or {}).items())
+            print('[{}] {}: {}'.format(record['department_id'], record['analysis'], details),
+                  file=self.output_file or sys.stdout)
+
+
+class MultiSink(ResultSink):
+    """
+    @brief Pass every record to several sinks
+    """
+
+    def __init__(self, sinks):
+        """
+        @brief Initialize with target sinks, they buffer records themselves
+
+        @param sinks: List of ResultSink
+        """
+        super().__init__(buffer_size=1)
+        self.sinks = list(sinks)
+
+    def write(self, record):
+        """
+        @brief Pass record to all sinks
+
+        @param record: Record dictionary from result_record()
+        """
+        for sink in self.sinks:
+            sink.write(record)
+        self.records_written += 1
+
+    def flush(self):
+        """
+        @brief Flush all sinks
+        """
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        """
+        @brief Close all sinks
+        """
+        for sink in self.sinks:
+            sink.close()
+
+
+# Sink format: sink class writing files
+FILE_SINKS = {
+    'jsonl': JsonLinesSink,
+    'parquet': ParquetSink,
+}
@@ -0,0 +1,30 @@
+"""
+@brief Conversion of analysis results into JSON-compatible values
+"""
+
+import math
+
+
+def serializable(value):
+    """
+    @brief Convert analysis result into JSON-compatible values
+    Tables become lists of records, Series become dictionaries, numpy values become Python scalars
+    and NaN becomes None
+
+    @param value: Result value: dictionary, list, DataFrame, Series, numpy or Python scalar
+    @return: Value built from dictionaries, lists and Python scalars
+    """
+    if isinstance(value, dict):
+        return {str(key): serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [serializable(item) for item in value]
+    if hasattr(value, 'to_dict'):
+        if hasattr(value, 'columns'):
+            table = value.reset_index() if value.index.name else value
+            return serializable(table.to_dict(orient='records'))
+        return serializable(value.to_dict())
+    if hasattr(value, 'tolist'):
+        return serializable(value.tolist())
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
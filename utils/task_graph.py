@@ -0,0 +1,241 @@
+"""
+@brief Dependency-aware task graph for analysis stages
+Runs independent stages concurrently on a thread or process pool with per-stage error isolation
+"""
+
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from utils.instrumentation import instrumentation
+from config.messages import LogMessages
+
+
+class ExecutorTypes:
+    """
+    @brief Supported pool types for stage execution
+    """
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+class StageStatus:
+    """
+    @brief Final states of a graph stage
+    """
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+
+def _run_with_stage_metrics(trace_memory, function, *arguments):
+    """
+    @brief Run stage function in a worker process and collect stage measurements it recorded
+    Module-level function so it can be sent to a process pool. Measurements are attached to a raised
+    exception as stage_metrics attribute, exception attributes survive pickling
+
+    @param trace_memory: Parent process traces memory, worker traces it too
+    @param function: Stage function
+    @param arguments: Positional arguments of function
+    @return: Tuple of function result and list of StageMetrics
+    """
+    if trace_memory:
+        instrumentation.enable_memory_tracing()
+    # Worker runs one stage at a time, so everything recorded here belongs to this stage
+    instrumentation.reset()
+    try:
+        result = function(*arguments)
+    except Exception as stage_error:
+        stage_error.stage_metrics = list(instrumentation.stages)
+        raise
+    finally:
+        stage_metrics = list(instrumentation.stages)
+        instrumentation.reset()
+    return result, stage_metrics
+
+
+class TaskStage:
+    """
+    @brief Single stage of the task graph
+    """
+
+    def __init__(self, name, function, dependencies, arguments, run_in_pool, allow_failed_dependencies):
+        """
+        @brief Initialize stage description
+
+        @param name: Unique stage name
+        @param function: Callable executed by the stage
+        @param dependencies: Names of stages that must finish first
+        @param arguments: Callable returning positional arguments, evaluated right before execution
+        @param run_in_pool: Run in worker pool instead of calling thread
+        @param allow_failed_dependencies: Run even if some dependencies failed or were skipped
+        """
+        self.name = name
+        self.function = function
+        self.dependencies = list(dependencies)
+        self.arguments = arguments
+        self.run_in_pool = run_in_pool
+        self.allow_failed_dependencies = allow_failed_dependencies
+
+
+class StageResult:
+    """
+    @brief Outcome of a graph stage
+    """
+
+    def __init__(self, name, status, result=None, error=None, duration=0.0):
+        """
+        @brief Initialize stage outcome
+
+        @param name: Stage name
+        @param status: One of StageStatus values
+        @param result: Value returned by stage function
+        @param error: Exception raised by stage function or its dependency
+        @param duration: Wall time of the stage in seconds
+        """
+        self.name = name
+        self.status = status
+        self.result = result
+        self.error = error
+        self.duration = duration
+
+
+class TaskGraph:
+    """
+    @brief Directed acyclic graph of stages executed on a worker pool
+    A failing stage only skips the stages depending on it
+    """
+
+    def __init__(self, max_workers=None, executor_type=ExecutorTypes.THREAD, logger=None, initializer=None,
+                 initargs=()):
+        """
+        @brief Initialize empty task graph
+
+        @param max_workers: Pool size, executor default if not specified
+        @param executor_type: ExecutorTypes.THREAD or ExecutorTypes.PROCESS
+        @param logger: Logger instance for stage events
+        @param initializer: Callable run once in every worker process, unused for thread pool
+        @param initargs: Arguments of initializer
+        """
+        if executor_type not in (ExecutorTypes.THREAD, ExecutorTypes.PROCESS):
+            raise ValueError("Unknown executor type: {}".format(executor_type))
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.logger = logger
+        self.initializer = initializer
+        self.initargs = initargs
+        self.stages = {}
+        self.results = {}
+
+    def add_stage(self, name, function, dependencies=(), arguments=None, run_in_pool=True,
+                  allow_failed_dependencies=False):
+        """
+        @brief Register a stage
+
+        @param name: Unique stage name
+        @param function: Callable executed by the stage, must be picklable for process pool
+        @param dependencies: Names of already registered stages that must finish first
+        @param arguments: Callable returning tuple of positional arguments for function
+        @param run_in_pool: Run in worker pool, otherwise run in calling thread
+        @param allow_failed_dependencies: Run even if some dependencies failed or were skipped
+        """
+        if name in self.stages:
+            raise ValueError("Stage already registered: {}".format(name))
+        for dependency in dependencies:
+            if dependency not in self.stages:
+                raise ValueError("Unknown dependency {} of stage {}".format(dependency, name))
+        self.stages[name] = TaskStage(name, function, dependencies, arguments, run_in_pool,
+                                      allow_failed_dependencies)
+
+    def execute(self):
+        """
+        @brief Execute all stages respecting dependencies
+
+        @return: Dictionary of stage name to StageResult in registration order
+        """
+        results = self.results = {}
+        pending = list(self.stages.values())
+        running = {}
+        if self.executor_type == ExecutorTypes.PROCESS:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer,
+                                           initargs=self.initargs)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        with executor:
+            while pending or running:
+                for stage in list(pending):
+                    dependency_results = [results.get(dependency) for dependency in stage.dependencies]
+                    if any(result is None for result in dependency_results):
+                        continue
+                    pending.remove(stage)
+
+                    failed_dependencies = [result for result in dependency_results
+                                           if result.status != StageStatus.COMPLETED]
+                    if failed_dependencies and not stage.allow_failed_dependencies:
+                        results[stage.name] = StageResult(stage.name, StageStatus.SKIPPED,
+                                                          error=failed_dependencies[0].error)
+                        self._log(LogMessages.STAGE_SKIPPED.format(stage.name, failed_dependencies[0].name))
+                        continue
+
+                    self._log(LogMessages.STAGE_START.format(stage.name))
+                    started_at = time.perf_counter()
+                    try:
+                        arguments = stage.arguments() if stage.arguments else ()
+                    except Exception as arguments_error:
+                        results[stage.name] = self._failed(stage.name, arguments_error, started_at)
+                        continue
+
+                    if stage.run_in_pool and self.executor_type == ExecutorTypes.PROCESS:
+                        running[executor.submit(_run_with_stage_metrics, tracemalloc.is_tracing(), stage.function,
+                                                *arguments)] = (stage, started_at)
+                    elif stage.run_in_pool:
+                        running[executor.submit(stage.function, *arguments)] = (stage, started_at)
+                    else:
+                        try:
+                            stage_result = stage.function(*arguments)
+                            results[stage.name] = self._completed(stage.name, stage_result, started_at)
+                        except Exception as stage_error:
+                            results[stage.name] = self._failed(stage.name, stage_error, started_at)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, started_at = running.pop(future)
+                    try:
+                        stage_result = future.result()
+                        if self.executor_type == ExecutorTypes.PROCESS:
+                            # Measurements recorded in the worker are merged into this process
+                            stage_result, stage_metrics = stage_result
+                            instrumentation.merge(stage_metrics)
+                        results[stage.name] = self._completed(stage.name, stage_result, started_at)
+                    except Exception as stage_error:
+                        instrumentation.merge(getattr(stage_error, 'stage_metrics', []))
+                        results[stage.name] = self._failed(stage.name, stage_error, started_at)
+
+        return {name: results[name] for name in self.stages}
+
+    def _completed(self, name, result, started_at):
+        """
+        @brief Build result of successfully completed stage
+        """
+        duration = time.perf_counter() - started_at
+        self._log(LogMessages.STAGE_COMPLETE.format(name, duration))
+        return StageResult(name, StageStatus.COMPLETED, result=result, duration=duration)
+
+    def _failed(self, name, error, started_at):
+        """
+        @brief Build result of failed stage
+        """
+        duration = time.perf_counter() - started_at
+        if self.logger:
+            self.logger.error(LogMessages.STAGE_ERROR.format(name, str(error)))
+        return StageResult(name, StageStatus.FAILED, error=error, duration=duration)
+
+    def _log(self, message):
+        """
+        @brief Log stage event if logger is configured
+        """
+        if self.logger:
+            self.logger.info(message)